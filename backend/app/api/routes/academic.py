@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_db, get_admin_user, get_current_active_user
+from app.core.principals import Principal
 from app.models.user import User
 from app.models.academic import Institute, Course
 from app.schemas.academic import (
@@ -21,7 +22,7 @@ def read_institutes(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Any:
     """
     Retrieve institutes.
@@ -34,7 +35,7 @@ def create_institute(
     *,
     db: Session = Depends(get_db),
     institute_in: InstituteCreate,
-    current_user: User = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
     Create new institute. Admin only.
@@ -53,7 +54,7 @@ def create_institute(
 def read_institute(
     institute_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Any:
     """
     Get institute by ID.
@@ -70,7 +71,7 @@ def read_courses(
     institute_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Any:
     """
     Retrieve courses with optional filtering by institute.
@@ -86,7 +87,7 @@ def create_course(
     *,
     db: Session = Depends(get_db),
     course_in: CourseCreate,
-    current_user: User = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
     Create new course. Admin only.
@@ -116,7 +117,7 @@ def create_course(
 def read_course(
     course_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Any:
     """
     Get course by ID.
@@ -131,7 +132,7 @@ def enroll_student(
     course_id: int,
     student_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
     Enroll a student in a course. Admin only.
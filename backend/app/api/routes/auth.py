@@ -1,27 +1,54 @@
-from datetime import timedelta
-from typing import Any
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from jose import JWTError
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password
+from app.core.password_pool import password_pool, password_pool_busy, PasswordPoolSaturated
+from app.core.revocation import revocation_list, utc_timestamp
+from app.core.security import (
+    create_access_token, create_refresh_token, decode_access_token, decode_refresh_token, oauth2_scheme,
+)
 from app.core.dependencies import get_db, get_current_active_user
-from app.models.user import User, Role
-from app.schemas.user import Token, User as UserSchema
+from app.core.principals import Principal
+from app.models.user import User, Role, RevokedToken
+from app.schemas.user import Token, TokenPayload, TokenRefresh, User as UserSchema
 
 router = APIRouter()
 
+def _get_user_by_email(db: Session, email: str) -> Optional[User]:
+    return db.query(User).options(selectinload(User.roles)).filter(User.email == email).first()
+
+def _update_password_hash(db: Session, user_id: int, hashed_password: str) -> None:
+    db.query(User).filter(User.id == user_id).update(
+        {User.hashed_password: hashed_password}, synchronize_session=False
+    )
+    db.commit()
+
 @router.post("/login", response_model=Token)
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
+    
+    The database lookup runs in the request thread pool and bcrypt on the
+    dedicated password hashing pool, so a login burst cannot starve other endpoints.
     """
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await run_in_threadpool(_get_user_by_email, db, form_data.username)
+    verified, new_hash = False, None
+    try:
+        if user is not None:
+            verified, new_hash = await password_pool.verify_and_update(form_data.password, user.hashed_password)
+    except PasswordPoolSaturated:
+        raise password_pool_busy()
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -32,19 +59,116 @@ def login_access_token(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
         )
     
-    # Get the first role for the token (simplified approach)
-    role_name = "user"
-    if user.roles:
-        role_name = user.roles[0].name
-        
+    tokens = _issue_tokens(user)
+    
+    # Transparently upgrade hashes made with an old scheme or cost
+    if new_hash:
+        await run_in_threadpool(_update_password_hash, db, user.id, new_hash)
+    
+    return tokens
+
+def _issue_tokens(user: User) -> dict:
+    """
+    Issue a short-lived access token carrying the user's roles, and a refresh token.
+    """
+    role_names = [role.name for role in user.roles]
+    # The single role claim is kept for clients that read it
+    role_name = role_names[0] if role_names else "user"
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
         "access_token": create_access_token(
-            user.id, role_name, expires_delta=access_token_expires
+            user.id, role_name, expires_delta=access_token_expires, roles=role_names
         ),
+        "refresh_token": create_refresh_token(user.id),
         "token_type": "bearer",
     }
 
+def _revoke_token(db: Session, token_data: TokenPayload) -> None:
+    db.add(RevokedToken(
+        jti=token_data.jti,
+        user_id=token_data.sub,
+        token_type=token_data.type,
+        expires_at=datetime.fromtimestamp(token_data.exp, timezone.utc),
+    ))
+
+@router.post("/refresh", response_model=Token)
+def refresh_access_token(
+    token_in: TokenRefresh,
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Exchange a refresh token for a new access token and refresh token.
+    
+    Refresh tokens are single use: the presented one is revoked. Roles and the
+    active flag are read from the database, and refresh tokens issued before
+    the user's last role or password change are rejected.
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        token_data = decode_refresh_token(token_in.refresh_token)
+    except (JWTError, ValidationError):
+        raise invalid
+    # Revoked refresh tokens are only recorded in the database
+    if db.get(RevokedToken, token_data.jti):
+        raise invalid
+    
+    user = db.query(User).options(selectinload(User.roles)).filter(User.id == token_data.sub).first()
+    if not user:
+        raise invalid
+    if user.tokens_valid_after is not None and (
+        token_data.iat is None or token_data.iat < utc_timestamp(user.tokens_valid_after)
+    ):
+        raise invalid
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
+        )
+    
+    tokens = _issue_tokens(user)
+    _revoke_token(db, token_data)
+    try:
+        db.commit()
+    except IntegrityError:
+        # The same refresh token was redeemed concurrently
+        db.rollback()
+        raise invalid
+    return tokens
+
+@router.post("/logout")
+def logout(
+    token_in: Optional[TokenRefresh] = None,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Revoke the presented access token and, if given, the refresh token.
+    """
+    revoked = []
+    access_data = decode_access_token(token)
+    if access_data.jti:
+        revoked.append(access_data)
+    if token_in is not None:
+        try:
+            refresh_data = decode_refresh_token(token_in.refresh_token)
+        except (JWTError, ValidationError):
+            refresh_data = None
+        if refresh_data is not None and refresh_data.sub == current_user.id:
+            revoked.append(refresh_data)
+    
+    for token_data in revoked:
+        if not db.get(RevokedToken, token_data.jti):
+            _revoke_token(db, token_data)
+    db.commit()
+    # Only the access token needs the in-memory list; /refresh checks the database
+    if access_data.jti:
+        revocation_list.revoke_token(access_data.jti)
+    return {"msg": "Logged out"}
+
 @router.post("/reset-password")
 def reset_password(
     email: str,
@@ -64,9 +188,10 @@ def reset_password(
 
 @router.get("/me", response_model=UserSchema)
 def read_users_me(
-    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Any:
     """
     Get current user information
     """
-    return current_user
+    return db.query(User).filter(User.id == current_user.id).first()
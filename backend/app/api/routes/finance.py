@@ -1,13 +1,22 @@
 from typing import Any, List, Optional
 from datetime import datetime
+import asyncio
+import csv
+import io
+import logging
 import os
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, Body, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Body, UploadFile, File, Response, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
 
+from app.core.config import settings
 from app.core.dependencies import get_db, get_admin_user, get_faculty_user, get_student_user, get_current_active_user
+from app.core.pagination import decode_cursor, keyset_filter, set_next_cursor
+from app.core.principals import Principal
 from app.models.user import User
 from app.models.academic import Institute, Course
 from app.models.finance import Semester as SemesterModel, FeeStructure, StudentFee, Payment, Receipt, StandardFee
@@ -15,12 +24,22 @@ from app.schemas.finance import (
     Semester as SemesterSchema, SemesterCreate, SemesterUpdate,
     FeeStructure as FeeStructureSchema, FeeStructureCreate, FeeStructureUpdate,
     StudentFee as StudentFeeSchema, StudentFeeCreate, StudentFeeUpdate,
-    Payment as PaymentSchema, PaymentCreate, PaymentUpdate,
-    Receipt as ReceiptSchema, ReceiptCreate,
+    StudentFeeBulkCreate, StudentFeeBulkResult,
+    Payment as PaymentSchema, PaymentCreate, PaymentUpdate, PaymentBatchResult,
+    Receipt as ReceiptSchema, ReceiptCreate, ReceiptPage,
     PaymentWithReceipt, StudentFeeWithPayments,
-    StandardFee as StandardFeeSchema, StandardFeeCreate, StandardFeeUpdate
+    StandardFee as StandardFeeSchema, StandardFeeCreate, StandardFeeUpdate,
+    FinanceReport, ReportGroupBy
 )
-from app.services.receipt_generator import generate_receipt_pdf
+from app.services.receipt_generator import receipt_fingerprint, format_receipt_number
+from app.services.receipt_loader import receipt_query, receipt_context, load_receipt_context, list_receipts
+from app.services.receipt_archive import stream_receipt_archive
+from app.services.receipt_worker import receipt_prerenderer
+from app.services.receipt_cache import receipt_cache
+from app.services.render_pool import render_pool, RenderPoolSaturated
+from app.services import finance_reports, fee_ledger, fee_billing, payment_batch
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -42,7 +61,7 @@ def create_semester(
     *,
     db: Session = Depends(get_db),
     semester_in: SemesterCreate,
-    current_user: User = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
     Create new semester. Admin only.
@@ -90,7 +109,7 @@ def create_fee_structure(
     *,
     db: Session = Depends(get_db),
     fee_structure_in: FeeStructureCreate,
-    current_user: User = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
     Create new fee structure. Admin only.
@@ -121,14 +140,13 @@ def read_standard_fees(
     semester_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Any:
     """
     Retrieve standard fees. Admin and faculty can see all.
     """
     # Check if user has admin or faculty role
-    is_admin_or_faculty = any(role.name in ["admin", "faculty"] for role in current_user.roles)
-    if not is_admin_or_faculty:
+    if not current_user.is_staff:
         raise HTTPException(
             status_code=403,
             detail="Not enough permissions to access standard fees",
@@ -161,7 +179,7 @@ def create_standard_fee(
     *,
     db: Session = Depends(get_db),
     standard_fee_in: StandardFeeCreate,
-    current_user: User = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
     Create new standard fee. Admin only.
@@ -219,7 +237,7 @@ def update_standard_fee(
     db: Session = Depends(get_db),
     standard_fee_id: int,
     standard_fee_in: StandardFeeUpdate,
-    current_user: User = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
     Update standard fee. Admin only.
@@ -283,7 +301,7 @@ def delete_standard_fee(
     *,
     db: Session = Depends(get_db),
     standard_fee_id: int,
-    current_user: User = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
 ) -> None:
     """
     Delete standard fee. Admin only.
@@ -301,26 +319,28 @@ def delete_standard_fee(
 # Student Fee endpoints
 @router.get("/student-fees", response_model=List[StudentFeeSchema])
 def read_student_fees(
+    response: Response,
     db: Session = Depends(get_db),
     student_id: Optional[int] = None,
     semester_id: Optional[int] = None,
+    outstanding_only: bool = False,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Any:
     """
     Retrieve student fees. Admin and faculty can see all, students can only see their own.
+    
+    Pass the X-Next-Cursor response header back as ``cursor`` to fetch the next
+    page in constant time; ``skip`` is still honoured when no cursor is given.
     """
     query = db.query(StudentFee)
     
-    # Determine user role
-    is_admin = any(role.name == "admin" for role in current_user.roles)
-    is_student = any(role.name == "student" for role in current_user.roles)
-    
     # Filter by student_id if provided or if current user is a student
     if student_id:
         query = query.filter(StudentFee.student_id == student_id)
-    elif is_student:
+    elif current_user.is_student:
         query = query.filter(StudentFee.student_id == current_user.id)
     # Admin can see all student fees
     
@@ -328,6 +348,10 @@ def read_student_fees(
     if semester_id:
         query = query.filter(StudentFee.semester_id == semester_id)
     
+    # Only fees with something left to pay, read straight from the ledger
+    if outstanding_only:
+        query = query.filter(StudentFee.balance > 0)
+    
     # Join related entities for complete information
     query = query.join(SemesterModel, StudentFee.semester_id == SemesterModel.id)
     query = query.join(Course, StudentFee.course_id == Course.id)
@@ -341,7 +365,14 @@ def read_student_fees(
         joinedload(StudentFee.student)
     )
     
-    student_fees = query.offset(skip).limit(limit).all()
+    query = query.order_by(StudentFee.id)
+    if cursor:
+        query = query.filter(keyset_filter([StudentFee.id], decode_cursor(cursor, [int])))
+    else:
+        query = query.offset(skip)
+    
+    student_fees = query.limit(limit).all()
+    set_next_cursor(response, student_fees, limit, lambda fee: [fee.id])
     return student_fees
 
 @router.post("/student-fees", response_model=StudentFeeSchema)
@@ -349,7 +380,7 @@ def create_student_fee(
     *,
     db: Session = Depends(get_db),
     student_fee_in: StudentFeeCreate,
-    current_user: User = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
     Create new student fee. Admin only.
@@ -424,35 +455,64 @@ def create_student_fee(
     db.refresh(student_fee)
     return student_fee
 
-# Payment endpoints
-@router.get("/payments", response_model=List[PaymentWithReceipt])
-def read_payments(
+@router.post("/student-fees/bulk", response_model=StudentFeeBulkResult)
+def bulk_create_student_fees(
+    *,
     db: Session = Depends(get_db),
-    student_id: Optional[int] = None,
-    student_fee_id: Optional[int] = None,
-    start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None,
-    skip: int = 0,
-    limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
+    bulk_in: StudentFeeBulkCreate,
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
-    Retrieve payments with filtering options.
+    Bill every student enrolled in a course for a semester from its standard fee. Admin only.
+    
+    Students who already have a fee for the course and semester are skipped,
+    so the call can be repeated after new enrollments.
     """
-    query = db.query(Payment)
+    semester = db.query(SemesterModel).filter(SemesterModel.id == bulk_in.semester_id).first()
+    if not semester:
+        raise HTTPException(
+            status_code=404,
+            detail="The semester with this id does not exist",
+        )
+    if semester.course_id != bulk_in.course_id:
+        raise HTTPException(
+            status_code=400,
+            detail="The semester does not belong to the specified course",
+        )
     
-    # Determine user role
-    is_admin = any(role.name == "admin" for role in current_user.roles)
-    is_faculty = any(role.name == "faculty" for role in current_user.roles)
-    is_student = any(role.name == "student" for role in current_user.roles)
+    # Locking the standard fee serializes concurrent billing runs of the same
+    # course-semester, so the already-billed check cannot race
+    standard_fee = db.query(StandardFee).filter(
+        StandardFee.course_id == bulk_in.course_id,
+        StandardFee.semester_id == bulk_in.semester_id
+    ).with_for_update().first()
+    if not standard_fee:
+        raise HTTPException(
+            status_code=400,
+            detail="No standard fee found for this course-semester combination",
+        )
     
-    # Filter by student_id if provided
-    if student_id:
-        query = query.filter(Payment.student_id == student_id)
-    # If user is a student and no specific student_id is provided, show only their own payments
-    elif is_student and not (is_admin or is_faculty):
+    result = fee_billing.bill_enrolled_students(db, standard_fee, description=bulk_in.description)
+    db.commit()
+    return result
+
+# Payment endpoints
+def _filter_payments(query, current_user, student_id, student_fee_id, start_date, end_date):
+    """
+    Apply the payment list filters shared by the listing and export endpoints.
+    """
+    # Students without a staff role only ever see their own payments; asking
+    # for another student's is refused, like the receipt listing
+    if current_user.is_student and not current_user.is_staff:
+        if student_id and student_id != current_user.id:
+            raise HTTPException(
+                status_code=403,
+                detail="Not enough permissions to access these payments",
+            )
         query = query.filter(Payment.student_id == current_user.id)
     # Admin and faculty can see all payments if no student_id filter is provided
+    elif student_id:
+        query = query.filter(Payment.student_id == student_id)
     
     # Apply other filters
     if student_fee_id:
@@ -461,6 +521,30 @@ def read_payments(
         query = query.filter(Payment.payment_date >= start_date)
     if end_date:
         query = query.filter(Payment.payment_date <= end_date)
+    return query
+
+@router.get("/payments", response_model=List[PaymentWithReceipt])
+def read_payments(
+    response: Response,
+    db: Session = Depends(get_db),
+    student_id: Optional[int] = None,
+    student_fee_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Retrieve payments with filtering options, newest first.
+    
+    Pass the X-Next-Cursor response header back as ``cursor`` to fetch the next
+    page in constant time; ``skip`` is still honoured when no cursor is given.
+    """
+    query = _filter_payments(
+        db.query(Payment), current_user, student_id, student_fee_id, start_date, end_date
+    )
     
     # Get payments with joined student_fee data including course and institute
     query = query.join(StudentFee, Payment.student_fee_id == StudentFee.id)
@@ -477,15 +561,89 @@ def read_payments(
         .joinedload(Course.institute)
     )
     
-    payments = query.order_by(desc(Payment.payment_date)).offset(skip).limit(limit).all()
+    # payment id breaks ties between payments recorded at the same instant
+    query = query.order_by(desc(Payment.payment_date), desc(Payment.id))
+    if cursor:
+        query = query.filter(keyset_filter(
+            [Payment.payment_date, Payment.id],
+            decode_cursor(cursor, [datetime, int]),
+            descending=True,
+        ))
+    else:
+        query = query.offset(skip)
+    
+    payments = query.limit(limit).all()
+    set_next_cursor(response, payments, limit, lambda payment: [payment.payment_date, payment.id])
     return payments
 
+PAYMENT_EXPORT_COLUMNS = [
+    "payment_id", "receipt_number", "payment_date", "amount", "payment_method",
+    "transaction_id", "notes", "student_id", "student_name", "student_email",
+    "student_fee_id", "course_code", "course_name", "semester_name",
+    "institute_code", "institute_name",
+]
+PAYMENT_EXPORT_BATCH_SIZE = 1000
+
+@router.get("/payments/export")
+def export_payments(
+    db: Session = Depends(get_db),
+    student_id: Optional[int] = None,
+    student_fee_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: Principal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Export payments as CSV, streamed from a server-side cursor.
+    """
+    query = select(
+        Payment.id, Receipt.receipt_number, Payment.payment_date, Payment.amount,
+        Payment.payment_method, Payment.transaction_id, Payment.notes,
+        Payment.student_id, User.full_name, User.email,
+        Payment.student_fee_id, Course.code, Course.name, SemesterModel.name,
+        Institute.code, Institute.name,
+    )
+    query = query.join(User, Payment.student_id == User.id)
+    query = query.join(StudentFee, Payment.student_fee_id == StudentFee.id)
+    query = query.join(SemesterModel, StudentFee.semester_id == SemesterModel.id)
+    query = query.join(Course, StudentFee.course_id == Course.id)
+    query = query.join(Institute, Course.institute_id == Institute.id)
+    query = query.outerjoin(Receipt, Receipt.payment_id == Payment.id)
+    query = _filter_payments(query, current_user, student_id, student_fee_id, start_date, end_date)
+    query = query.order_by(Payment.payment_date, Payment.id)
+    
+    def generate_rows():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(PAYMENT_EXPORT_COLUMNS)
+        
+        # yield_per makes the driver use a server-side cursor, so only one
+        # batch of rows is held in memory at a time
+        result = db.execute(query.execution_options(yield_per=PAYMENT_EXPORT_BATCH_SIZE))
+        for rows in result.partitions():
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        remaining = buffer.getvalue()
+        if remaining:
+            yield remaining
+    
+    filename = f"payments-{datetime.now().strftime('%Y%m%d%H%M%S')}.csv"
+    return StreamingResponse(
+        generate_rows(),
+        media_type="text/csv",
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"'
+        }
+    )
+
 @router.post("/payments", response_model=PaymentWithReceipt)
 def create_payment(
     *,
     db: Session = Depends(get_db),
     payment_in: PaymentCreate,
-    current_user: User = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
     Create new payment and generate receipt. Admin only.
@@ -518,14 +676,13 @@ def create_payment(
     db.add(payment)
     db.flush()
     
-    # Get course and semester information for receipt number
-    course = student_fee.course
-    semester = student_fee.semester
-    course_code = course.code.upper()
-    semester_code = semester.name.replace(' ', '').upper()
+    # Update the fee's paid amount and balance in the same transaction
+    fee_ledger.apply_payment(db, student_fee.id, payment.amount)
     
     # Generate receipt number with course code and semester info
-    receipt_number = f"RCPT-{payment.id}-{course_code}-{semester_code}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    receipt_number = format_receipt_number(
+        payment.id, student_fee.course.code, student_fee.semester.name, datetime.now()
+    )
     
     # Create receipt record (without generating PDF)
     receipt = Receipt(
@@ -536,86 +693,229 @@ def create_payment(
     db.commit()
     db.refresh(payment)
     
+    # Render the PDF in the background so the first download hits the cache
+    receipt_prerenderer.enqueue([receipt.id])
+    
     return payment
 
-@router.get("/receipts/{receipt_id}/download")
-def download_receipt(
-    receipt_id: int,
+@router.post("/payments/batch", response_model=PaymentBatchResult)
+def create_payments_batch(
+    *,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    payments_in: List[PaymentCreate],
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
-    Download receipt PDF.
+    Record many payments and their receipts in one transaction. Admin only.
+    
+    Each item is validated like a single payment, and a student fee must
+    belong to the item's student. Items that fail are reported by index and
+    the rest are recorded.
     """
-    receipt = db.query(Receipt).filter(Receipt.id == receipt_id).first()
-    if not receipt:
+    if not payments_in:
         raise HTTPException(
-            status_code=404,
-            detail="Receipt not found",
+            status_code=400,
+            detail="The batch is empty",
         )
-    
-    # Check permissions
-    payment = db.query(Payment).filter(Payment.id == receipt.payment_id).first()
-    is_admin_or_faculty = any(role.name in ["admin", "faculty"] for role in current_user.roles)
-    is_student_owner = payment.student_id == current_user.id
-    
-    if not (is_admin_or_faculty or is_student_owner):
+    if len(payments_in) > settings.PAYMENT_BATCH_MAX_ITEMS:
         raise HTTPException(
-            status_code=403,
-            detail="Not enough permissions to access this receipt",
+            status_code=400,
+            detail=f"A batch can hold at most {settings.PAYMENT_BATCH_MAX_ITEMS} payments",
         )
     
-    # Generate the receipt PDF on-the-fly
     try:
-        # Get the necessary data to generate the receipt
-        payment = db.query(Payment).filter(Payment.id == receipt.payment_id).first()
-        student = db.query(User).filter(User.id == payment.student_id).first()
-        student_fee = db.query(StudentFee).filter(StudentFee.id == payment.student_fee_id).first()
-        
-        # Generate the receipt PDF in memory
-        pdf_buffer = generate_receipt_pdf(
-            payment=payment,
-            student=student,
-            student_fee=student_fee,
-            receipt_number=receipt.receipt_number
-        )
-        
-        # Return the PDF directly from memory
-        return StreamingResponse(
-            pdf_buffer,
-            media_type="application/pdf",
-            headers={
-                'Content-Disposition': f'attachment; filename="receipt-{receipt.id}.pdf"'
-            }
+        posted = payment_batch.post_payments(db, payments_in)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="A transaction id in the batch was recorded concurrently, nothing was saved; retry the batch",
         )
-    except Exception as e:
+    
+    receipt_prerenderer.enqueue(posted["receipt_ids"])
+    
+    results = posted["results"]
+    created = sum(1 for result in results if result["status"] == "created")
+    return {"created": created, "failed": len(results) - created, "items": results}
+
+@router.get("/receipts", response_model=ReceiptPage)
+def read_receipts(
+    db: Session = Depends(get_db),
+    student_id: Optional[int] = None,
+    semester_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    current_user: Principal = Depends(get_current_active_user),
+) -> Any:
+    """
+    List receipts with their payment, semester and course, newest first.
+    Students can only list their own receipts.
+    """
+    if not current_user.is_staff:
+        if student_id and student_id != current_user.id:
+            raise HTTPException(
+                status_code=403,
+                detail="Not enough permissions to access these receipts",
+            )
+        student_id = current_user.id
+    
+    total, items = list_receipts(
+        db, student_id=student_id, semester_id=semester_id, skip=skip, limit=limit
+    )
+    return {"total": total, "skip": skip, "limit": limit, "items": items}
+
+@router.get("/receipts/render-stats")
+def read_receipt_render_stats(
+    current_user: Principal = Depends(get_admin_user),
+) -> Any:
+    """
+    Receipt render pool metrics: queue depth, throughput and render times. Admin only.
+    """
+    return render_pool.stats()
+
+@router.get("/receipts/{receipt_id}/download")
+async def download_receipt(
+    receipt_id: int,
+    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Download receipt PDF. Supports conditional requests through ETag/If-None-Match.
+    
+    Database access runs in the thread pool and rendering in the receipt
+    render pool, so a slow render never blocks the event loop or a request thread.
+    """
+    context = await run_in_threadpool(load_receipt_context, db, receipt_id, current_user)
+    
+    # Receipts never change once issued and render byte for byte the same,
+    # so the fingerprint of their inputs is a strong ETag
+    fingerprint = receipt_fingerprint(context)
+    etag = f'"{fingerprint}"'
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    # Receipts are pre-rendered after payment; render here only if that job hasn't finished
+    pdf = await run_in_threadpool(receipt_cache.get, receipt_id, fingerprint)
+    if pdf is None:
+        try:
+            # submit renders inline when the pool has no workers and may start
+            # worker processes otherwise; either would block the event loop
+            rendering = await run_in_threadpool(render_pool.submit, context)
+            pdf = await asyncio.wait_for(
+                asyncio.wrap_future(rendering),
+                timeout=settings.RECEIPT_RENDER_TIMEOUT_SECONDS,
+            )
+        except (RenderPoolSaturated, asyncio.TimeoutError):
+            # A full queue or a slow render are both transient; ask the client to retry
+            raise HTTPException(
+                status_code=503,
+                detail="Receipt rendering is busy, please retry shortly",
+                headers={"Retry-After": str(settings.RECEIPT_RENDER_RETRY_AFTER_SECONDS)},
+            )
+        except Exception:
+            logger.exception(f"Rendering receipt {receipt_id} failed")
+            raise HTTPException(
+                status_code=500,
+                detail="Error generating receipt",
+            )
+        await run_in_threadpool(receipt_cache.put, receipt_id, fingerprint, pdf)
+    
+    return Response(
+        content=pdf,
+        media_type="application/pdf",
+        headers={
+            'Content-Disposition': f'attachment; filename="receipt-{receipt_id}.pdf"',
+            'ETag': etag,
+            'Cache-Control': 'private, no-cache',
+        }
+    )
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+RECEIPT_ARCHIVE_BATCH_SIZE = 200
+
+@router.get("/receipts/archive")
+def download_receipt_archive(
+    db: Session = Depends(get_db),
+    student_id: Optional[int] = None,
+    semester_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: Principal = Depends(get_current_active_user),
+) -> Any:
+    """
+    Download a ZIP of receipt PDFs for a student, a semester or a payment date range.
+    Students can only download their own receipts. Receipts that could not be
+    rendered in time are listed in FAILED_RECEIPTS.txt inside the archive.
+    """
+    if not current_user.is_staff:
+        if student_id and student_id != current_user.id:
+            raise HTTPException(
+                status_code=403,
+                detail="Not enough permissions to access these receipts",
+            )
+        student_id = current_user.id
+    
+    if not (student_id or semester_id or start_date or end_date):
         raise HTTPException(
-            status_code=500,
-            detail=f"Error generating receipt: {str(e)}",
+            status_code=400,
+            detail="Filter by student, semester or payment date range",
         )
+    
+    query = receipt_query(db)
+    if student_id:
+        query = query.filter(Payment.student_id == student_id)
+    if semester_id:
+        query = query.filter(StudentFee.semester_id == semester_id)
+    if start_date:
+        query = query.filter(Payment.payment_date >= start_date)
+    if end_date:
+        query = query.filter(Payment.payment_date <= end_date)
+    query = query.order_by(Payment.payment_date, Payment.id)
+    
+    def receipt_contexts():
+        # Stream rows in batches so only a batch of receipts is loaded at a time
+        for receipt in query.yield_per(RECEIPT_ARCHIVE_BATCH_SIZE):
+            yield receipt.id, receipt_context(receipt)
+    
+    filename = f"receipts-{datetime.now().strftime('%Y%m%d%H%M%S')}.zip"
+    return StreamingResponse(
+        stream_receipt_archive(receipt_contexts()),
+        media_type="application/zip",
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"'
+        }
+    )
 
 @router.get("/students/{student_id}/receipts")
 def get_all_student_receipts(
     student_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
 ) -> Any:
     """
     Get all receipts for a student.
     """
     # Check permissions
-    is_admin_or_faculty = any(role.name in ["admin", "faculty"] for role in current_user.roles)
     is_student_owner = current_user.id == student_id
     
-    if not (is_admin_or_faculty or is_student_owner):
+    if not (current_user.is_staff or is_student_owner):
         raise HTTPException(
             status_code=403,
             detail="Not enough permissions to access these receipts",
         )
     
-    # Get all payments for the student
-    payments = db.query(Payment).filter(Payment.student_id == student_id).all()
-    receipt_ids = [payment.receipt.id for payment in payments if payment.receipt]
+    # Select the receipt ids directly instead of lazy-loading each payment's receipt
+    receipt_ids = db.execute(
+        select(Receipt.id)
+        .join(Payment, Payment.id == Receipt.payment_id)
+        .where(Payment.student_id == student_id)
+        .order_by(Payment.id)
+    ).scalars().all()
     
     return {"receipt_ids": receipt_ids}
 
@@ -626,40 +926,42 @@ def get_finance_summary(
     semester_id: Optional[int] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    current_user: User = Depends(get_faculty_user),
+    current_user: Principal = Depends(get_faculty_user),
 ) -> Any:
     """
     Get financial summary with filtering options. Faculty and admin only.
     """
-    # Query student fees
-    fee_query = db.query(StudentFee)
-    if student_id:
-        fee_query = fee_query.filter(StudentFee.student_id == student_id)
-    if semester_id:
-        fee_query = fee_query.filter(StudentFee.semester_id == semester_id)
-    
-    student_fees = fee_query.all()
-    
-    # Query payments
-    payment_query = db.query(Payment)
-    if student_id:
-        payment_query = payment_query.filter(Payment.student_id == student_id)
-    if start_date:
-        payment_query = payment_query.filter(Payment.payment_date >= start_date)
-    if end_date:
-        payment_query = payment_query.filter(Payment.payment_date <= end_date)
-    
-    payments = payment_query.all()
-    
-    # Calculate summary
-    total_fees = sum(fee.amount for fee in student_fees)
-    total_paid = sum(payment.amount for payment in payments)
-    total_pending = total_fees - total_paid
-    
-    return {
-        "total_fees": total_fees,
-        "total_paid": total_paid,
-        "total_pending": total_pending,
-        "student_count": len(set(fee.student_id for fee in student_fees)),
-        "payment_count": len(payments),
-    }
+    return finance_reports.get_finance_summary(
+        db,
+        student_id=student_id,
+        semester_id=semester_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+@router.get("/finance/summary/grouped", response_model=FinanceReport)
+def get_grouped_finance_summary(
+    group_by: ReportGroupBy,
+    db: Session = Depends(get_db),
+    student_id: Optional[int] = None,
+    semester_id: Optional[int] = None,
+    course_id: Optional[int] = None,
+    institute_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    current_user: Principal = Depends(get_faculty_user),
+) -> Any:
+    """
+    Get financial totals grouped by institute, course, semester or payment method. Faculty and admin only.
+    """
+    groups = finance_reports.get_grouped_finance_report(
+        db,
+        group_by.value,
+        student_id=student_id,
+        semester_id=semester_id,
+        course_id=course_id,
+        institute_id=institute_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return {"group_by": group_by, "groups": groups}
@@ -1,26 +1,53 @@
-from typing import Any, List
+from datetime import datetime, timezone
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, Response, UploadFile, status
+from sqlalchemy.orm import Session, selectinload
 
 from app.core.dependencies import get_db, get_admin_user
-from app.core.security import get_password_hash
-from app.models.user import User, Role
-from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
+from app.core.pagination import decode_cursor, keyset_filter, set_next_cursor
+from app.core.principals import Principal, principal_cache
+from app.core.revocation import revocation_list
+from app.core.role_registry import role_registry
+from app.core.password_pool import password_pool, password_pool_busy, PasswordPoolSaturated
+from app.models.academic import Course
+from app.models.user import User
+from app.schemas.user import User as UserSchema, UserCreate, UserUpdate, UserImportJob
+from app.services import user_import, user_search
+from app.services.user_import_jobs import user_import_jobs
 
 router = APIRouter()
 
 @router.get("/", response_model=List[UserSchema])
 def read_users(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_admin_user),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
     Retrieve users. Admin only.
+    
+    Pass the X-Next-Cursor response header back as ``cursor`` to fetch the next
+    page in constant time; ``skip`` is still honoured when no cursor is given.
     """
-    users = db.query(User).offset(skip).limit(limit).all()
+    # Roles and courses (with their institute) are serialized for every user;
+    # load them in one query each instead of lazily per user
+    query = db.query(User).options(
+        selectinload(User.roles),
+        selectinload(User.courses).joinedload(Course.institute),
+    )
+    
+    query = query.order_by(User.id)
+    if cursor:
+        query = query.filter(keyset_filter([User.id], decode_cursor(cursor, [int])))
+    else:
+        query = query.offset(skip)
+    
+    users = query.limit(limit).all()
+    set_next_cursor(response, users, limit, lambda user: [user.id])
     return users
 
 @router.post("/", response_model=UserSchema)
@@ -28,7 +55,7 @@ def create_user(
     *,
     db: Session = Depends(get_db),
     user_in: UserCreate,
-    current_user: User = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
     Create new user. Admin only.
@@ -40,33 +67,102 @@ def create_user(
             detail="The user with this email already exists in the system",
         )
     
+    try:
+        hashed_password = password_pool.hash_blocking(user_in.password)
+    except PasswordPoolSaturated:
+        raise password_pool_busy()
+    
+    role_ids = role_registry.resolve(db, user_in.roles)
+    
     # Create user
     db_user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         full_name=user_in.full_name,
         is_active=user_in.is_active,
     )
+    db.add(db_user)
+    db.flush()
     
     # Assign roles
-    for role_name in user_in.roles:
-        role = db.query(Role).filter(Role.name == role_name).first()
-        if not role:
-            role = Role(name=role_name, description=f"{role_name} role")
-            db.add(role)
-            db.flush()
-        db_user.roles.append(role)
+    role_registry.set_user_roles(db, db_user.id, role_ids.values())
     
-    db.add(db_user)
     db.commit()
     db.refresh(db_user)
     return db_user
 
+@router.post("/import", response_model=UserImportJob, status_code=status.HTTP_202_ACCEPTED)
+def bulk_import_users(
+    *,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, regex="^(csv|ndjson)$"),
+    current_user: Principal = Depends(get_admin_user),
+) -> Any:
+    """
+    Import users from a CSV or NDJSON upload. Admin only.
+    
+    CSV needs a header row with email, password and optionally full_name,
+    is_active and roles (separated by semicolons). NDJSON holds one UserCreate
+    object per line. Rows that fail are reported and the rest are imported.
+    
+    The import runs in the background; poll ``GET /import/{job_id}`` for its
+    progress and per-row errors.
+    """
+    fmt = format or user_import.detect_format(file.filename, file.content_type)
+    if fmt is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Unknown file format, upload a .csv or .ndjson file or pass format",
+        )
+    return user_import_jobs.submit(file.file, fmt).snapshot()
+
+@router.get("/import/{job_id}", response_model=UserImportJob)
+def read_import_job(
+    job_id: str,
+    current_user: Principal = Depends(get_admin_user),
+) -> Any:
+    """
+    Get the progress of a bulk import. Admin only.
+    """
+    job = user_import_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail="The import job with this id does not exist",
+        )
+    return job.snapshot()
+
+@router.get("/search", response_model=List[UserSchema])
+def search_users(
+    q: str = Query(..., min_length=1, max_length=254),
+    role: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_admin_user),
+) -> Any:
+    """
+    Search users by email or full name, optionally only those with a role. Admin only.
+    
+    Terms of one or two characters match prefixes; longer terms also match
+    anywhere in the email or name. Best matches come first.
+    """
+    if not q.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Search term must not be blank",
+        )
+    role_id = None
+    if role is not None:
+        role_id = role_registry.find_id(db, role)
+        if role_id is None:
+            return []
+    return user_search.search_users(db, q, role_id=role_id, limit=limit)
+
 @router.get("/{user_id}", response_model=UserSchema)
 def read_user_by_id(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
     Get a specific user by id. Admin only.
@@ -85,7 +181,7 @@ def update_user(
     db: Session = Depends(get_db),
     user_id: int,
     user_in: UserUpdate,
-    current_user: User = Depends(get_admin_user),
+    current_user: Principal = Depends(get_admin_user),
 ) -> Any:
     """
     Update a user. Admin only.
@@ -96,6 +192,13 @@ def update_user(
             status_code=404,
             detail="The user with this id does not exist in the system",
         )
+    new_role_ids = None
+    if user_in.roles is not None:
+        new_role_ids = set(role_registry.resolve(db, user_in.roles).values())
+        if new_role_ids == role_registry.user_role_ids(db, user.id):
+            new_role_ids = None
+    # Tokens carry the role set, so role and password changes cut off every token issued so far
+    revoke_tokens = user_in.password is not None or new_role_ids is not None
     
     # Update user fields
     if user_in.email is not None:
@@ -105,22 +208,27 @@ def update_user(
     if user_in.is_active is not None:
         user.is_active = user_in.is_active
     if user_in.password is not None:
-        user.hashed_password = get_password_hash(user_in.password)
+        try:
+            user.hashed_password = password_pool.hash_blocking(user_in.password)
+        except PasswordPoolSaturated:
+            raise password_pool_busy()
     
-    # Update roles if provided
-    if user_in.roles is not None:
-        # Clear existing roles
-        user.roles = []
-        # Add new roles
-        for role_name in user_in.roles:
-            role = db.query(Role).filter(Role.name == role_name).first()
-            if not role:
-                role = Role(name=role_name, description=f"{role_name} role")
-                db.add(role)
-                db.flush()
-            user.roles.append(role)
+    # Replace roles if they changed
+    if new_role_ids is not None:
+        role_registry.set_user_roles(db, user.id, new_role_ids, replace=True)
+    tokens_valid_after = datetime.now(timezone.utc) if revoke_tokens else None
+    if tokens_valid_after is not None:
+        user.tokens_valid_after = tokens_valid_after
     
     db.add(user)
     db.commit()
     db.refresh(user)
+    
+    # Drop the cached principal so tokens without a role set see the change now.
+    # Tokens carrying roles are cut off through the revocation list: immediately
+    # in this process, within REVOCATION_REFRESH_SECONDS in the others
+    principal_cache.invalidate(user.id)
+    revocation_list.set_user_active(user.id, user.is_active)
+    if tokens_valid_after is not None:
+        revocation_list.set_tokens_valid_after(user.id, tokens_valid_after)
     return user
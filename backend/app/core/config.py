@@ -6,7 +6,8 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "University App"
     API_V1_STR: str = "/api"
     SECRET_KEY: str = "YOUR_SECRET_KEY_HERE"  # In production, use a secure random key
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000", "http://localhost", "http://127.0.0.1:3000", "http://127.0.0.1:8000"]
     
     # Database settings
@@ -16,6 +17,61 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "university_app")
     SQLALCHEMY_DATABASE_URI: Union[PostgresDsn, str] = ""
 
+    # Receipt PDF cache: a bounded in-memory LRU in front of files on disk
+    RECEIPT_CACHE_DIR: str = "receipts"
+    RECEIPT_CACHE_MAX_ENTRIES: int = 1024
+
+    # Receipt rendering runs in a process pool; 0 workers renders in the calling thread
+    RECEIPT_RENDER_WORKERS: int = 2
+    RECEIPT_RENDER_QUEUE_SIZE: int = 16
+    RECEIPT_RENDER_TIMEOUT_SECONDS: float = 30
+    RECEIPT_RENDER_RETRY_AFTER_SECONDS: int = 5
+    # Receipt archives stop rendering after this long; the rest are listed as failed
+    RECEIPT_ARCHIVE_TIMEOUT_SECONDS: float = 300
+
+    # Background pre-rendering of receipts after payment; 0 workers disables it
+    RECEIPT_PRERENDER_WORKERS: int = 2
+    RECEIPT_PRERENDER_MAX_ATTEMPTS: int = 3
+    RECEIPT_PRERENDER_RETRY_DELAY_SECONDS: float = 1
+    # Unfinished receipts each process claims at startup, and how old a
+    # "rendering" claim must be before it counts as abandoned
+    RECEIPT_PRERENDER_RESUME_LIMIT: int = 500
+    RECEIPT_PRERENDER_STALE_SECONDS: float = 600
+    
+    # Largest batch accepted by POST /api/finance/payments/batch
+    PAYMENT_BATCH_MAX_ITEMS: int = 5000
+    
+    # Resolved principals (user id, active flag, role names) cached per process
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60
+    
+    # Verified JWTs cached by digest; entries never outlive the token's own exp
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: float = 300
+    
+    # Bulk user import: rows per insert/commit, hashes each import keeps in the
+    # password pool at once, imports run side by side, and how long finished
+    # jobs stay queryable
+    USER_IMPORT_BATCH_SIZE: int = 500
+    USER_IMPORT_HASHES_IN_FLIGHT: int = 2
+    USER_IMPORT_JOB_WORKERS: int = 1
+    USER_IMPORT_JOB_RETENTION_SECONDS: float = 3600
+    
+    # How often each process reloads revoked token ids and deactivated users
+    REVOCATION_REFRESH_SECONDS: float = 30
+    # How often expired rows are deleted from revoked_tokens
+    REVOKED_TOKEN_PURGE_SECONDS: float = 3600
+    
+    # Password hashing: new hashes use the first scheme and the configured bcrypt cost;
+    # hashes in other schemes or at another cost are rehashed on the next login
+    PASSWORD_HASH_SCHEMES: List[str] = ["bcrypt"]
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    
+    # Dedicated bcrypt pool; logins beyond workers + queue get a 503 with Retry-After
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
     @validator("SQLALCHEMY_DATABASE_URI", pre=True)
     def assemble_db_connection(cls, v: str, values: Dict[str, Any]) -> Any:
         if isinstance(v, str) and v != "":
@@ -2,15 +2,17 @@ from typing import Generator, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from jose import JWTError
+from jose.exceptions import ExpiredSignatureError
+from sqlalchemy.orm import Session, selectinload
 from pydantic import ValidationError
 
 from app.db.session import SessionLocal
 from app.core.config import settings
-from app.core.security import oauth2_scheme
+from app.core.principals import Principal, principal_cache
+from app.core.revocation import revocation_list
+from app.core.security import decode_access_token, oauth2_scheme
 from app.models.user import User, Role
-from app.schemas.user import TokenPayload
 
 def get_db() -> Generator:
     db = SessionLocal()
@@ -21,36 +23,81 @@ def get_db() -> Generator:
 
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+) -> Principal:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=["HS256"]
+        token_data = decode_access_token(token)
+    except ExpiredSignatureError:
+        # 401 tells clients to use their refresh token
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has expired",
+            headers={"WWW-Authenticate": "Bearer"},
         )
-        token_data = TokenPayload(**payload)
     except (JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = db.query(User).filter(User.id == token_data.sub).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    if not user.is_active:
+    if revocation_list.is_user_inactive(token_data.sub):
         raise HTTPException(status_code=400, detail="Inactive user")
-    return user
+    if revocation_list.is_token_revoked(token_data.jti):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    # Tokens carrying the role set are trusted as issued, no database round trip,
+    # unless the user's roles or password changed after the token was issued
+    if token_data.roles is not None:
+        if revocation_list.is_token_stale(token_data.sub, token_data.iat):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return Principal(id=token_data.sub, is_active=True, roles=token_data.roles)
+    
+    # Older tokens resolve the caller through the principal cache
+    principal = principal_cache.get(token_data.sub)
+    if principal is None:
+        principal = load_principal(db, token_data.sub)
+        if not principal:
+            raise HTTPException(status_code=404, detail="User not found")
+        principal_cache.put(principal.id, principal)
+    if not principal.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+def load_principal(db: Session, user_id: int) -> Optional[Principal]:
+    """
+    Resolve a user and their role names with the roles loaded eagerly.
+    """
+    user = (
+        db.query(User)
+        .options(selectinload(User.roles))
+        .filter(User.id == user_id)
+        .first()
+    )
+    if not user:
+        return None
+    return Principal(
+        id=user.id,
+        is_active=user.is_active,
+        roles=(role.name for role in user.roles),
+    )
 
 def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 def get_user_by_role(required_role: str):
-    def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
-        for role in current_user.roles:
-            if role.name == required_role:
-                return current_user
+    def role_checker(current_user: Principal = Depends(get_current_active_user)) -> Principal:
+        if required_role in current_user.roles:
+            return current_user
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"User does not have required role: {required_role}",
@@ -0,0 +1,60 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence
+
+from fastapi import HTTPException, Response
+from sqlalchemy import tuple_
+
+# Response header carrying the cursor for the next page of a keyset-paginated listing
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor, converting each value to the given type.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(payload) != len(types):
+            raise ValueError("cursor has the wrong number of values")
+        return [
+            datetime.fromisoformat(value) if value_type is datetime else value_type(value)
+            for value, value_type in zip(payload, types)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid pagination cursor",
+        )
+
+def keyset_filter(columns: Sequence[Any], values: Sequence[Any], descending: bool = False):
+    """
+    Build the WHERE clause selecting rows after the cursor position.
+
+    ``columns`` must be the full ORDER BY key, ending in a unique column, and
+    sorted in the same direction.
+    """
+    if descending:
+        return tuple_(*columns) < tuple_(*values)
+    return tuple_(*columns) > tuple_(*values)
+
+def set_next_cursor(
+    response: Response, items: Sequence[Any], limit: int, key: Callable[[Any], Sequence[Any]]
+) -> Optional[str]:
+    """
+    Expose the cursor for the page after ``items`` in the response headers.
+
+    No cursor is set when the page is shorter than ``limit``, i.e. it is the last page.
+    """
+    if not items or len(items) < limit:
+        return None
+    cursor = encode_cursor(key(items[-1]))
+    response.headers[NEXT_CURSOR_HEADER] = cursor
+    return cursor
@@ -0,0 +1,116 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password, verify_and_update_password
+
+class PasswordPoolSaturated(Exception):
+    """Raised when every hashing worker is busy and the queue is full."""
+
+def password_pool_busy() -> HTTPException:
+    """The 503 returned when the hashing pool refuses more work."""
+    return HTTPException(
+        status_code=503,
+        detail="Too many concurrent sign-ins, please retry shortly",
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+class PasswordHashPool:
+    """
+    Runs bcrypt verification and hashing on a dedicated, size-bounded process
+    pool, separate from the request thread pool, so a burst of logins only
+    ever occupies ``max_workers`` cores and the rest of the API stays
+    responsive. Processes rather than threads, because passlib's os_crypt
+    bcrypt backend holds the GIL for the whole hash.
+
+    At most ``max_workers + max_queue`` operations are admitted at once;
+    further submissions raise PasswordPoolSaturated so callers can answer
+    503 instead of queueing without bound.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(max(1, max_workers) + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn avoids forking a process that is already running threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=max(1, self.max_workers),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        """
+        Queue a hashing operation. Raises PasswordPoolSaturated when full.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordPoolSaturated()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            task = self._get_executor().submit(func, *args)
+        except Exception:
+            self._release(None)
+            raise
+        task.add_done_callback(self._release)
+        return task
+
+    def _release(self, task: Optional[Future]) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if task is not None:
+                self._completed += 1
+        self._slots.release()
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(self.submit(verify_password, plain_password, hashed_password))
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await asyncio.wrap_future(
+            self.submit(verify_and_update_password, plain_password, hashed_password)
+        )
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self.submit(get_password_hash, password))
+
+    def hash_blocking(self, password: str) -> str:
+        """
+        Hash from a synchronous route; the request thread waits but bcrypt
+        itself runs in the hashing pool.
+        """
+        return self.submit(get_password_hash, password).result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queue_capacity": self.max_queue,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - max(1, self.max_workers)),
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+password_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE)
@@ -0,0 +1,38 @@
+from typing import FrozenSet, Iterable
+
+from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+
+class Principal:
+    """
+    The authenticated caller: just what authorization checks need.
+
+    Role flags are computed once when the principal is resolved, so route
+    checks are attribute reads instead of scans over ``User.roles``.
+    """
+
+    __slots__ = ("id", "is_active", "roles", "is_admin", "is_faculty", "is_student")
+
+    def __init__(self, id: int, is_active: bool, roles: Iterable[str]):
+        self.id = id
+        self.is_active = is_active
+        self.roles: FrozenSet[str] = frozenset(roles)
+        self.is_admin = "admin" in self.roles
+        self.is_faculty = "faculty" in self.roles
+        self.is_student = "student" in self.roles
+
+    @property
+    def is_staff(self) -> bool:
+        """Admins and faculty can see every student's finance records."""
+        return self.is_admin or self.is_faculty
+
+    def __repr__(self) -> str:
+        return f"Principal(id={self.id!r}, is_active={self.is_active!r}, roles={sorted(self.roles)!r})"
+
+# Resolved principals keyed by user id. Entries expire after the TTL so changes
+# made by other processes are picked up eventually; changes made through the
+# API invalidate the entry right away.
+principal_cache = TTLCache(
+    settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional, Set
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.core.security import ACCESS_TOKEN_TYPE
+from app.models.user import User, RevokedToken
+
+logger = logging.getLogger(__name__)
+
+class RevocationList:
+    """
+    In-memory view of revoked token ids, deactivated users and per-user
+    token cut-offs (tokens issued before a role or password change).
+
+    Access tokens that carry their role set are trusted without a database
+    lookup, so this is what cuts a user off before their token expires. The
+    sets are rebuilt from the database every ``refresh_interval`` seconds by
+    a background thread, so revocations made by other processes apply within
+    that interval; revocations made in this process apply immediately.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float,
+        session_factory: Callable[[], Session] = SessionLocal,
+        purge_interval: float = settings.REVOKED_TOKEN_PURGE_SECONDS,
+    ):
+        self.refresh_interval = refresh_interval
+        self.purge_interval = purge_interval
+        self.session_factory = session_factory
+        self._revoked_jtis: Set[str] = set()
+        self._inactive_user_ids: Set[int] = set()
+        self._tokens_valid_after: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # Reads need no lock: membership tests are atomic and rebuild swaps in new sets
+    def is_token_revoked(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._revoked_jtis
+
+    def is_user_inactive(self, user_id: Optional[int]) -> bool:
+        return user_id in self._inactive_user_ids
+
+    def is_token_stale(self, user_id: Optional[int], issued_at: Optional[float]) -> bool:
+        """Whether a token was issued before the user's cut-off; tokens without iat predate cut-offs."""
+        cutoff = self._tokens_valid_after.get(user_id)
+        return cutoff is not None and (issued_at is None or issued_at < cutoff)
+
+    def revoke_token(self, jti: str) -> None:
+        with self._lock:
+            self._revoked_jtis.add(jti)
+
+    def set_user_active(self, user_id: int, is_active: bool) -> None:
+        with self._lock:
+            if is_active:
+                self._inactive_user_ids.discard(user_id)
+            else:
+                self._inactive_user_ids.add(user_id)
+
+    def set_tokens_valid_after(self, user_id: int, cutoff: datetime) -> None:
+        with self._lock:
+            self._tokens_valid_after[user_id] = utc_timestamp(cutoff)
+
+    def rebuild(self, db: Session) -> None:
+        """
+        Reload unexpired revoked access token ids, inactive user ids and token cut-offs.
+
+        Rotated and logged-out refresh tokens stay in the database only: the
+        refresh endpoint looks them up there, so holding them here would just
+        grow every process by each refresh made in the last eight days.
+        """
+        now = datetime.now(timezone.utc)
+        revoked = set(db.execute(
+            select(RevokedToken.jti)
+            .where(RevokedToken.expires_at > now, RevokedToken.token_type == ACCESS_TOKEN_TYPE)
+        ).scalars())
+        inactive = set(db.execute(select(User.id).where(User.is_active.is_(False))).scalars())
+        # Older cut-offs only concern tokens that have expired anyway
+        oldest_live_token = now - timedelta(
+            minutes=max(settings.ACCESS_TOKEN_EXPIRE_MINUTES, settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+        )
+        cutoffs = {
+            user_id: utc_timestamp(cutoff)
+            for user_id, cutoff in db.execute(
+                select(User.id, User.tokens_valid_after).where(User.tokens_valid_after > oldest_live_token)
+            )
+        }
+        with self._lock:
+            self._revoked_jtis = revoked
+            self._inactive_user_ids = inactive
+            self._tokens_valid_after = cutoffs
+
+    @staticmethod
+    def purge_expired(db: Session) -> int:
+        """Delete revoked tokens that have expired anyway; returns the rows deleted."""
+        result = db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(timezone.utc)))
+        db.commit()
+        return result.rowcount
+
+    def _run(self) -> None:
+        last_purge = time.monotonic()
+        while not self._stop.wait(self.refresh_interval):
+            db = self.session_factory()
+            try:
+                self.rebuild(db)
+                if time.monotonic() - last_purge >= self.purge_interval:
+                    last_purge = time.monotonic()
+                    self.purge_expired(db)
+            except Exception:
+                logger.exception("Reloading the token revocation list failed")
+            finally:
+                db.close()
+
+    def start(self) -> None:
+        """Load the lists now and keep them fresh in a background thread."""
+        db = self.session_factory()
+        try:
+            self.rebuild(db)
+        finally:
+            db.close()
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="token-revocation", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._revoked_jtis = set()
+            self._inactive_user_ids = set()
+            self._tokens_valid_after = {}
+
+def utc_timestamp(value: datetime) -> float:
+    # SQLite hands back naive datetimes; they are stored in UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+revocation_list = RevocationList(settings.REVOCATION_REFRESH_SECONDS)
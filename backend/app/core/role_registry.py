@@ -0,0 +1,105 @@
+import threading
+from typing import Dict, Iterable, Mapping, Optional, Set
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.associations import user_role
+from app.models.user import Role
+
+def _insert_missing_roles(conn: Connection, rows: list) -> None:
+    """Insert roles, skipping names another writer created first."""
+    if conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif conn.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        for row in rows:
+            try:
+                with conn.begin_nested():
+                    conn.execute(insert(Role), [row])
+            except IntegrityError:
+                pass
+        return
+    conn.execute(dialect_insert(Role).values(rows).on_conflict_do_nothing(index_elements=[Role.name]))
+
+class RoleRegistry:
+    """
+    Process-wide map of role names to ids.
+
+    Roles are a handful of rows that almost never change, so user writes
+    resolve names here instead of querying ``roles`` per name. Unknown names
+    are created with one batched upsert in their own transaction (so a caller
+    rolling back cannot leave ids for roles that do not exist) and the map is
+    then reloaded, which also picks up roles created by other processes.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def load(self, db: Session) -> None:
+        """Replace the map with every role in the database."""
+        ids = dict(db.execute(select(Role.name, Role.id)).all())
+        with self._lock:
+            self._ids = ids
+
+    def get_id(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+
+    def find_id(self, db: Session, name: str) -> Optional[int]:
+        """Look up a role id without creating the role, reloading the map on a miss."""
+        if name not in self._ids:
+            self.load(db)
+        return self._ids.get(name)
+
+    def ensure(self, db: Session, roles: Mapping[str, Optional[str]]) -> Dict[str, int]:
+        """
+        Resolve role names to ids, creating missing roles with the given descriptions.
+        """
+        missing = [name for name in roles if name not in self._ids]
+        if missing:
+            with self._lock:
+                with db.get_bind().connect() as conn:
+                    ids = dict(conn.execute(select(Role.name, Role.id)).all())
+                    rows = [
+                        {"name": name, "description": roles[name] or f"{name} role"}
+                        for name in missing if name not in ids
+                    ]
+                    if rows:
+                        _insert_missing_roles(conn, rows)
+                        conn.commit()
+                        ids = dict(conn.execute(select(Role.name, Role.id)).all())
+                self._ids = ids
+        return {name: self._ids[name] for name in roles}
+
+    def resolve(self, db: Session, names: Iterable[str]) -> Dict[str, int]:
+        """Resolve role names to ids, creating missing roles with a default description."""
+        return self.ensure(db, dict.fromkeys(names))
+
+    def set_user_roles(self, db: Session, user_id: int, role_ids: Iterable[int], replace: bool = False) -> None:
+        """
+        Link a user to roles by inserting ``user_roles`` rows directly.
+
+        Resolve the ids before the caller's first write: creating a role uses
+        its own connection, which would wait on the caller's locks under
+        SQLite. With ``replace`` the user's existing links are deleted first.
+        Any ``User.roles`` already loaded in the session is stale until refreshed.
+        """
+        if replace:
+            db.execute(delete(user_role).where(user_role.c.user_id == user_id))
+        rows = [{"user_id": user_id, "role_id": role_id} for role_id in set(role_ids)]
+        if rows:
+            db.execute(insert(user_role), rows)
+
+    def user_role_ids(self, db: Session, user_id: int) -> Set[int]:
+        """Ids of the roles a user holds, read from ``user_roles`` alone."""
+        return set(db.execute(select(user_role.c.role_id).where(user_role.c.user_id == user_id)).scalars())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids = {}
+
+role_registry = RoleRegistry()
@@ -1,18 +1,57 @@
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
 
-from jose import jwt
+from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 
 from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+from app.schemas.user import TokenPayload
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def build_pwd_context(schemes=None, bcrypt_rounds: Optional[int] = None) -> CryptContext:
+    """
+    Build the password context from settings.
+
+    bcrypt's minimum and maximum rounds are pinned to the configured cost, so
+    ``needs_update`` flags hashes made at any other cost and logins rehash them.
+    """
+    schemes = schemes or settings.PASSWORD_HASH_SCHEMES
+    rounds = bcrypt_rounds or settings.PASSWORD_BCRYPT_ROUNDS
+    options: Dict[str, Any] = {}
+    if "bcrypt" in schemes:
+        options.update(
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds,
+        )
+    return CryptContext(schemes=schemes, deprecated="auto", **options)
+
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+pwd_context = build_pwd_context()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+# Decoded payloads of tokens whose signature has already been verified, keyed by token digest
+verified_token_cache = TTLCache(settings.TOKEN_CACHE_MAX_ENTRIES, settings.TOKEN_CACHE_TTL_SECONDS)
+
 def create_access_token(
-    subject: Union[str, Any], role: str, expires_delta: Optional[timedelta] = None
+    subject: Union[str, Any],
+    role: str,
+    expires_delta: Optional[timedelta] = None,
+    roles: Optional[Iterable[str]] = None,
 ) -> str:
+    """
+    Issue a signed access token.
+
+    Tokens issued with ``roles`` carry the caller's full role set and a jti,
+    so get_current_user can trust them without a database lookup; tokens
+    without are resolved through the principal cache.
+    """
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -20,11 +59,65 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode = {"exp": expire, "sub": str(subject), "role": role}
+    if roles is not None:
+        # iat is fractional so a cut-off set in the same second still separates old tokens from new
+        to_encode.update(roles=sorted(roles), jti=uuid.uuid4().hex, type=ACCESS_TOKEN_TYPE, iat=time.time())
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
     return encoded_jwt
 
+def create_refresh_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+    """
+    Issue a long-lived refresh token, only accepted by the refresh endpoint.
+    """
+    expire = datetime.utcnow() + (
+        expires_delta or timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+    )
+    to_encode = {
+        "exp": expire, "sub": str(subject), "jti": uuid.uuid4().hex, "type": REFRESH_TOKEN_TYPE, "iat": time.time(),
+    }
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
+
+def decode_refresh_token(token: str) -> TokenPayload:
+    """
+    Verify a refresh token. Raises JWTError or ValidationError for invalid
+    tokens, including access tokens presented as refresh tokens.
+    """
+    token_data = TokenPayload(**jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"]))
+    if token_data.type != REFRESH_TOKEN_TYPE or not token_data.jti:
+        raise JWTError("Not a refresh token")
+    return token_data
+
+def decode_access_token(token: str) -> TokenPayload:
+    """
+    Verify a token's signature and expiry and return its payload.
+
+    Tokens seen before are served from verified_token_cache; an entry expires
+    no later than the token's own ``exp``. Raises JWTError or ValidationError
+    for invalid tokens and for refresh tokens.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    token_data = verified_token_cache.get(digest)
+    if token_data is not None:
+        return token_data
+    
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+    token_data = TokenPayload(**payload)
+    if token_data.type == REFRESH_TOKEN_TYPE:
+        raise JWTError("Refresh tokens cannot be used for API access")
+    if "exp" in payload:
+        # exp is wall-clock time, the cache runs on the monotonic clock
+        expires_at = time.monotonic() + (payload["exp"] - time.time())
+        verified_token_cache.put(digest, token_data, expires_at=expires_at)
+    return token_data
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if its hash is stale, return a fresh hash to store.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
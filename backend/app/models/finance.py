@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Text, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.sqltypes import DateTime
 from sqlalchemy.sql import func
@@ -58,6 +58,10 @@ class StandardFee(Base):
         UniqueConstraint('course_id', 'semester_id', name='uix_standard_fee_course_semester'),
     )
 
+def _initial_balance(context):
+    # A new fee has nothing paid against it yet, so its balance is the full amount
+    return context.get_current_parameters().get("amount")
+
 class StudentFee(Base):
     __tablename__ = "student_fees"
 
@@ -67,6 +71,9 @@ class StudentFee(Base):
     semester_id = Column(Integer, ForeignKey("semesters.id"), nullable=False)
     amount = Column(Float, nullable=True)  # Made nullable to support using standard fees
     description = Column(String)
+    # Denormalized payment ledger, maintained by app.services.fee_ledger
+    paid_amount = Column(Float, nullable=False, default=0, server_default="0")
+    balance = Column(Float, nullable=True, index=True, default=_initial_balance)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -75,6 +82,11 @@ class StudentFee(Base):
     course = relationship("Course", back_populates="student_fees")
     semester = relationship("Semester", back_populates="student_fees")
     payments = relationship("Payment", back_populates="student_fee")
+    
+    __table_args__ = (
+        Index('ix_student_fees_student_id_semester_id', 'student_id', 'semester_id'),
+        Index('ix_student_fees_semester_id', 'semester_id'),
+    )
 
 class Payment(Base):
     __tablename__ = "payments"
@@ -92,6 +104,21 @@ class Payment(Base):
     student = relationship("User", back_populates="payments")
     student_fee = relationship("StudentFee", back_populates="payments")
     receipt = relationship("Receipt", back_populates="payment", uselist=False)
+    
+    __table_args__ = (
+        # Matches the newest-first keyset pagination order of the payments listing
+        Index('ix_payments_payment_date_id', 'payment_date', 'id'),
+        Index('ix_payments_student_id_payment_date', 'student_id', 'payment_date'),
+        Index('ix_payments_student_fee_id', 'student_fee_id'),
+    )
+
+# Receipt PDF pre-rendering states, see app.services.receipt_worker
+RECEIPT_STATUS_PENDING = "pending"
+RECEIPT_STATUS_RENDERING = "rendering"
+RECEIPT_STATUS_READY = "ready"
+RECEIPT_STATUS_FAILED = "failed"
+# Issued before pre-rendering existed; rendered on first download, never resumed
+RECEIPT_STATUS_NOT_PRERENDERED = "not_prerendered"
 
 class Receipt(Base):
     __tablename__ = "receipts"
@@ -100,6 +127,11 @@ class Receipt(Base):
     payment_id = Column(Integer, ForeignKey("payments.id"), unique=True, nullable=False)
     receipt_number = Column(String, unique=True, nullable=False)
     generated_at = Column(DateTime(timezone=True), server_default=func.now())
+    status = Column(String, nullable=False, default=RECEIPT_STATUS_PENDING, server_default=RECEIPT_STATUS_PENDING)
+    render_attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    rendered_at = Column(DateTime(timezone=True))
+    # When a worker last took the receipt for rendering; older claims are treated as abandoned
+    claimed_at = Column(DateTime(timezone=True))
     
     # Relationships
     payment = relationship("Payment", back_populates="receipt")
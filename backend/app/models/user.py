@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.sqltypes import DateTime
 from sqlalchemy.sql import func
@@ -16,12 +16,42 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Tokens issued before this instant are rejected (set on role or password changes)
+    tokens_valid_after = Column(DateTime(timezone=True), index=True)
     
     # Relationships
     roles = relationship("Role", secondary=user_role, back_populates="users")
     courses = relationship("Course", secondary=student_course, back_populates="students")
     student_fees = relationship("StudentFee", back_populates="student")
     payments = relationship("Payment", back_populates="student")
+    
+    __table_args__ = (
+        # Case-insensitive prefix search (app.services.user_search); text_pattern_ops
+        # lets PostgreSQL use them for LIKE 'prefix%' under any collation
+        Index(
+            'ix_users_lower_email', func.lower(email).label('lower_email'),
+            postgresql_ops={'lower_email': 'text_pattern_ops'},
+        ),
+        Index(
+            'ix_users_lower_full_name', func.lower(full_name).label('lower_full_name'),
+            postgresql_ops={'lower_full_name': 'text_pattern_ops'},
+        ),
+        # Substring search on PostgreSQL; other databases scan for substrings
+        Index(
+            'ix_users_lower_email_trgm', func.lower(email).label('lower_email'),
+            postgresql_using='gin', postgresql_ops={'lower_email': 'gin_trgm_ops'},
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'ix_users_lower_full_name_trgm', func.lower(full_name).label('lower_full_name'),
+            postgresql_using='gin', postgresql_ops={'lower_full_name': 'gin_trgm_ops'},
+        ).ddl_if(dialect='postgresql'),
+    )
+
+# The trigram indexes need pg_trgm
+event.listen(
+    User.__table__, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'),
+)
 
 class Role(Base):
     __tablename__ = "roles"
@@ -32,3 +62,13 @@ class Role(Base):
     
     # Relationships
     users = relationship("User", secondary=user_role, back_populates="roles")
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # "access" or "refresh"; only revoked access tokens are held in memory
+    token_type = Column(String, nullable=False, default="access", server_default="access")
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,4 +1,5 @@
-from typing import List, Optional
+from enum import Enum
+from typing import List, Optional, Union
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -93,8 +94,21 @@ class StudentFeeCreate(StudentFeeBase):
 class StudentFeeUpdate(StudentFeeBase):
     pass
 
+class StudentFeeBulkCreate(BaseModel):
+    course_id: int
+    semester_id: int
+    # Defaults to the standard fee's description
+    description: Optional[str] = None
+
+class StudentFeeBulkResult(BaseModel):
+    enrolled: int
+    created: int
+    skipped: int
+
 class StudentFeeInDBBase(StudentFeeBase):
     id: int
+    paid_amount: float = 0
+    balance: Optional[float] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -133,6 +147,19 @@ class PaymentCreate(PaymentBase):
 class PaymentUpdate(PaymentBase):
     pass
 
+class PaymentBatchItemResult(BaseModel):
+    index: int
+    status: str  # 'created' or 'failed'
+    payment_id: Optional[int] = None
+    receipt_id: Optional[int] = None
+    receipt_number: Optional[str] = None
+    detail: Optional[str] = None
+
+class PaymentBatchResult(BaseModel):
+    created: int
+    failed: int
+    items: List[PaymentBatchItemResult]
+
 class PaymentInDBBase(PaymentBase):
     id: int
     payment_date: datetime
@@ -157,6 +184,8 @@ class ReceiptUpdate(ReceiptBase):
 class ReceiptInDBBase(ReceiptBase):
     id: int
     generated_at: datetime
+    status: str = "pending"
+    rendered_at: Optional[datetime] = None
 
     class Config:
         orm_mode = True
@@ -164,6 +193,27 @@ class ReceiptInDBBase(ReceiptBase):
 class Receipt(ReceiptInDBBase):
     pass
 
+class ReceiptSummary(BaseModel):
+    id: int
+    receipt_number: str
+    generated_at: datetime
+    status: str
+    payment_id: int
+    payment_date: datetime
+    amount: float
+    payment_method: str
+    student_id: int
+    semester_id: int
+    semester_name: str
+    course_id: int
+    course_name: str
+
+class ReceiptPage(BaseModel):
+    total: int
+    skip: int
+    limit: int
+    items: List[ReceiptSummary] = []
+
 # Combined schemas for API responses
 class PaymentWithReceipt(Payment):
     receipt: Optional[Receipt] = None
@@ -174,3 +224,23 @@ class SemesterWithCourse(Semester):
 
 class StudentFeeWithPayments(StudentFee):
     payments: List[PaymentWithReceipt] = []
+
+# Finance report schemas
+class ReportGroupBy(str, Enum):
+    institute = "institute"
+    course = "course"
+    semester = "semester"
+    payment_method = "payment_method"
+
+class FinanceReportGroup(BaseModel):
+    key: Union[int, str]
+    label: str
+    total_fees: Optional[float] = None
+    total_paid: float
+    total_pending: Optional[float] = None
+    student_count: int
+    payment_count: int
+
+class FinanceReport(BaseModel):
+    group_by: ReportGroupBy
+    groups: List[FinanceReportGroup] = []
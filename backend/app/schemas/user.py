@@ -53,11 +53,38 @@ class User(UserInDBBase):
 class UserInDB(UserInDBBase):
     hashed_password: str
 
+# Bulk import schemas
+class UserImportError(BaseModel):
+    row: int
+    email: Optional[str] = None
+    detail: str
+
+class UserImportResult(BaseModel):
+    created: int
+    failed: int
+    errors: List[UserImportError] = []
+
+class UserImportJob(UserImportResult):
+    id: str
+    status: str
+    detail: Optional[str] = None
+    processed: int
+
 # Token schemas
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+class TokenRefresh(BaseModel):
+    refresh_token: str
 
 class TokenPayload(BaseModel):
     sub: Optional[int] = None
     role: Optional[str] = None
+    # Set on tokens issued with a role set; older tokens only carry sub and role
+    roles: Optional[List[str]] = None
+    jti: Optional[str] = None
+    type: Optional[str] = None
+    exp: Optional[int] = None
+    iat: Optional[float] = None
@@ -0,0 +1,47 @@
+from typing import Dict, Optional
+
+from sqlalchemy import and_, exists, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.associations import student_course
+from app.models.finance import StandardFee, StudentFee
+
+def bill_enrolled_students(
+    db: Session, standard_fee: StandardFee, description: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Create a student fee from ``standard_fee`` for every student enrolled in its course.
+
+    One INSERT ... SELECT over ``student_courses``; students who already have
+    a fee for the course and semester are skipped. New fees start with
+    nothing paid and the full amount as balance. The caller commits.
+    """
+    enrolled = db.execute(
+        select(func.count()).select_from(student_course).where(student_course.c.course_id == standard_fee.course_id)
+    ).scalar_one()
+
+    already_billed = exists().where(and_(
+        StudentFee.student_id == student_course.c.student_id,
+        StudentFee.semester_id == standard_fee.semester_id,
+        StudentFee.course_id == standard_fee.course_id,
+    ))
+    rows = (
+        select(
+            student_course.c.student_id,
+            StandardFee.course_id,
+            StandardFee.semester_id,
+            StandardFee.amount,
+            literal(description) if description is not None else StandardFee.description,
+            literal(0.0),
+            StandardFee.amount,
+        )
+        .join(StandardFee, StandardFee.course_id == student_course.c.course_id)
+        .where(StandardFee.id == standard_fee.id, ~already_billed)
+    )
+    result = db.execute(
+        insert(StudentFee).from_select(
+            ["student_id", "course_id", "semester_id", "amount", "description", "paid_amount", "balance"],
+            rows,
+        )
+    )
+    return {"enrolled": enrolled, "created": result.rowcount, "skipped": enrolled - result.rowcount}
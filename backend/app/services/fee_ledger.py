@@ -0,0 +1,62 @@
+from typing import Iterable, Mapping, Optional
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.finance import StudentFee, Payment
+
+def apply_payment(db: Session, student_fee_id: int, amount: float) -> None:
+    """
+    Add ``amount`` to the paid total of a student fee and lower its balance.
+
+    The increment is done in SQL as part of the caller's transaction, so it
+    commits or rolls back together with the payment row. Pass a negative
+    amount to reverse or correct a previously recorded payment.
+    """
+    db.execute(
+        update(StudentFee)
+        .where(StudentFee.id == student_fee_id)
+        .values(
+            paid_amount=StudentFee.paid_amount + amount,
+            balance=StudentFee.amount - (StudentFee.paid_amount + amount),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+def apply_payments(db: Session, amounts: Mapping[int, float]) -> None:
+    """
+    Apply several payments at once: ``amounts`` maps student fee ids to the
+    total paid against each. One executemany UPDATE in the caller's
+    transaction, like apply_payment.
+    """
+    if not amounts:
+        return
+    table = StudentFee.__table__
+    paid_amount = table.c.paid_amount + bindparam("paid")
+    db.execute(
+        update(table)
+        .where(table.c.id == bindparam("fee_id"))
+        .values(paid_amount=paid_amount, balance=table.c.amount - paid_amount),
+        [{"fee_id": fee_id, "paid": amount} for fee_id, amount in amounts.items()],
+    )
+
+def rebuild_ledger(db: Session, student_fee_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute paid amounts and balances from the payments table.
+
+    Rebuilds every student fee unless ``student_fee_ids`` is given. Returns
+    the number of student fees updated. The caller commits.
+    """
+    paid = (
+        select(func.coalesce(func.sum(Payment.amount), 0))
+        .where(Payment.student_fee_id == StudentFee.id)
+        .scalar_subquery()
+    )
+    statement = update(StudentFee).values(
+        paid_amount=paid,
+        balance=StudentFee.amount - paid,
+    )
+    if student_fee_ids is not None:
+        statement = statement.where(StudentFee.id.in_(list(student_fee_ids)))
+    result = db.execute(statement.execution_options(synchronize_session=False))
+    return result.rowcount
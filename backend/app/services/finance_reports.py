@@ -0,0 +1,176 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import distinct, func, select, true
+from sqlalchemy.orm import Session
+
+from app.models.academic import Institute, Course
+from app.models.finance import Semester, StudentFee, Payment
+
+def get_finance_summary(
+    db: Session,
+    student_id: Optional[int] = None,
+    semester_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Compute the finance summary with SQL aggregates in a single round trip.
+
+    Fees are filtered by student and semester, payments by student and date
+    range. Both aggregates are single-row subqueries cross joined into one
+    SELECT, so no ORM rows are loaded into Python.
+    """
+    fee_totals = select(
+        func.coalesce(func.sum(StudentFee.amount), 0).label("total_fees"),
+        func.count(distinct(StudentFee.student_id)).label("student_count"),
+    )
+    if student_id:
+        fee_totals = fee_totals.where(StudentFee.student_id == student_id)
+    if semester_id:
+        fee_totals = fee_totals.where(StudentFee.semester_id == semester_id)
+    fee_totals = fee_totals.subquery("fee_totals")
+
+    payment_totals = select(
+        func.coalesce(func.sum(Payment.amount), 0).label("total_paid"),
+        func.count(Payment.id).label("payment_count"),
+    )
+    if student_id:
+        payment_totals = payment_totals.where(Payment.student_id == student_id)
+    if start_date:
+        payment_totals = payment_totals.where(Payment.payment_date >= start_date)
+    if end_date:
+        payment_totals = payment_totals.where(Payment.payment_date <= end_date)
+    payment_totals = payment_totals.subquery("payment_totals")
+
+    row = db.execute(
+        select(
+            fee_totals.c.total_fees,
+            fee_totals.c.student_count,
+            payment_totals.c.total_paid,
+            payment_totals.c.payment_count,
+        ).select_from(fee_totals.join(payment_totals, true()))
+    ).one()
+
+    return {
+        "total_fees": row.total_fees,
+        "total_paid": row.total_paid,
+        "total_pending": row.total_fees - row.total_paid,
+        "student_count": row.student_count,
+        "payment_count": row.payment_count,
+    }
+
+def _filter_fees(query, student_id, semester_id, course_id, institute_id):
+    if student_id:
+        query = query.where(StudentFee.student_id == student_id)
+    if semester_id:
+        query = query.where(StudentFee.semester_id == semester_id)
+    if course_id:
+        query = query.where(StudentFee.course_id == course_id)
+    if institute_id:
+        query = query.where(Course.institute_id == institute_id)
+    return query
+
+def _group_columns(group_by: str):
+    """Return the (key, label) columns used to group a finance report."""
+    if group_by == "institute":
+        return Institute.id, Institute.name
+    if group_by == "course":
+        return Course.id, Course.name
+    if group_by == "semester":
+        return Semester.id, Semester.name
+    raise ValueError(f"Unsupported group_by: {group_by}")
+
+def get_grouped_finance_report(
+    db: Session,
+    group_by: str,
+    student_id: Optional[int] = None,
+    semester_id: Optional[int] = None,
+    course_id: Optional[int] = None,
+    institute_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Compute fee, paid and pending totals per group in a single query.
+
+    For institute, course and semester groupings, payments are first summed
+    per student fee and then rolled up together with the fees themselves in
+    one GROUP BY over ``student_fees`` joined through ``Course.institute_id``.
+    Payment methods only exist on payments, so that grouping reports paid
+    totals and leaves fee and pending totals empty.
+    """
+    if group_by == "payment_method":
+        query = (
+            select(
+                Payment.payment_method.label("key"),
+                Payment.payment_method.label("label"),
+                func.coalesce(func.sum(Payment.amount), 0).label("total_paid"),
+                func.count(distinct(Payment.student_id)).label("student_count"),
+                func.count(Payment.id).label("payment_count"),
+            )
+            .join(StudentFee, Payment.student_fee_id == StudentFee.id)
+            .join(Course, StudentFee.course_id == Course.id)
+        )
+        query = _filter_fees(query, student_id, semester_id, course_id, institute_id)
+        if start_date:
+            query = query.where(Payment.payment_date >= start_date)
+        if end_date:
+            query = query.where(Payment.payment_date <= end_date)
+        query = query.group_by(Payment.payment_method).order_by(Payment.payment_method)
+        return [
+            {
+                "key": row.key,
+                "label": row.label,
+                "total_fees": None,
+                "total_paid": row.total_paid,
+                "total_pending": None,
+                "student_count": row.student_count,
+                "payment_count": row.payment_count,
+            }
+            for row in db.execute(query)
+        ]
+
+    key_column, label_column = _group_columns(group_by)
+
+    paid_per_fee = select(
+        Payment.student_fee_id.label("student_fee_id"),
+        func.sum(Payment.amount).label("paid"),
+        func.count(Payment.id).label("payment_count"),
+    )
+    if start_date:
+        paid_per_fee = paid_per_fee.where(Payment.payment_date >= start_date)
+    if end_date:
+        paid_per_fee = paid_per_fee.where(Payment.payment_date <= end_date)
+    paid_per_fee = paid_per_fee.group_by(Payment.student_fee_id).subquery("paid_per_fee")
+
+    query = (
+        select(
+            key_column.label("key"),
+            label_column.label("label"),
+            func.coalesce(func.sum(StudentFee.amount), 0).label("total_fees"),
+            func.coalesce(func.sum(paid_per_fee.c.paid), 0).label("total_paid"),
+            func.count(distinct(StudentFee.student_id)).label("student_count"),
+            func.coalesce(func.sum(paid_per_fee.c.payment_count), 0).label("payment_count"),
+        )
+        .select_from(StudentFee)
+        .join(Course, StudentFee.course_id == Course.id)
+        .join(Institute, Course.institute_id == Institute.id)
+        .join(Semester, StudentFee.semester_id == Semester.id)
+        .outerjoin(paid_per_fee, paid_per_fee.c.student_fee_id == StudentFee.id)
+    )
+    query = _filter_fees(query, student_id, semester_id, course_id, institute_id)
+    query = query.group_by(key_column, label_column).order_by(label_column, key_column)
+
+    return [
+        {
+            "key": row.key,
+            "label": row.label,
+            "total_fees": row.total_fees,
+            "total_paid": row.total_paid,
+            "total_pending": row.total_fees - row.total_paid,
+            "student_count": row.student_count,
+            "payment_count": row.payment_count,
+        }
+        for row in db.execute(query)
+    ]
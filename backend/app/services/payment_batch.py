@@ -0,0 +1,103 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.academic import Course
+from app.models.finance import Payment, Receipt, Semester, StudentFee
+from app.models.user import User
+from app.schemas.finance import PaymentCreate
+from app.services import fee_ledger
+from app.services.receipt_generator import format_receipt_number
+
+def post_payments(db: Session, items: Sequence[PaymentCreate]) -> Dict[str, Any]:
+    """
+    Record a batch of payments with their receipts in one transaction.
+
+    Students, student fees and transaction ids are checked with one IN query
+    each; items that fail are reported by index and the rest are recorded.
+    Payments and receipts are inserted with one flush each, every fee's ledger
+    is updated once for the batch total, and the caller commits. Returns the
+    per-item results and the ids of the new receipts.
+    """
+    student_ids = {item.student_id for item in items}
+    fee_ids = {item.student_fee_id for item in items}
+    transaction_ids = {item.transaction_id for item in items if item.transaction_id}
+
+    known_students = set(db.execute(select(User.id).where(User.id.in_(student_ids))).scalars())
+    # The fee's owner plus the course code and semester name for the receipt number
+    fees = {
+        fee_id: (student_id, course_code, semester_name)
+        for fee_id, student_id, course_code, semester_name in db.execute(
+            select(StudentFee.id, StudentFee.student_id, Course.code, Semester.name)
+            .join(Course, StudentFee.course_id == Course.id)
+            .join(Semester, StudentFee.semester_id == Semester.id)
+            .where(StudentFee.id.in_(fee_ids))
+        )
+    }
+    taken_transaction_ids = set()
+    if transaction_ids:
+        taken_transaction_ids = set(db.execute(
+            select(Payment.transaction_id).where(Payment.transaction_id.in_(transaction_ids))
+        ).scalars())
+
+    results: List[Dict[str, Any]] = []
+    accepted = []
+    for index, item in enumerate(items):
+        detail = None
+        if item.student_id not in known_students:
+            detail = "The student with this id does not exist"
+        elif item.student_fee_id not in fees:
+            detail = "The student fee with this id does not exist"
+        elif fees[item.student_fee_id][0] != item.student_id:
+            detail = "The student fee does not belong to this student"
+        elif item.transaction_id and item.transaction_id in taken_transaction_ids:
+            detail = "A payment with this transaction id already exists"
+        if detail:
+            results.append({"index": index, "status": "failed", "detail": detail})
+            continue
+        if item.transaction_id:
+            # Later items repeating a transaction id fail like an existing one
+            taken_transaction_ids.add(item.transaction_id)
+        result = {"index": index, "status": "created"}
+        results.append(result)
+        accepted.append((result, item))
+
+    if not accepted:
+        return {"results": results, "receipt_ids": []}
+
+    payments = [
+        Payment(
+            student_id=item.student_id,
+            student_fee_id=item.student_fee_id,
+            amount=item.amount,
+            payment_method=item.payment_method,
+            transaction_id=item.transaction_id,
+            notes=item.notes,
+        )
+        for _, item in accepted
+    ]
+    db.add_all(payments)
+    db.flush()
+
+    generated_at = datetime.now()
+    receipts = []
+    for payment in payments:
+        _, course_code, semester_name = fees[payment.student_fee_id]
+        receipts.append(Receipt(
+            payment_id=payment.id,
+            receipt_number=format_receipt_number(payment.id, course_code, semester_name, generated_at),
+        ))
+    db.add_all(receipts)
+    db.flush()
+
+    totals: Dict[int, float] = defaultdict(float)
+    for payment in payments:
+        totals[payment.student_fee_id] += payment.amount
+    fee_ledger.apply_payments(db, totals)
+
+    for (result, _), payment, receipt in zip(accepted, payments, receipts):
+        result.update(payment_id=payment.id, receipt_id=receipt.id, receipt_number=receipt.receipt_number)
+    return {"results": results, "receipt_ids": [receipt.id for receipt in receipts]}
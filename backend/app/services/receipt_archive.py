@@ -0,0 +1,121 @@
+import io
+import logging
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import TimeoutError
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.receipt_cache import receipt_cache
+from app.services.receipt_generator import receipt_fingerprint
+from app.services.render_pool import render_pool, RenderPoolSaturated
+
+logger = logging.getLogger(__name__)
+
+# How long to back off when the render pool is full and nothing of ours is pending
+SATURATED_BACKOFF_SECONDS = 0.05
+
+# Archive member listing the receipts that could not be rendered
+FAILED_RECEIPTS_NAME = "FAILED_RECEIPTS.txt"
+
+class _ZipSink(io.RawIOBase):
+    """
+    Write-only, non-seekable sink that collects zip output until drained.
+
+    zipfile falls back to streaming mode (data descriptors after each member)
+    when the underlying file cannot seek, so nothing is ever rewritten.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def stream_receipt_archive(
+    receipts: Iterable[Tuple[int, Dict[str, Any]]],
+    render_timeout: Optional[float] = None,
+    timeout: Optional[float] = None,
+) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of receipt PDFs chunk by chunk.
+
+    ``receipts`` yields ``(receipt_id, context)`` pairs. Cached PDFs are used
+    as-is; the rest are rendered in the receipt render pool with a small
+    look-ahead window, and each PDF is written to the archive and released as
+    soon as it is ready, in input order.
+
+    Each render may take ``render_timeout`` seconds and the whole archive
+    ``timeout`` seconds (RECEIPT_RENDER_TIMEOUT_SECONDS and
+    RECEIPT_ARCHIVE_TIMEOUT_SECONDS by default). Receipts that fail or run
+    out of time are left out and listed in FAILED_RECEIPTS.txt, since the
+    response has already started and can no longer report an error.
+    """
+    if render_timeout is None:
+        render_timeout = settings.RECEIPT_RENDER_TIMEOUT_SECONDS
+    if timeout is None:
+        timeout = settings.RECEIPT_ARCHIVE_TIMEOUT_SECONDS
+    deadline = time.monotonic() + timeout
+    sink = _ZipSink()
+    window = max(1, render_pool.max_workers)
+    pending = deque()
+    failed: List[str] = []
+    
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        def write_oldest() -> bytes:
+            receipt_id, fingerprint, name, result = pending.popleft()
+            if not isinstance(result, bytes):
+                try:
+                    pdf = result.result(timeout=max(0, min(render_timeout, deadline - time.monotonic())))
+                except TimeoutError:
+                    result.cancel()
+                    failed.append(f"{name}: rendering timed out")
+                    return b""
+                except Exception:
+                    logger.exception(f"Rendering receipt {receipt_id} for an archive failed")
+                    failed.append(f"{name}: rendering failed")
+                    return b""
+                receipt_cache.put(receipt_id, fingerprint, pdf)
+                result = pdf
+            archive.writestr(name, result)
+            return sink.drain()
+        
+        for receipt_id, context in receipts:
+            fingerprint = receipt_fingerprint(context)
+            name = f"{context['receipt_number']}.pdf"
+            result = receipt_cache.get(receipt_id, fingerprint)
+            while result is None and time.monotonic() < deadline:
+                try:
+                    result = render_pool.submit(context)
+                except RenderPoolSaturated:
+                    if pending:
+                        yield write_oldest()
+                    else:
+                        time.sleep(SATURATED_BACKOFF_SECONDS)
+            if result is None:
+                failed.append(f"{name}: archive timed out")
+                continue
+            pending.append((receipt_id, fingerprint, name, result))
+            
+            while len(pending) > window:
+                yield write_oldest()
+        
+        while pending:
+            yield write_oldest()
+        
+        if failed:
+            archive.writestr(FAILED_RECEIPTS_NAME, "\n".join(failed) + "\n")
+    
+    # Closing the archive writes the central directory
+    yield sink.drain()
@@ -0,0 +1,75 @@
+import glob
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+class ReceiptCache:
+    """
+    Two-tier cache of rendered receipt PDFs.
+
+    Entries are keyed by receipt id plus the fingerprint of the inputs the PDF
+    was rendered from, so a changed receipt is never served stale. The memory
+    tier is an LRU bounded by entry count; the disk tier keeps one file per
+    receipt and survives restarts.
+    """
+
+    def __init__(self, directory: str, max_entries: int):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, receipt_id: int, fingerprint: str) -> str:
+        return os.path.join(self.directory, f"receipt-{receipt_id}-{fingerprint}.pdf")
+
+    def get(self, receipt_id: int, fingerprint: str) -> Optional[bytes]:
+        key = f"{receipt_id}-{fingerprint}"
+        with self._lock:
+            pdf = self._entries.get(key)
+            if pdf is not None:
+                self._entries.move_to_end(key)
+                return pdf
+        
+        try:
+            with open(self._path(receipt_id, fingerprint), "rb") as f:
+                pdf = f.read()
+        except FileNotFoundError:
+            return None
+        self._remember(key, pdf)
+        return pdf
+
+    def put(self, receipt_id: int, fingerprint: str, pdf: bytes) -> None:
+        self._remember(f"{receipt_id}-{fingerprint}", pdf)
+        
+        # Write atomically so concurrent readers never see a partial file
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(receipt_id, fingerprint)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf)
+        os.replace(tmp_path, path)
+        
+        # Drop files rendered from older inputs of the same receipt
+        for stale in glob.glob(os.path.join(self.directory, f"receipt-{receipt_id}-*.pdf")):
+            if stale != path:
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+
+    def _remember(self, key: str, pdf: bytes) -> None:
+        with self._lock:
+            self._entries[key] = pdf
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+receipt_cache = ReceiptCache(settings.RECEIPT_CACHE_DIR, settings.RECEIPT_CACHE_MAX_ENTRIES)
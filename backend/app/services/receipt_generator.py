@@ -3,14 +3,111 @@ from reportlab.lib import colors
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
 from datetime import datetime
+import hashlib
 import io
+import json
+
+# Bump whenever the receipt layout changes so cached PDFs are re-rendered
+RECEIPT_LAYOUT_VERSION = 3
+
+def format_receipt_number(payment_id, course_code, semester_name, generated_at):
+    """
+    Receipt number: RCPT-{payment id}-{course code}-{semester name}-{timestamp}
+    """
+    semester_code = semester_name.replace(' ', '').upper()
+    return f"RCPT-{payment_id}-{course_code.upper()}-{semester_code}-{generated_at.strftime('%Y%m%d%H%M%S')}"
+
+def build_receipt_context(payment, student, student_fee, receipt_number):
+    """
+    Collect every value printed on a receipt as plain, JSON-serializable data
+    """
+    return {
+        "receipt_number": receipt_number,
+        "payment_date": payment.payment_date.strftime('%d-%m-%Y %H:%M:%S'),
+        "student_name": student.full_name,
+        "student_email": student.email,
+        "student_id": str(student.id),
+        "payment_id": str(payment.id),
+        "payment_method": payment.payment_method,
+        "transaction_id": payment.transaction_id or "N/A",
+        "semester_name": student_fee.semester.name,
+        "fee_description": student_fee.description or "Tuition Fee",
+        "amount_paid": f"${payment.amount:.2f}",
+    }
+
+def receipt_fingerprint(context):
+    """
+    Hash of the rendered inputs, used as the cache key suffix and ETag
+    """
+    payload = json.dumps({"layout": RECEIPT_LAYOUT_VERSION, **context}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def render_receipt_pdf(context):
+    """
+    Render a receipt from its context and return the PDF bytes.
+    
+    The fixed parts of the page are laid out once at import (see
+    _compile_receipt_layout), so each receipt only costs a handful of canvas
+    draw calls. The output matches the platypus layout of render_receipt_platypus.
+    
+    Rendering is invariant (no creation date or random document id), so the
+    same context always gives the same bytes and its fingerprint is a valid
+    strong ETag.
+    """
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter, invariant=1)
+    
+    pdf.setFillColor(colors.lightgrey)
+    for x, y, width, height in _RECEIPT_LAYOUT["label_backgrounds"]:
+        pdf.rect(x, y, width, height, stroke=0, fill=1)
+    
+    pdf.setStrokeColor(colors.grey)
+    pdf.setLineWidth(0.5)
+    pdf.lines(_RECEIPT_LAYOUT["grid_lines"])
+    
+    pdf.setFillColor(colors.black)
+    for font, size, x, y, text in _RECEIPT_LAYOUT["static_text"]:
+        pdf.setFont(font, size)
+        pdf.drawString(x, y, text)
+    for font, size, x, y, template in _RECEIPT_LAYOUT["fields"]:
+        pdf.setFont(font, size)
+        pdf.drawString(x, y, template.format_map(context))
+    
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+def render_receipt_platypus(context):
+    """
+    Render a receipt through the platypus flow layout.
+    
+    This is the reference layout the canvas renderer reproduces; it is kept
+    for comparison and benchmarking.
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, invariant=1)
+    doc.build(_receipt_elements(context))
+    return buffer.getvalue()
 
 def generate_receipt_pdf(payment, student, student_fee, receipt_number, output_path=None):
     """
     Generate a PDF receipt for a payment
     """
-    doc = SimpleDocTemplate(output_path, pagesize=letter)
+    context = build_receipt_context(payment, student, student_fee, receipt_number)
+    
+    # If output_path is provided, save to disk
+    if output_path:
+        doc = SimpleDocTemplate(output_path, pagesize=letter)
+        doc.build(_receipt_elements(context))
+        return output_path
+    
+    # Otherwise return the PDF as an in-memory buffer
+    return io.BytesIO(render_receipt_pdf(context))
+
+def _receipt_elements(context):
     styles = getSampleStyleSheet()
     
     # Create custom styles
@@ -38,16 +135,16 @@ def generate_receipt_pdf(payment, student, student_fee, receipt_number, output_p
     elements.append(Spacer(1, 0.2*inch))
     
     # Add receipt information
-    elements.append(Paragraph(f"Receipt Number: {receipt_number}", header_style))
-    elements.append(Paragraph(f"Date: {payment.payment_date.strftime('%d-%m-%Y %H:%M:%S')}", normal_style))
+    elements.append(Paragraph(f"Receipt Number: {context['receipt_number']}", header_style))
+    elements.append(Paragraph(f"Date: {context['payment_date']}", normal_style))
     elements.append(Spacer(1, 0.2*inch))
     
     # Add student information
     elements.append(Paragraph("Student Information", header_style))
     student_data = [
-        ["Name:", student.full_name],
-        ["Email:", student.email],
-        ["Student ID:", str(student.id)]
+        ["Name:", context["student_name"]],
+        ["Email:", context["student_email"]],
+        ["Student ID:", context["student_id"]]
     ]
     student_table = Table(student_data, colWidths=[2*inch, 4*inch])
     student_table.setStyle(TableStyle([
@@ -62,12 +159,12 @@ def generate_receipt_pdf(payment, student, student_fee, receipt_number, output_p
     # Add payment information
     elements.append(Paragraph("Payment Information", header_style))
     payment_data = [
-        ["Payment ID:", str(payment.id)],
-        ["Payment Method:", payment.payment_method],
-        ["Transaction ID:", payment.transaction_id or "N/A"],
-        ["Semester:", student_fee.semester.name],
-        ["Fee Description:", student_fee.description or "Tuition Fee"],
-        ["Amount Paid:", f"${payment.amount:.2f}"],
+        ["Payment ID:", context["payment_id"]],
+        ["Payment Method:", context["payment_method"]],
+        ["Transaction ID:", context["transaction_id"]],
+        ["Semester:", context["semester_name"]],
+        ["Fee Description:", context["fee_description"]],
+        ["Amount Paid:", context["amount_paid"]],
     ]
     payment_table = Table(payment_data, colWidths=[2*inch, 4*inch])
     payment_table.setStyle(TableStyle([
@@ -83,15 +180,68 @@ def generate_receipt_pdf(payment, student, student_fee, receipt_number, output_p
     elements.append(Paragraph("Thank you for your payment.", normal_style))
     elements.append(Paragraph("This is a computer-generated receipt and does not require a signature.", normal_style))
     
-    # If output_path is provided, save to disk
-    if output_path:
-        # Build the PDF to disk
-        doc.build(elements)
-        return output_path
-    else:
-        # Build the PDF to memory
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        doc.build(elements)
-        buffer.seek(0)
-        return buffer
+    return elements
+
+# Fixed receipt geometry, matching what SimpleDocTemplate lays out for
+# _receipt_elements on a letter page: 1 inch margins plus 6pt frame padding,
+# 6 inch wide two-column tables centred in the frame, 18pt rows.
+_PAGE_WIDTH, _PAGE_HEIGHT = letter
+_TEXT_LEFT = inch + 6
+_TABLE_LEFT = _PAGE_WIDTH / 2 - 3*inch
+_LABEL_WIDTH = 2*inch
+_TABLE_WIDTH = 6*inch
+_ROW_HEIGHT = 18
+_CELL_PADDING = 6
+_CELL_BASELINE = 13  # 10pt text vertically centred in an 18pt row
+
+_TITLE = "UNIVERSITY FEE RECEIPT"
+_STUDENT_ROWS = [
+    ("Name:", "student_name"),
+    ("Email:", "student_email"),
+    ("Student ID:", "student_id"),
+]
+_PAYMENT_ROWS = [
+    ("Payment ID:", "payment_id"),
+    ("Payment Method:", "payment_method"),
+    ("Transaction ID:", "transaction_id"),
+    ("Semester:", "semester_name"),
+    ("Fee Description:", "fee_description"),
+    ("Amount Paid:", "amount_paid"),
+]
+
+def _compile_receipt_layout():
+    static_text = [
+        ("Helvetica-Bold", 18, (_PAGE_WIDTH - stringWidth(_TITLE, "Helvetica-Bold", 18)) / 2, 696, _TITLE),
+        ("Helvetica-Bold", 14, _TEXT_LEFT, 559.2, "Student Information"),
+        ("Helvetica-Bold", 14, _TEXT_LEFT, 446.4, "Payment Information"),
+        ("Helvetica", 10, _TEXT_LEFT, 274, "Thank you for your payment."),
+        ("Helvetica", 10, _TEXT_LEFT, 262, "This is a computer-generated receipt and does not require a signature."),
+    ]
+    fields = [
+        ("Helvetica-Bold", 14, _TEXT_LEFT, 630, "Receipt Number: {receipt_number}"),
+        ("Helvetica", 10, _TEXT_LEFT, 601.6, "Date: {payment_date}"),
+    ]
+    label_backgrounds = []
+    grid_lines = []
+    
+    for top, rows in ((540.8, _STUDENT_ROWS), (428, _PAYMENT_ROWS)):
+        bottom = top - len(rows) * _ROW_HEIGHT
+        label_backgrounds.append((_TABLE_LEFT, bottom, _LABEL_WIDTH, top - bottom))
+        for i, (label, key) in enumerate(rows):
+            baseline = top - i * _ROW_HEIGHT - _CELL_BASELINE
+            static_text.append(("Helvetica", 10, _TABLE_LEFT + _CELL_PADDING, baseline, label))
+            fields.append(("Helvetica", 10, _TABLE_LEFT + _LABEL_WIDTH + _CELL_PADDING, baseline, "{%s}" % key))
+        for i in range(len(rows) + 1):
+            y = top - i * _ROW_HEIGHT
+            grid_lines.append((_TABLE_LEFT, y, _TABLE_LEFT + _TABLE_WIDTH, y))
+        for x in (_TABLE_LEFT, _TABLE_LEFT + _LABEL_WIDTH, _TABLE_LEFT + _TABLE_WIDTH):
+            grid_lines.append((x, bottom, x, top))
+    
+    return {
+        "static_text": static_text,
+        "fields": fields,
+        "label_backgrounds": label_backgrounds,
+        "grid_lines": grid_lines,
+    }
+
+_RECEIPT_LAYOUT = _compile_receipt_layout()
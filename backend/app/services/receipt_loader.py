@@ -0,0 +1,107 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import desc, func, select
+from sqlalchemy.orm import Query, Session, contains_eager
+
+from app.core.principals import Principal
+from app.models.academic import Course
+from app.models.finance import Receipt, Payment, StudentFee, Semester
+from app.services.receipt_generator import build_receipt_context
+
+def receipt_query(db: Session) -> Query:
+    """
+    Receipts joined with their payment, student, student fee and semester.
+
+    Everything printed on a receipt is loaded by the same SELECT, so building
+    the receipt context never triggers a lazy load.
+    """
+    return (
+        db.query(Receipt)
+        .join(Receipt.payment)
+        .join(Payment.student)
+        .join(Payment.student_fee)
+        .join(StudentFee.semester)
+        .options(
+            contains_eager(Receipt.payment).contains_eager(Payment.student),
+            contains_eager(Receipt.payment).contains_eager(Payment.student_fee).contains_eager(StudentFee.semester),
+        )
+    )
+
+def receipt_context(receipt: Receipt) -> Dict[str, Any]:
+    """Build the receipt context of a receipt loaded through receipt_query."""
+    payment = receipt.payment
+    return build_receipt_context(
+        payment, payment.student, payment.student_fee, receipt.receipt_number
+    )
+
+def load_receipt_context(db: Session, receipt_id: int, current_user: Principal) -> Dict[str, Any]:
+    """
+    Load everything printed on a receipt, checking the caller may see it.
+    """
+    receipt = receipt_query(db).filter(Receipt.id == receipt_id).first()
+    if not receipt:
+        raise HTTPException(
+            status_code=404,
+            detail="Receipt not found",
+        )
+    
+    if not (current_user.is_staff or receipt.payment.student_id == current_user.id):
+        raise HTTPException(
+            status_code=403,
+            detail="Not enough permissions to access this receipt",
+        )
+    return receipt_context(receipt)
+
+def list_receipts(
+    db: Session,
+    student_id: Optional[int] = None,
+    semester_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Return the total number of matching receipts and one page of receipt rows.
+
+    The page and the total come from one SELECT over receipts joined to their
+    payment, semester and course, with the total computed as a window count.
+    """
+    query = (
+        select(
+            Receipt.id,
+            Receipt.receipt_number,
+            Receipt.generated_at,
+            Receipt.status,
+            Payment.id.label("payment_id"),
+            Payment.payment_date,
+            Payment.amount,
+            Payment.payment_method,
+            Payment.student_id,
+            Semester.id.label("semester_id"),
+            Semester.name.label("semester_name"),
+            Course.id.label("course_id"),
+            Course.name.label("course_name"),
+            func.count().over().label("total"),
+        )
+        .join(Payment, Payment.id == Receipt.payment_id)
+        .join(StudentFee, StudentFee.id == Payment.student_fee_id)
+        .join(Semester, Semester.id == StudentFee.semester_id)
+        .join(Course, Course.id == StudentFee.course_id)
+    )
+    if student_id:
+        query = query.where(Payment.student_id == student_id)
+    if semester_id:
+        query = query.where(StudentFee.semester_id == semester_id)
+    query = query.order_by(desc(Payment.payment_date), desc(Payment.id)).offset(skip).limit(limit)
+    
+    rows = db.execute(query).mappings().all()
+    if rows:
+        total = rows[0]["total"]
+    elif skip:
+        # Past the last page the window count is unavailable, count separately
+        total = db.execute(
+            select(func.count()).select_from(query.limit(None).offset(None).subquery())
+        ).scalar_one()
+    else:
+        total = 0
+    return total, [{key: row[key] for key in row.keys() if key != "total"} for row in rows]
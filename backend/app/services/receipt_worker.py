@@ -0,0 +1,168 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.finance import (
+    Receipt, RECEIPT_STATUS_PENDING, RECEIPT_STATUS_RENDERING, RECEIPT_STATUS_READY, RECEIPT_STATUS_FAILED,
+)
+from app.services.receipt_cache import receipt_cache
+from app.services.receipt_generator import receipt_fingerprint
+from app.services.receipt_loader import receipt_query, receipt_context
+from app.services.render_pool import render_pool, RenderPoolSaturated
+
+logger = logging.getLogger(__name__)
+
+class ReceiptPrerenderer:
+    """
+    Background worker that renders receipt PDFs right after their payment
+    commits, so the first download is served from the receipt cache.
+
+    Jobs run on a small thread pool that hands the actual rendering to the
+    receipt render pool. Failed renders are retried with exponential backoff;
+    a full render pool is waited out without using up an attempt. Progress is
+    recorded in ``Receipt.status``, and receipts left unfinished by a previous
+    process are claimed and picked up again by ``resume``.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_attempts: int,
+        retry_delay: float,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.session_factory = session_factory
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._stopped.clear()
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="receipt-prerender",
+                )
+            return self._executor
+
+    def enqueue(self, receipt_ids: Iterable[int]) -> None:
+        """
+        Schedule receipts for rendering. Call after the receipts are committed.
+        """
+        if self.max_workers <= 0:
+            return
+        executor = self._get_executor()
+        for receipt_id in receipt_ids:
+            executor.submit(self._run, receipt_id)
+
+    def resume(self, db: Session) -> List[int]:
+        """
+        Claim and enqueue up to RECEIPT_PRERENDER_RESUME_LIMIT receipts that
+        are pending, or whose rendering claim went stale, e.g. after a restart.
+
+        Rows are claimed with one UPDATE ... RETURNING (skipping rows locked by
+        another process on PostgreSQL), so each receipt is resumed by a single
+        process. Returns the claimed ids.
+        """
+        if self.max_workers <= 0:
+            return []
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=settings.RECEIPT_PRERENDER_STALE_SECONDS)
+        unfinished = or_(
+            Receipt.status == RECEIPT_STATUS_PENDING,
+            and_(
+                Receipt.status == RECEIPT_STATUS_RENDERING,
+                or_(Receipt.claimed_at.is_(None), Receipt.claimed_at < stale_before),
+            ),
+        )
+        candidates = (
+            select(Receipt.id)
+            .where(unfinished)
+            .order_by(Receipt.id)
+            .limit(settings.RECEIPT_PRERENDER_RESUME_LIMIT)
+            .with_for_update(skip_locked=True)
+        )
+        claimed = sorted(db.execute(
+            update(Receipt)
+            .where(Receipt.id.in_(candidates), unfinished)
+            .values(status=RECEIPT_STATUS_RENDERING, claimed_at=func.now())
+            .returning(Receipt.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all())
+        db.commit()
+        self.enqueue(claimed)
+        return claimed
+
+    def _run(self, receipt_id: int) -> None:
+        attempt = 1
+        while not self._stopped.is_set():
+            try:
+                self._render(receipt_id, attempt)
+                return
+            except RenderPoolSaturated:
+                # Busy with other renders, not a problem with this receipt
+                self._stopped.wait(self.retry_delay)
+                continue
+            except Exception:
+                logger.exception(f"Rendering receipt {receipt_id} failed (attempt {attempt})")
+            if attempt >= self.max_attempts:
+                self._set_status(receipt_id, RECEIPT_STATUS_FAILED)
+                return
+            self._stopped.wait(self.retry_delay * 2 ** (attempt - 1))
+            attempt += 1
+
+    def _render(self, receipt_id: int, attempt: int) -> None:
+        db = self.session_factory()
+        try:
+            receipt = receipt_query(db).filter(Receipt.id == receipt_id).first()
+            if receipt is None:
+                return
+            context = receipt_context(receipt)
+            receipt.status = RECEIPT_STATUS_RENDERING
+            receipt.claimed_at = func.now()
+            receipt.render_attempts = attempt
+            db.commit()
+            
+            fingerprint = receipt_fingerprint(context)
+            if receipt_cache.get(receipt_id, fingerprint) is None:
+                receipt_cache.put(receipt_id, fingerprint, render_pool.render(context))
+            
+            receipt.status = RECEIPT_STATUS_READY
+            receipt.rendered_at = func.now()
+            db.commit()
+        finally:
+            db.close()
+
+    def _set_status(self, receipt_id: int, status: str) -> None:
+        db = self.session_factory()
+        try:
+            db.query(Receipt).filter(Receipt.id == receipt_id).update(
+                {Receipt.status: status}, synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+receipt_prerenderer = ReceiptPrerenderer(
+    settings.RECEIPT_PRERENDER_WORKERS,
+    settings.RECEIPT_PRERENDER_MAX_ATTEMPTS,
+    settings.RECEIPT_PRERENDER_RETRY_DELAY_SECONDS,
+)
@@ -0,0 +1,162 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.services.receipt_generator import render_receipt_pdf
+
+class RenderPoolSaturated(Exception):
+    """Raised when every worker is busy and the render queue is full."""
+
+def _timed_render(context: Dict[str, Any]) -> Tuple[bytes, float]:
+    # Runs in the worker process; timing it there excludes queueing time
+    started = time.perf_counter()
+    pdf = render_receipt_pdf(context)
+    return pdf, time.perf_counter() - started
+
+class ReceiptRenderPool:
+    """
+    Renders receipt PDFs in a process pool so the CPU-bound ReportLab work
+    neither holds the GIL nor ties up request threads.
+
+    At most ``max_workers + max_queue`` renders are admitted at once; further
+    submissions raise RenderPoolSaturated so callers can shed load instead of
+    queueing without bound.
+
+    If a worker process dies the executor is broken for good, so it is
+    replaced with a fresh one and the renders it took down are resubmitted
+    once.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(max(1, max_workers) + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rendered = 0
+        self._failed = 0
+        self._rejected = 0
+        self._restarts = 0
+        self._render_seconds = 0.0
+        self._max_render_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn avoids forking a process that is already running threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _replace_broken(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken executor; the next submission starts a new one."""
+        with self._lock:
+            if self._executor is not executor:
+                # Another thread already replaced it
+                return
+            self._executor = None
+            self._restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit_to_executor(self, result: "Future[bytes]", context: Dict[str, Any], retry: bool) -> None:
+        executor = self._get_executor()
+        try:
+            task = executor.submit(_timed_render, context)
+        except BrokenProcessPool as e:
+            self._replace_broken(executor)
+            if retry:
+                self._submit_to_executor(result, context, retry=False)
+            else:
+                self._finish(result, None, e)
+            return
+        except Exception as e:
+            self._finish(result, None, e)
+            return
+        
+        def on_done(task):
+            error = CancelledError() if task.cancelled() else task.exception()
+            if isinstance(error, BrokenProcessPool):
+                self._replace_broken(executor)
+                if retry:
+                    self._submit_to_executor(result, context, retry=False)
+                    return
+            self._finish(result, None if error else task.result(), error)
+        
+        task.add_done_callback(on_done)
+
+    def submit(self, context: Dict[str, Any]) -> "Future[bytes]":
+        """
+        Queue a receipt for rendering and return a future of its PDF bytes.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise RenderPoolSaturated()
+        with self._lock:
+            self._in_flight += 1
+        
+        result: "Future[bytes]" = Future()
+        if self.max_workers <= 0:
+            try:
+                self._finish(result, _timed_render(context), None)
+            except Exception as e:
+                self._finish(result, None, e)
+            return result
+        
+        self._submit_to_executor(result, context, retry=True)
+        return result
+
+    def render(self, context: Dict[str, Any]) -> bytes:
+        """
+        Render a receipt and wait for the result. Raises RenderPoolSaturated when full.
+        """
+        return self.submit(context).result(timeout=settings.RECEIPT_RENDER_TIMEOUT_SECONDS)
+
+    def _finish(self, result: "Future[bytes]", outcome, error) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if error is None:
+                pdf, seconds = outcome
+                self._rendered += 1
+                self._render_seconds += seconds
+                self._max_render_seconds = max(self._max_render_seconds, seconds)
+            else:
+                self._failed += 1
+        self._slots.release()
+        if result.done():
+            # The caller gave up waiting and cancelled its future
+            return
+        if error is None:
+            result.set_result(pdf)
+        else:
+            result.set_exception(error)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queue_capacity": self.max_queue,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - max(1, self.max_workers)),
+                "rendered": self._rendered,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "restarts": self._restarts,
+                "avg_render_ms": (self._render_seconds / self._rendered * 1000) if self._rendered else 0.0,
+                "max_render_ms": self._max_render_seconds * 1000,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+render_pool = ReceiptRenderPool(settings.RECEIPT_RENDER_WORKERS, settings.RECEIPT_RENDER_QUEUE_SIZE)
@@ -0,0 +1,210 @@
+import csv
+import json
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Deque, Dict, IO, Iterator, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.password_pool import PasswordHashPool, PasswordPoolSaturated
+from app.core.role_registry import role_registry
+from app.core.security import get_password_hash
+from app.models.associations import user_role
+from app.models.user import User
+from app.schemas.user import UserCreate
+
+# A parsed row: (row number in the file, fields or None, parse error or None)
+ParsedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+# Pause before resubmitting when the password pool is full and none of our hashes are queued
+SATURATED_RETRY_DELAY_SECONDS = 0.1
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """Guess the upload format from its file name or content type."""
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+def _split_roles(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [name for name in value.replace(";", ",").replace(" ", ",").split(",") if name]
+    return [str(name) for name in value]
+
+def parse_rows(stream: IO[bytes], fmt: str) -> Iterator[ParsedRow]:
+    """
+    Parse an upload row by row without reading it into memory.
+
+    CSV files need a header with at least ``email`` and ``password``; roles
+    are separated by semicolons, commas or spaces. NDJSON files hold one
+    JSON object per line with the UserCreate fields.
+    """
+    # Decode line by line; SpooledTemporaryFile only supports TextIOWrapper from Python 3.11
+    text = (line.decode("utf-8-sig") for line in stream)
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            fields: Dict[str, Any] = {key.strip(): (value or "").strip() for key, value in row.items() if key}
+            fields["roles"] = _split_roles(fields.get("roles"))
+            # An empty cell means no password, which validation reports
+            if fields.get("password") == "":
+                fields.pop("password")
+            if fields.get("is_active") == "":
+                fields.pop("is_active")
+            if fields.get("full_name") == "":
+                fields["full_name"] = None
+            yield reader.line_num, fields, None
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            fields = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(fields, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        fields["roles"] = _split_roles(fields.get("roles"))
+        if fields.get("password") == "":
+            fields.pop("password")
+        yield line_number, fields, None
+
+class UserImporter:
+    """
+    Imports users in batches: validation, one duplicate check per batch,
+    password hashing on the shared password pool, and multi-row inserts of
+    users and their ``user_roles`` rows. Each batch commits on its own and
+    bad rows are reported without aborting the rest.
+    """
+
+    def __init__(self, db: Session, pool: PasswordHashPool, batch_size: int, hashes_in_flight: int):
+        self.db = db
+        self.pool = pool
+        self.batch_size = batch_size
+        self.hashes_in_flight = max(1, hashes_in_flight)
+        self.created = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._seen_emails: Set[str] = set()
+
+    def _error(self, row: int, email: Optional[str], detail: str) -> None:
+        self.errors.append({"row": row, "email": email, "detail": detail})
+
+    @property
+    def processed(self) -> int:
+        """Rows imported or rejected so far."""
+        return self.created + len(self.errors)
+
+    def _hash_passwords(self, passwords: List[str]) -> List[str]:
+        """
+        Hash on the password pool with at most ``hashes_in_flight`` of ours
+        admitted at once, so sign-ins still find room in its queue. When the
+        pool is full, wait for our oldest hash before submitting again.
+        """
+        hashes: List[str] = []
+        in_flight: Deque[Future] = deque()
+        for password in passwords:
+            while len(in_flight) >= self.hashes_in_flight:
+                hashes.append(in_flight.popleft().result())
+            while True:
+                try:
+                    in_flight.append(self.pool.submit(get_password_hash, password))
+                    break
+                except PasswordPoolSaturated:
+                    if in_flight:
+                        hashes.append(in_flight.popleft().result())
+                    else:
+                        time.sleep(SATURATED_RETRY_DELAY_SECONDS)
+        hashes.extend(task.result() for task in in_flight)
+        return hashes
+
+    def import_rows(self, rows: Iterator[ParsedRow]) -> None:
+        batch: List[Tuple[int, UserCreate]] = []
+        for row_number, fields, error in rows:
+            if error:
+                self._error(row_number, None, error)
+                continue
+            try:
+                user_in = UserCreate(**fields)
+            except ValidationError as e:
+                self._error(row_number, fields.get("email"), "; ".join(
+                    f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+                ))
+                continue
+            email = user_in.email.lower()
+            if email in self._seen_emails:
+                self._error(row_number, user_in.email, "Duplicate email in upload")
+                continue
+            self._seen_emails.add(email)
+            batch.append((row_number, user_in))
+            if len(batch) >= self.batch_size:
+                self._import_batch(batch)
+                batch = []
+        if batch:
+            self._import_batch(batch)
+
+    def _import_batch(self, batch: List[Tuple[int, UserCreate]]) -> None:
+        existing = set(self.db.execute(
+            select(User.email).where(User.email.in_([user_in.email for _, user_in in batch]))
+        ).scalars())
+        pending = []
+        for row_number, user_in in batch:
+            if user_in.email in existing:
+                self._error(row_number, user_in.email, "The user with this email already exists in the system")
+            else:
+                pending.append((row_number, user_in))
+        if not pending:
+            return
+
+        role_ids = role_registry.resolve(self.db, {name for _, user_in in pending for name in user_in.roles})
+        hashes = self._hash_passwords([user_in.password for _, user_in in pending])
+        user_rows = [
+            {
+                "email": user_in.email,
+                "hashed_password": hashed_password,
+                "full_name": user_in.full_name,
+                "is_active": user_in.is_active,
+            }
+            for (_, user_in), hashed_password in zip(pending, hashes)
+        ]
+
+        try:
+            self._insert(pending, user_rows, role_ids)
+            self.db.commit()
+        except IntegrityError:
+            # A concurrent writer took some of these emails; retry row by row
+            self.db.rollback()
+            for item, user_row in zip(pending, user_rows):
+                try:
+                    with self.db.begin_nested():
+                        self._insert([item], [user_row], role_ids)
+                except IntegrityError:
+                    self._error(item[0], item[1].email, "The user with this email already exists in the system")
+            self.db.commit()
+
+    def _insert(
+        self, pending: List[Tuple[int, UserCreate]], user_rows: List[Dict[str, Any]], role_ids: Dict[str, int]
+    ) -> None:
+        """Insert users with one multi-row INSERT ... RETURNING, then their role links."""
+        inserted = self.db.execute(
+            insert(User).returning(User.id, User.email), user_rows
+        ).all()
+        ids_by_email = {email: user_id for user_id, email in inserted}
+        links = [
+            {"user_id": ids_by_email[user_in.email], "role_id": role_ids[name]}
+            for _, user_in in pending
+            for name in set(user_in.roles)
+        ]
+        if links:
+            self.db.execute(insert(user_role), links)
+        self.created += len(inserted)
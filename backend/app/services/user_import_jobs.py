@@ -0,0 +1,142 @@
+import logging
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, IO, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.password_pool import password_pool
+from app.db.session import SessionLocal
+from app.services.user_import import UserImporter, parse_rows
+
+logger = logging.getLogger(__name__)
+
+IMPORT_STATUS_PENDING = "pending"
+IMPORT_STATUS_RUNNING = "running"
+IMPORT_STATUS_DONE = "done"
+IMPORT_STATUS_FAILED = "failed"
+
+class UserImportJob:
+    """One upload being imported; progress is read from its importer."""
+
+    def __init__(self, fmt: str):
+        self.id = uuid.uuid4().hex
+        self.fmt = fmt
+        self.status = IMPORT_STATUS_PENDING
+        self.detail: Optional[str] = None
+        self.importer: Optional[UserImporter] = None
+        self.finished_at: Optional[float] = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        importer = self.importer
+        errors = list(importer.errors) if importer else []
+        return {
+            "id": self.id,
+            "status": self.status,
+            "detail": self.detail,
+            "processed": importer.processed if importer else 0,
+            "created": importer.created if importer else 0,
+            "failed": len(errors),
+            "errors": errors,
+        }
+
+class UserImportJobs:
+    """
+    Runs bulk user imports in the background so the upload request returns
+    at once. Uploads are copied to a temporary file and imported on a small
+    thread pool; passwords are hashed on the shared password pool. Jobs live
+    in this process only and are forgotten ``retention`` seconds after they
+    finish.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        retention: float,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.max_workers = max_workers
+        self.retention = retention
+        self.session_factory = session_factory
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: Dict[str, UserImportJob] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, self.max_workers),
+                    thread_name_prefix="user-import",
+                )
+            return self._executor
+
+    def submit(self, upload: IO[bytes], fmt: str) -> UserImportJob:
+        """
+        Copy the upload aside and schedule its import. Returns the new job.
+        """
+        stream = tempfile.TemporaryFile()
+        try:
+            shutil.copyfileobj(upload, stream)
+            stream.seek(0)
+        except Exception:
+            stream.close()
+            raise
+        job = UserImportJob(fmt)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        try:
+            self._get_executor().submit(self._run, job, stream)
+        except Exception:
+            stream.close()
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            raise
+        return job
+
+    def get(self, job_id: str) -> Optional[UserImportJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.retention
+        for job_id in [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]:
+            del self._jobs[job_id]
+
+    def _run(self, job: UserImportJob, stream: IO[bytes]) -> None:
+        db = self.session_factory()
+        try:
+            job.importer = UserImporter(
+                db, password_pool, settings.USER_IMPORT_BATCH_SIZE, settings.USER_IMPORT_HASHES_IN_FLIGHT
+            )
+            job.status = IMPORT_STATUS_RUNNING
+            job.importer.import_rows(parse_rows(stream, job.fmt))
+            job.status = IMPORT_STATUS_DONE
+        except Exception:
+            logger.exception(f"User import {job.id} failed")
+            job.status = IMPORT_STATUS_FAILED
+            job.detail = "The import stopped unexpectedly; rows reported so far were handled"
+        finally:
+            db.close()
+            stream.close()
+            job.finished_at = time.monotonic()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+user_import_jobs = UserImportJobs(
+    settings.USER_IMPORT_JOB_WORKERS,
+    settings.USER_IMPORT_JOB_RETENTION_SECONDS,
+)
@@ -0,0 +1,86 @@
+from typing import List, Optional
+
+from sqlalchemy import and_, case, exists, func, not_, or_, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.academic import Course
+from app.models.associations import user_role
+from app.models.user import User
+
+# Shorter terms only match prefixes: trigram indexes cannot serve them
+MIN_SUBSTRING_LENGTH = 3
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _starts_with(column, term: str, dialect: str):
+    """
+    Case-insensitive prefix match that the lower() expression indexes can serve.
+
+    PostgreSQL uses LIKE on a text_pattern_ops index; SQLite only uses an
+    expression index for range comparisons, so other databases get a range.
+    """
+    if dialect == "postgresql":
+        return column.like(_escape_like(term) + "%", escape="\\")
+    return and_(column >= term, column < term + "\U0010ffff")
+
+def _contains(column, term: str):
+    return column.like("%" + _escape_like(term) + "%", escape="\\")
+
+def search_users(db: Session, term: str, role_id: Optional[int] = None, limit: int = 20) -> List[User]:
+    """
+    Find users whose email or full name starts with or contains ``term``.
+
+    Results are ranked in tiers: email prefix (an exact email sorts first),
+    then name prefix, then substring matches with a word in the name starting
+    with the term first; on PostgreSQL trigram similarity orders the rest.
+    Each tier is its own query and later tiers only run while the page is
+    not full, so common prefixes are answered from an index range without
+    ranking every match.
+    """
+    dialect = db.get_bind().dialect.name
+    term = term.strip().lower()
+    email = func.lower(User.email)
+    full_name = func.lower(User.full_name)
+    email_prefix = _starts_with(email, term, dialect)
+    name_prefix = _starts_with(full_name, term, dialect)
+
+    tiers = [
+        (email_prefix, [email, User.id]),
+        (and_(name_prefix, not_(email_prefix)), [full_name, User.id]),
+    ]
+    if len(term) >= MIN_SUBSTRING_LENGTH:
+        order_by = [case((full_name.like("% " + _escape_like(term) + "%", escape="\\"), 0), else_=1)]
+        if dialect == "postgresql":
+            order_by.append(func.greatest(
+                func.similarity(email, term), func.coalesce(func.similarity(full_name, term), 0)
+            ).desc())
+        order_by.extend([email, User.id])
+        tiers.append((
+            and_(
+                or_(_contains(email, term), _contains(full_name, term)),
+                not_(email_prefix),
+                or_(User.full_name.is_(None), not_(name_prefix)),
+            ),
+            order_by,
+        ))
+
+    user_ids: List[int] = []
+    for condition, order_by in tiers:
+        query = select(User.id).where(condition)
+        if role_id is not None:
+            query = query.where(exists().where(and_(user_role.c.user_id == User.id, user_role.c.role_id == role_id)))
+        user_ids.extend(db.execute(query.order_by(*order_by).limit(limit - len(user_ids))).scalars())
+        if len(user_ids) >= limit:
+            break
+    if not user_ids:
+        return []
+
+    users = db.execute(
+        select(User).where(User.id.in_(user_ids)).options(
+            selectinload(User.roles),
+            selectinload(User.courses).joinedload(Course.institute),
+        )
+    ).scalars()
+    by_id = {user.id: user for user in users}
+    return [by_id[user_id] for user_id in user_ids]
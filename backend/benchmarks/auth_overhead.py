@@ -0,0 +1,64 @@
+"""Microbenchmark of the per-request cost of the get_current_user dependency.
+
+Compares tokens without a role set on a warm principal cache: no caches at
+all (signature check plus user lookup), the principal cache only, and the
+principal cache plus the verified-token cache; and tokens carrying their
+role set, which only need the token cache and the revocation check. Usage
+(from the backend directory):
+
+    python -m benchmarks.auth_overhead --iterations 20000
+"""
+
+import argparse
+import time
+
+from app.core.dependencies import get_current_user
+from app.core.principals import principal_cache
+from app.core.security import create_access_token, verified_token_cache
+from app.models.user import User, Role
+from benchmarks.common import add_database_argument, make_engine, make_session
+
+def per_call_us(func, iterations: int) -> float:
+    func()  # warm up caches
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url, args.reset)
+    db = make_session(engine)
+    user = User(email="bench.auth@university.edu", hashed_password="x", full_name="Bench Auth", is_active=True)
+    user.roles.append(Role(name="student", description="student role"))
+    db.add(user)
+    db.commit()
+    legacy_token = create_access_token(user.id, "student")
+    claims_token = create_access_token(user.id, "student", roles=["student"])
+
+    principal_entries, token_entries = principal_cache.max_entries, verified_token_cache.max_entries
+    configurations = (
+        ("no caches", legacy_token, 0, 0),
+        ("principal cache", legacy_token, principal_entries, 0),
+        ("principal + token cache", legacy_token, principal_entries, token_entries),
+        ("role claims + token cache", claims_token, 0, token_entries),
+    )
+    for name, token, principal_size, token_size in configurations:
+        principal_cache.max_entries = principal_size
+        verified_token_cache.max_entries = token_size
+        principal_cache.clear()
+        verified_token_cache.clear()
+        uses_database = token is legacy_token and not principal_size
+        iterations = max(1, args.iterations // 20) if uses_database else args.iterations
+        authenticate = lambda: get_current_user(db=db, token=token)
+        print(f"{name:<26} {per_call_us(authenticate, iterations):>10.1f} us/request")
+
+    db.close()
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
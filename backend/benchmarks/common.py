@@ -0,0 +1,250 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throwaway database (a temporary SQLite file unless
+``--database-url`` is given) that is created from the application models
+and seeded with synthetic rows using bulk Core inserts. A ``--database-url``
+that already has tables is only dropped and recreated when ``--reset`` is
+passed as well.
+"""
+
+import atexit
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import create_engine, insert, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.session import Base
+from app.models import user, academic, finance  # noqa: F401 - register models
+from app.models.user import User
+from app.models.academic import Institute, Course
+from app.models.associations import student_course
+from app.models.finance import Semester, StudentFee, Payment
+
+BATCH_SIZE = 10_000
+PAYMENT_METHODS = ["Cash", "Credit Card", "Bank Transfer", "Cheque"]
+
+def add_database_argument(parser) -> None:
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help=(
+            "Database to benchmark against (defaults to a temporary SQLite file). "
+            "It must be empty unless --reset is given"
+        ),
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Drop and recreate the application tables in --database-url, DELETING ALL THEIR DATA",
+    )
+
+def make_engine(database_url: Optional[str] = None, reset: bool = False) -> Engine:
+    """
+    Create the benchmark schema and return its engine.
+
+    Without ``database_url`` a temporary SQLite file is used. A given database
+    that already has tables is refused unless ``reset`` is set, so a
+    benchmark never wipes a real database by accident.
+    """
+    if database_url is None:
+        fd, path = tempfile.mkstemp(prefix="university-bench-", suffix=".db")
+        os.close(fd)
+        atexit.register(os.remove, path)
+        database_url = f"sqlite:///{path}"
+    elif not reset:
+        engine = create_engine(database_url)
+        tables = inspect(engine).get_table_names()
+        engine.dispose()
+        if tables:
+            raise SystemExit(
+                f"{engine.url.render_as_string(hide_password=True)} already has tables; "
+                "pass --reset to drop and recreate them"
+            )
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+def make_session(engine: Engine) -> Session:
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+def _insert_batches(conn, table, rows: Iterator[Dict]) -> None:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.execute(insert(table), batch)
+            batch = []
+    if batch:
+        conn.execute(insert(table), batch)
+
+def seed_finance(
+    engine: Engine,
+    payments: int,
+    students: Optional[int] = None,
+    institutes: int = 4,
+    courses_per_institute: int = 3,
+    semesters_per_course: int = 4,
+    seed: int = 42,
+) -> Dict[str, int]:
+    """
+    Seed users, academic structure, student fees and payments.
+
+    Roughly two payments are generated per student fee and one fee per
+    student per semester of the course they are enrolled in.
+    """
+    rng = random.Random(seed)
+    if students is None:
+        students = max(10, payments // (2 * semesters_per_course))
+    course_count = institutes * courses_per_institute
+    semester_count = course_count * semesters_per_course
+    start = datetime(2024, 1, 1)
+
+    with engine.begin() as conn:
+        _insert_batches(conn, Institute.__table__, (
+            {"id": i, "name": f"Institute {i}", "code": f"INS{i}"}
+            for i in range(1, institutes + 1)
+        ))
+        _insert_batches(conn, Course.__table__, (
+            {
+                "id": c,
+                "institute_id": (c - 1) // courses_per_institute + 1,
+                "name": f"Course {c}",
+                "code": f"C{c}",
+                "duration_years": 2,
+                "is_active": True,
+            }
+            for c in range(1, course_count + 1)
+        ))
+        _insert_batches(conn, Semester.__table__, (
+            {
+                "id": s,
+                "course_id": (s - 1) // semesters_per_course + 1,
+                "name": f"Semester {s}",
+                "type": "semester",
+                "order_in_course": (s - 1) % semesters_per_course + 1,
+                "start_date": start,
+                "end_date": start + timedelta(days=120),
+            }
+            for s in range(1, semester_count + 1)
+        ))
+        _insert_batches(conn, User.__table__, (
+            {
+                "id": u,
+                "email": f"student{u}@bench.university.edu",
+                "hashed_password": "x",
+                "full_name": f"Student {u}",
+                "is_active": True,
+            }
+            for u in range(1, students + 1)
+        ))
+        _insert_batches(conn, student_course, (
+            {"student_id": u, "course_id": (u - 1) % course_count + 1}
+            for u in range(1, students + 1)
+        ))
+
+        fees = []
+        for u in range(1, students + 1):
+            course_id = (u - 1) % course_count + 1
+            for order in range(semesters_per_course):
+                fees.append({
+                    "id": len(fees) + 1,
+                    "student_id": u,
+                    "course_id": course_id,
+                    "semester_id": (course_id - 1) * semesters_per_course + order + 1,
+                    "amount": float(rng.choice([4500, 5000, 12000])),
+                })
+        _insert_batches(conn, StudentFee.__table__, iter(fees))
+
+        def payment_rows() -> Iterator[Dict]:
+            for p in range(1, payments + 1):
+                fee = fees[rng.randrange(len(fees))]
+                yield {
+                    "id": p,
+                    "student_id": fee["student_id"],
+                    "student_fee_id": fee["id"],
+                    "amount": round(rng.uniform(100, 2500), 2),
+                    "payment_date": start + timedelta(minutes=rng.randrange(525_600)),
+                    "payment_method": rng.choice(PAYMENT_METHODS),
+                    "transaction_id": f"BENCH-{p}",
+                }
+        _insert_batches(conn, Payment.__table__, payment_rows())
+
+    return {
+        "students": students,
+        "courses": course_count,
+        "semesters": semester_count,
+        "student_fees": len(fees),
+        "payments": payments,
+    }
+
+@contextmanager
+def measure() -> Iterator[Dict[str, float]]:
+    """Measure wall time (ms) and peak Python heap (MiB) of a block."""
+    result: Dict[str, float] = {}
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["ms"] = (time.perf_counter() - started) * 1000
+        result["peak_mib"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+
+def best_of(func: Callable[[], object], repeat: int = 3) -> Tuple[float, object]:
+    """Return the fastest wall time (ms) of ``repeat`` calls and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best, result
+
+@contextmanager
+def serve_app(engine: Engine) -> Iterator[str]:
+    """
+    Run the API with uvicorn in a background thread against ``engine``.
+
+    Yields the base URL of the API, e.g. ``http://127.0.0.1:51234/api``.
+    """
+    import uvicorn
+
+    from app.core.dependencies import get_db
+    from main import app
+
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    app.dependency_overrides[get_db] = override_get_db
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            time.sleep(0.05)
+        yield f"http://127.0.0.1:{port}/api"
+    finally:
+        server.should_exit = True
+        thread.join()
+        app.dependency_overrides.pop(get_db, None)
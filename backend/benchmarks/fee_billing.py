@@ -0,0 +1,84 @@
+"""Benchmark billing a semester per student vs with one INSERT ... SELECT.
+
+Seeds one course with ``--students`` enrolled students and a standard fee,
+times create_student_fee for a sample of students (extrapolated to the
+whole course), then bills the rest in bulk. Usage (from the backend
+directory):
+
+    python -m benchmarks.fee_billing --students 8000 --sample 200
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from app.api.routes.finance import create_student_fee
+from app.core.principals import Principal
+from app.models.academic import Institute, Course
+from app.models.associations import student_course
+from app.models.finance import Semester, StandardFee
+from app.models.user import User
+from app.schemas.finance import StudentFeeCreate
+from app.services.fee_billing import bill_enrolled_students
+from benchmarks.common import _insert_batches, add_database_argument, make_engine, make_session
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=8000)
+    parser.add_argument("--sample", type=int, default=200, help="Students billed one call at a time")
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url, args.reset)
+    with engine.begin() as conn:
+        _insert_batches(conn, Institute.__table__, iter([{"id": 1, "name": "Institute 1", "code": "INS1"}]))
+        _insert_batches(conn, Course.__table__, iter([
+            {"id": 1, "institute_id": 1, "name": "Course 1", "code": "C1", "duration_years": 3, "is_active": True}
+        ]))
+        _insert_batches(conn, Semester.__table__, iter([{
+            "id": 1, "course_id": 1, "name": "Fall 2025", "type": "semester", "order_in_course": 1,
+            "start_date": datetime(2025, 8, 1), "end_date": datetime(2025, 12, 20),
+        }]))
+        _insert_batches(conn, StandardFee.__table__, iter([
+            {"id": 1, "course_id": 1, "semester_id": 1, "amount": 4500.0, "name": "Tuition Fee"}
+        ]))
+        _insert_batches(conn, User.__table__, (
+            {
+                "id": u,
+                "email": f"student{u}@bench.university.edu",
+                "hashed_password": "x",
+                "full_name": f"Student {u}",
+                "is_active": True,
+            }
+            for u in range(1, args.students + 1)
+        ))
+        _insert_batches(conn, student_course, (
+            {"student_id": u, "course_id": 1} for u in range(1, args.students + 1)
+        ))
+
+    db = make_session(engine)
+    admin = Principal(id=0, is_active=True, roles=["admin"])
+    sample = min(args.sample, args.students)
+    started = time.perf_counter()
+    for student_id in range(1, sample + 1):
+        create_student_fee(
+            db=db,
+            student_fee_in=StudentFeeCreate(student_id=student_id, course_id=1, semester_id=1),
+            current_user=admin,
+        )
+    per_student_ms = (time.perf_counter() - started) * 1000 / max(sample, 1)
+
+    started = time.perf_counter()
+    standard_fee = db.get(StandardFee, 1)
+    counts = bill_enrolled_students(db, standard_fee)
+    db.commit()
+    bulk_ms = (time.perf_counter() - started) * 1000
+
+    print(f"per student: {per_student_ms:.2f} ms each, ~{per_student_ms * args.students / 1000:.1f} s for {args.students}")
+    print(f"bulk:        {bulk_ms:.1f} ms, {counts}")
+
+    db.close()
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
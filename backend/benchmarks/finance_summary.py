@@ -0,0 +1,58 @@
+"""Benchmark the finance summary: ORM row loading vs SQL aggregates.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.finance_summary --sizes 10000 100000 1000000
+"""
+
+import argparse
+
+from app.models.finance import StudentFee, Payment
+from app.services.finance_reports import get_finance_summary
+from benchmarks.common import add_database_argument, make_engine, make_session, measure, seed_finance
+
+def legacy_finance_summary(db):
+    """The previous implementation: load every row and aggregate in Python."""
+    student_fees = db.query(StudentFee).all()
+    payments = db.query(Payment).all()
+    total_fees = sum(fee.amount for fee in student_fees)
+    total_paid = sum(payment.amount for payment in payments)
+    return {
+        "total_fees": total_fees,
+        "total_paid": total_paid,
+        "total_pending": total_fees - total_paid,
+        "student_count": len(set(fee.student_id for fee in student_fees)),
+        "payment_count": len(payments),
+    }
+
+def run(size: int, database_url=None, reset: bool = False) -> None:
+    engine = make_engine(database_url, reset)
+    seed_finance(engine, payments=size)
+
+    results = {}
+    for name, func in (("legacy", legacy_finance_summary), ("sql", get_finance_summary)):
+        db = make_session(engine)
+        try:
+            with measure() as stats:
+                summary = func(db)
+        finally:
+            db.close()
+        results[name] = summary
+        print(f"{size:>10} payments  {name:<7} {stats['ms']:>10.1f} ms  {stats['peak_mib']:>8.2f} MiB peak")
+
+    assert results["legacy"]["payment_count"] == results["sql"]["payment_count"]
+    assert results["legacy"]["student_count"] == results["sql"]["student_count"]
+    assert abs(results["legacy"]["total_paid"] - results["sql"]["total_paid"]) < 0.01
+    engine.dispose()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    add_database_argument(parser)
+    args = parser.parse_args()
+    for index, size in enumerate(args.sizes):
+        # Later sizes replace the tables the first run created
+        run(size, args.database_url, args.reset or index > 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Load benchmark of logins per second and /api/health latency during a login burst.
+
+The hashing pool is sized from the PASSWORD_HASH_WORKERS and
+PASSWORD_HASH_QUEUE_SIZE settings, so compare configurations through the
+environment. Usage (from the backend directory):
+
+    PASSWORD_HASH_WORKERS=4 python -m benchmarks.login_throughput --logins 500 --concurrency 100
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import httpx
+
+from app.core.security import get_password_hash
+from app.models.user import User
+from benchmarks.common import add_database_argument, make_engine, make_session, serve_app
+
+EMAIL = "bench.login@university.edu"
+PASSWORD = "bench-password"
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--health-interval", type=float, default=0.05, help="Seconds between health probes")
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url, args.reset)
+    db = make_session(engine)
+    db.add(User(email=EMAIL, hashed_password=get_password_hash(PASSWORD), full_name="Bench Login", is_active=True))
+    db.commit()
+    db.close()
+
+    with serve_app(engine) as base_url:
+        local = threading.local()
+
+        def login(_: int) -> int:
+            if not hasattr(local, "client"):
+                local.client = httpx.Client(timeout=120)
+            response = local.client.post(f"{base_url}/auth/login", data={"username": EMAIL, "password": PASSWORD})
+            return response.status_code
+
+        health_ms: List[float] = []
+        done = threading.Event()
+
+        def probe_health() -> None:
+            with httpx.Client(timeout=120) as client:
+                while not done.is_set():
+                    started = time.perf_counter()
+                    client.get(f"{base_url}/health")
+                    health_ms.append((time.perf_counter() - started) * 1000)
+                    time.sleep(args.health_interval)
+
+        prober = threading.Thread(target=probe_health)
+        started = time.perf_counter()
+        prober.start()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            statuses = Counter(executor.map(login, range(args.logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        prober.join()
+
+    print(f"{args.logins} logins at concurrency {args.concurrency}: {elapsed:.2f} s")
+    print(f"  logins/second     {statuses[200] / elapsed:>8.1f}")
+    print(f"  status codes      {dict(sorted(statuses.items()))}")
+    print(
+        f"  /health latency   p50 {statistics.median(health_ms):.1f} ms  "
+        f"p95 {_percentile(health_ms, 0.95):.1f} ms  max {max(health_ms):.1f} ms  ({len(health_ms)} probes)"
+    )
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
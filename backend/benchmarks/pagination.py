@@ -0,0 +1,55 @@
+"""Benchmark offset vs keyset pagination of the payments listing.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.pagination --payments 1000000 --pages 1 100 10000
+"""
+
+import argparse
+
+from sqlalchemy import desc
+
+from app.core.pagination import keyset_filter
+from app.models.finance import Payment
+from benchmarks.common import add_database_argument, best_of, make_engine, make_session, seed_finance
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payments", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 10_000])
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url, args.reset)
+    seed_finance(engine, payments=args.payments)
+    db = make_session(engine)
+    limit = args.page_size
+    ordered = db.query(Payment).order_by(desc(Payment.payment_date), desc(Payment.id))
+
+    for page in args.pages:
+        skip = (page - 1) * limit
+        if skip >= args.payments:
+            print(f"page {page:>6}: beyond the end of {args.payments} payments, skipped")
+            continue
+
+        offset_ms, offset_rows = best_of(lambda: ordered.offset(skip).limit(limit).all())
+
+        # The cursor a client would hold after reading the previous page
+        if skip:
+            previous = ordered.with_entities(Payment.payment_date, Payment.id).offset(skip - 1).limit(1).one()
+            keyset_query = ordered.filter(
+                keyset_filter([Payment.payment_date, Payment.id], list(previous), descending=True)
+            )
+        else:
+            keyset_query = ordered
+        keyset_ms, keyset_rows = best_of(lambda: keyset_query.limit(limit).all())
+
+        assert [p.id for p in offset_rows] == [p.id for p in keyset_rows]
+        print(f"page {page:>6}: offset {offset_ms:>9.2f} ms   keyset {keyset_ms:>7.2f} ms")
+
+    db.close()
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark posting payments one at a time vs as one batch.
+
+Seeds students and fees, then records ``--payments`` payments through
+create_payment one call at a time and the same number through the batch
+path, reporting payments per second for each. Receipt pre-rendering is
+disabled so only the database work is measured. Usage (from the backend
+directory):
+
+    python -m benchmarks.payment_batch --payments 2000
+"""
+
+import argparse
+import random
+import time
+
+from app.api.routes.finance import create_payment
+from app.core.principals import Principal
+from app.models.finance import StudentFee
+from app.schemas.finance import PaymentCreate
+from app.services.payment_batch import post_payments
+from app.services.receipt_worker import receipt_prerenderer
+from benchmarks.common import add_database_argument, make_engine, make_session, seed_finance
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payments", type=int, default=2000)
+    parser.add_argument("--students", type=int, default=5000)
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url, args.reset)
+    seed_finance(engine, payments=0, students=args.students)
+    receipt_prerenderer.max_workers = 0
+    db = make_session(engine)
+    fees = db.query(StudentFee.id, StudentFee.student_id).all()
+    rng = random.Random(42)
+    admin = Principal(id=0, is_active=True, roles=["admin"])
+
+    def make_items(prefix: str):
+        return [
+            PaymentCreate(
+                student_id=student_id,
+                student_fee_id=fee_id,
+                amount=round(rng.uniform(100, 2500), 2),
+                payment_method="Bank Transfer",
+                transaction_id=f"{prefix}-{i}",
+            )
+            for i, (fee_id, student_id) in enumerate(rng.choice(fees) for _ in range(args.payments))
+        ]
+
+    single_items = make_items("SINGLE")
+    started = time.perf_counter()
+    for item in single_items:
+        create_payment(db=db, payment_in=item, current_user=admin)
+    single_s = time.perf_counter() - started
+
+    batch_items = make_items("BATCH")
+    started = time.perf_counter()
+    posted = post_payments(db, batch_items)
+    db.commit()
+    batch_s = time.perf_counter() - started
+    assert all(result["status"] == "created" for result in posted["results"])
+
+    print(f"one at a time: {single_s:>7.2f} s  {args.payments / single_s:>9.0f} payments/s")
+    print(f"batch:         {batch_s:>7.2f} s  {args.payments / batch_s:>9.0f} payments/s")
+
+    db.close()
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Benchmark receipt rendering: platypus flow layout vs precompiled canvas layout.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.receipt_rendering --receipts 500
+"""
+
+import argparse
+import time
+
+from app.services.receipt_generator import render_receipt_pdf, render_receipt_platypus
+
+CONTEXT = {
+    "receipt_number": "RCPT-1042-BCS-FALL2024-20250101093000",
+    "payment_date": "01-01-2025 09:30:00",
+    "student_name": "John Doe",
+    "student_email": "student1@university.edu",
+    "student_id": "3",
+    "payment_id": "1042",
+    "payment_method": "Credit Card",
+    "transaction_id": "TXN-000123456",
+    "semester_name": "Fall 2024",
+    "fee_description": "Computer Science tuition for John Doe - Fall 2024",
+    "amount_paid": "$2500.00",
+}
+
+def receipts_per_second(render, count: int) -> float:
+    render(CONTEXT)  # warm up fonts and module state
+    started = time.perf_counter()
+    for i in range(count):
+        render({**CONTEXT, "payment_id": str(i)})
+    return count / (time.perf_counter() - started)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--receipts", type=int, default=500)
+    args = parser.parse_args()
+
+    platypus = receipts_per_second(render_receipt_platypus, args.receipts)
+    canvas = receipts_per_second(render_receipt_pdf, args.receipts)
+    print(f"platypus: {platypus:>8.1f} receipts/s")
+    print(f"canvas:   {canvas:>8.1f} receipts/s  ({canvas / platypus:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark the user search against a large users table.
+
+Times app.services.user_search for short prefixes, longer prefixes, name
+substrings and role-filtered searches, next to an unranked substring scan
+of both columns for reference. Usage (from the backend directory):
+
+    python -m benchmarks.user_search --users 100000
+"""
+
+import argparse
+import random
+
+from sqlalchemy import func, or_, select, text
+
+from app.models.associations import user_role
+from app.models.user import Role, User
+from app.services.user_search import search_users
+from benchmarks.common import _insert_batches, add_database_argument, best_of, make_engine, make_session
+
+FIRST_NAMES = ["Maria", "Mario", "John", "Jane", "Ana", "Li", "Wei", "Fatima", "Omar", "Priya", "Lukas", "Sofia"]
+LAST_NAMES = ["Lopez", "Rossi", "Smith", "Doe", "Silva", "Chen", "Wang", "Khan", "Haddad", "Patel", "Becker", "Nowak"]
+ROLES = ["student", "faculty", "admin"]
+
+def seed_users(engine, users: int, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    with engine.begin() as conn:
+        _insert_batches(conn, Role.__table__, (
+            {"id": i, "name": name, "description": f"{name} role"} for i, name in enumerate(ROLES, start=1)
+        ))
+        names = [(rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)) for _ in range(users)]
+        _insert_batches(conn, User.__table__, (
+            {
+                "id": u,
+                "email": f"{first.lower()}.{last.lower()}{u}@university.edu",
+                "hashed_password": "x",
+                "full_name": f"{first} {last}",
+                "is_active": True,
+            }
+            for u, (first, last) in enumerate(names, start=1)
+        ))
+        # Mostly students, a few faculty, a handful of admins
+        _insert_batches(conn, user_role, (
+            {"user_id": u, "role_id": 1 if u % 50 else (2 if u % 1000 else 3)}
+            for u in range(1, users + 1)
+        ))
+        conn.execute(text("ANALYZE"))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=20)
+    add_database_argument(parser)
+    args = parser.parse_args()
+
+    engine = make_engine(args.database_url, args.reset)
+    seed_users(engine, args.users)
+    db = make_session(engine)
+    existing_email = db.execute(select(User.email).where(User.id == args.users // 2)).scalar_one()
+
+    cases = [
+        ("short prefix", "ma", None),
+        ("email prefix", "mario.ros", None),
+        ("exact email", existing_email, None),
+        ("name substring", "silva", None),
+        ("rare substring", "ssi12", None),
+        ("prefix, faculty", "ma", 2),
+        ("substring, faculty", "patel", 2),
+    ]
+    print(f"{args.users} users, {engine.dialect.name}, limit {args.limit}")
+    for label, term, role_id in cases:
+        search_ms, found = best_of(lambda: search_users(db, term, role_id=role_id, limit=args.limit))
+        pattern = f"%{term.lower()}%"
+        scan = (
+            select(User.id)
+            .where(or_(func.lower(User.email).like(pattern), func.lower(User.full_name).like(pattern)))
+            .order_by(User.email)
+            .limit(args.limit)
+        )
+        scan_ms, _ = best_of(lambda: db.execute(scan).all())
+        print(f"{label:>18} {term[:24]!r:>26}: search {search_ms:>8.2f} ms ({len(found):>3} rows)   scan {scan_ms:>8.2f} ms")
+
+    db.close()
+    engine.dispose()
+
+if __name__ == "__main__":
+    main()
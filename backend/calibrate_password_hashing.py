@@ -0,0 +1,48 @@
+import argparse
+import logging
+import time
+
+from app.core.config import settings
+from app.core.security import build_pwd_context
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def measure_hash_ms(rounds: int, samples: int) -> float:
+    """Return the median time in milliseconds to hash a password at ``rounds``."""
+    context = build_pwd_context(["bcrypt"], rounds)
+    # The first hash also loads the bcrypt backend, keep it out of the timings
+    context.hash("calibration-password")
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.hash("calibration-password")
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure bcrypt hash time on this machine and recommend PASSWORD_BCRYPT_ROUNDS"
+    )
+    parser.add_argument("--target-ms", type=float, default=250, help="Target time per hash in milliseconds")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=15)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+    
+    recommended = args.min_rounds
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        ms = measure_hash_ms(rounds, args.samples)
+        logger.info(f"rounds={rounds:>2}: {ms:8.1f} ms per hash")
+        if ms > args.target_ms:
+            # Each extra round doubles the cost, so higher rounds only get slower
+            break
+        recommended = rounds
+    
+    logger.info(
+        f"Recommended PASSWORD_BCRYPT_ROUNDS={recommended} for a {args.target_ms:.0f} ms target "
+        f"(currently {settings.PASSWORD_BCRYPT_ROUNDS}). Existing hashes are upgraded on next login."
+    )
+
+if __name__ == "__main__":
+    main()
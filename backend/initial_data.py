@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 
 from app.db.session import SessionLocal
 from app.db.init_db import init_db
+from app.core.role_registry import role_registry
 from app.core.security import get_password_hash
 from app.models.user import User, Role
 from app.models.academic import Institute, Course
@@ -14,26 +15,18 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def init_roles(db: Session) -> None:
-    roles = [
-        {"name": "admin", "description": "Administrator role"},
-        {"name": "faculty", "description": "Faculty role"},
-        {"name": "student", "description": "Student role"},
-    ]
-    
-    for role_data in roles:
-        role = db.query(Role).filter(Role.name == role_data["name"]).first()
-        if not role:
-            role = Role(**role_data)
-            db.add(role)
-            logger.info(f"Created role: {role_data['name']}")
-    
-    db.commit()
+    roles = {
+        "admin": "Administrator role",
+        "faculty": "Faculty role",
+        "student": "Student role",
+    }
+    
+    # Creates missing roles in one upsert and loads the registry
+    role_registry.ensure(db, roles)
+    logger.info(f"Roles ready: {', '.join(roles)}")
 
 def init_users(db: Session) -> None:
-    # Get roles
-    admin_role = db.query(Role).filter(Role.name == "admin").first()
-    faculty_role = db.query(Role).filter(Role.name == "faculty").first()
-    student_role = db.query(Role).filter(Role.name == "student").first()
+    role_ids = role_registry.resolve(db, ["admin", "faculty", "student"])
     
     # Create admin user
     admin = db.query(User).filter(User.email == "admin@university.edu").first()
@@ -44,8 +37,9 @@ def init_users(db: Session) -> None:
             full_name="Admin User",
             is_active=True,
         )
-        admin.roles.append(admin_role)
         db.add(admin)
+        db.flush()
+        role_registry.set_user_roles(db, admin.id, [role_ids["admin"]])
         logger.info("Created admin user")
     
     # Create faculty user
@@ -57,8 +51,9 @@ def init_users(db: Session) -> None:
             full_name="Faculty User",
             is_active=True,
         )
-        faculty.roles.append(faculty_role)
         db.add(faculty)
+        db.flush()
+        role_registry.set_user_roles(db, faculty.id, [role_ids["faculty"]])
         logger.info("Created faculty user")
     
     # Create student users
@@ -76,8 +71,9 @@ def init_users(db: Session) -> None:
                 full_name=student_data["full_name"],
                 is_active=True,
             )
-            student.roles.append(student_role)
             db.add(student)
+            db.flush()
+            role_registry.set_user_roles(db, student.id, [role_ids["student"]])
             logger.info(f"Created student user: {student_data['full_name']}")
     
     db.commit()
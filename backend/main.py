@@ -3,6 +3,14 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import auth, users, finance, academic
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.password_pool import password_pool
+from app.core.revocation import revocation_list
+from app.core.role_registry import role_registry
+from app.db.session import SessionLocal
+from app.services.receipt_worker import receipt_prerenderer
+from app.services.render_pool import render_pool
+from app.services.user_import_jobs import user_import_jobs
 
 app = FastAPI(
     title="University App API",
@@ -17,6 +25,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include routers
@@ -25,6 +34,34 @@ app.include_router(users.router, prefix="/api/users", tags=["users"])
 app.include_router(finance.router, prefix="/api/finance", tags=["finance"])
 app.include_router(academic.router, prefix="/api/academic", tags=["academic"])
 
+@app.on_event("startup")
+def start_revocation_list():
+    revocation_list.start()
+
+@app.on_event("startup")
+def load_role_registry():
+    db = SessionLocal()
+    try:
+        role_registry.load(db)
+    finally:
+        db.close()
+
+@app.on_event("startup")
+def resume_receipt_prerendering():
+    db = SessionLocal()
+    try:
+        receipt_prerenderer.resume(db)
+    finally:
+        db.close()
+
+@app.on_event("shutdown")
+def shutdown_worker_pools():
+    revocation_list.stop()
+    user_import_jobs.shutdown()
+    receipt_prerenderer.shutdown()
+    render_pool.shutdown()
+    password_pool.shutdown()
+
 @app.get("/api/health")
 def health_check():
     return {"status": "ok", "message": "API is running"}
@@ -0,0 +1,38 @@
+"""Add composite indexes for the payment and student fee filters
+
+Revision ID: b27d9f4c6e18
+Revises: 8e4f2a6b1c37
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b27d9f4c6e18'
+down_revision = '8e4f2a6b1c37'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_payments_student_id_payment_date', 'payments', ['student_id', 'payment_date']),
+    ('ix_payments_student_fee_id', 'payments', ['student_fee_id']),
+    ('ix_student_fees_student_id_semester_id', 'student_fees', ['student_id', 'semester_id']),
+    ('ix_student_fees_semester_id', 'student_fees', ['semester_id']),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=False, postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
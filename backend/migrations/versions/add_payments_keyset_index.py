@@ -0,0 +1,32 @@
+"""Add (payment_date, id) index for keyset pagination of payments
+
+Revision ID: 8e4f2a6b1c37
+Revises: 5c1d8e2f7a90
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4f2a6b1c37'
+down_revision = '5c1d8e2f7a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_payments_payment_date_id', 'payments', ['payment_date', 'id'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_payments_payment_date_id', table_name='payments',
+            postgresql_concurrently=True,
+        )
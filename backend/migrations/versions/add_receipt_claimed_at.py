@@ -0,0 +1,24 @@
+"""Add receipts.claimed_at
+
+Revision ID: 9a5c3e7b1f42
+Revises: 4c8a2f6e1d93
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a5c3e7b1f42'
+down_revision = '4c8a2f6e1d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('receipts', sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('receipts', 'claimed_at')
@@ -0,0 +1,31 @@
+"""Add render status columns to receipts
+
+Revision ID: d41a7e9c2b53
+Revises: b27d9f4c6e18
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41a7e9c2b53'
+down_revision = 'b27d9f4c6e18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Receipts issued before pre-rendering are rendered on download, never resumed;
+    # only receipts created from now on start out pending
+    op.add_column('receipts', sa.Column('status', sa.String(), server_default='not_prerendered', nullable=False))
+    op.alter_column('receipts', 'status', server_default='pending')
+    op.add_column('receipts', sa.Column('render_attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('receipts', sa.Column('rendered_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column('receipts', 'rendered_at')
+    op.drop_column('receipts', 'render_attempts')
+    op.drop_column('receipts', 'status')
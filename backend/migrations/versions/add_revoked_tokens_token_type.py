@@ -0,0 +1,28 @@
+"""Add revoked_tokens.token_type
+
+Revision ID: 4c8a2f6e1d93
+Revises: 7b1e4d9c2a56
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c8a2f6e1d93'
+down_revision = '7b1e4d9c2a56'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows count as access tokens, so they stay enforced until they expire
+    op.add_column(
+        'revoked_tokens',
+        sa.Column('token_type', sa.String(), server_default='access', nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_column('revoked_tokens', 'token_type')
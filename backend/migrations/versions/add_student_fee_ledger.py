@@ -0,0 +1,41 @@
+"""Add paid_amount and balance ledger columns to student_fees
+
+Revision ID: 5c1d8e2f7a90
+Revises: 3a7b9c2d4e5f
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1d8e2f7a90'
+down_revision = '3a7b9c2d4e5f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('student_fees', sa.Column('paid_amount', sa.Float(), server_default='0', nullable=False))
+    op.add_column('student_fees', sa.Column('balance', sa.Float(), nullable=True))
+    
+    # Backfill the ledger from existing payments
+    op.execute(
+        """
+        UPDATE student_fees
+        SET paid_amount = COALESCE(
+                (SELECT SUM(payments.amount) FROM payments
+                 WHERE payments.student_fee_id = student_fees.id), 0),
+            balance = amount - COALESCE(
+                (SELECT SUM(payments.amount) FROM payments
+                 WHERE payments.student_fee_id = student_fees.id), 0)
+        """
+    )
+    op.create_index(op.f('ix_student_fees_balance'), 'student_fees', ['balance'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_student_fees_balance'), table_name='student_fees')
+    op.drop_column('student_fees', 'balance')
+    op.drop_column('student_fees', 'paid_amount')
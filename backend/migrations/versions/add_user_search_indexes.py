@@ -0,0 +1,54 @@
+"""Add indexes for the user search
+
+Revision ID: 2d8c6e4a9b17
+Revises: 6f3b8a1d9e24
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d8c6e4a9b17'
+down_revision = '6f3b8a1d9e24'
+branch_labels = None
+depends_on = None
+
+# (name, column, PostgreSQL access method, PostgreSQL operator class)
+INDEXES = [
+    ('ix_users_lower_email', 'email', 'btree', 'text_pattern_ops'),
+    ('ix_users_lower_full_name', 'full_name', 'btree', 'text_pattern_ops'),
+    ('ix_users_lower_email_trgm', 'email', 'gin', 'gin_trgm_ops'),
+    ('ix_users_lower_full_name_trgm', 'full_name', 'gin', 'gin_trgm_ops'),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        # Prefix search only; substring search scans without pg_trgm
+        for name, column, method, _ in INDEXES:
+            if method == 'btree':
+                op.create_index(name, 'users', [sa.text(f'lower({column})')], unique=False)
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, column, method, opclass in INDEXES:
+            op.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                f'ON users USING {method} (lower({column}) {opclass})'
+            )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        for name, _, method, _ in reversed(INDEXES):
+            if method == 'btree':
+                op.drop_index(name, table_name='users')
+        return
+
+    with op.get_context().autocommit_block():
+        for name, _, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='users', postgresql_concurrently=True)
@@ -0,0 +1,26 @@
+"""Add users.tokens_valid_after
+
+Revision ID: 7b1e4d9c2a56
+Revises: 2d8c6e4a9b17
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b1e4d9c2a56'
+down_revision = '2d8c6e4a9b17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('tokens_valid_after', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_users_tokens_valid_after'), 'users', ['tokens_valid_after'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_users_tokens_valid_after'), table_name='users')
+    op.drop_column('users', 'tokens_valid_after')
@@ -0,0 +1,31 @@
+import argparse
+import logging
+
+from app.db.session import SessionLocal
+from app.services.fee_ledger import rebuild_ledger
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Recompute student fee paid amounts and balances from payments"
+    )
+    parser.add_argument(
+        "student_fee_ids",
+        type=int,
+        nargs="*",
+        help="Only rebuild these student fees (default: all)",
+    )
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    try:
+        count = rebuild_ledger(db, args.student_fee_ids or None)
+        db.commit()
+        logger.info(f"Rebuilt ledger for {count} student fees")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
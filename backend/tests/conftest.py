@@ -0,0 +1,112 @@
+"""Fixtures for backend tests.
+
+Tests run against the database in ``TEST_DATABASE_URL`` when it is set (use
+a PostgreSQL database to exercise the production planner), otherwise against
+a temporary SQLite file. Each test module gets a freshly created schema.
+"""
+
+import os
+from typing import Dict, List, Tuple
+
+# Keep bcrypt cheap in tests; set before the app reads its settings
+os.environ.setdefault("PASSWORD_BCRYPT_ROUNDS", "4")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.dependencies import get_db
+from app.core.principals import principal_cache
+from app.core.revocation import revocation_list
+from app.core.role_registry import role_registry
+from app.core.security import verified_token_cache
+from app.core.security import create_access_token
+from app.db.session import Base
+from app.models.user import User, Role
+from main import app
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    url = TEST_DATABASE_URL or f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+@pytest.fixture(scope="module")
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def db(session_factory) -> Session:
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def client(session_factory):
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    # Each module recreates the schema, so user and role ids are reused across modules
+    principal_cache.clear()
+    verified_token_cache.clear()
+    revocation_list.clear()
+    role_registry.clear()
+    yield
+    principal_cache.clear()
+    verified_token_cache.clear()
+    revocation_list.clear()
+    role_registry.clear()
+
+@pytest.fixture
+def statements(engine) -> List[Tuple[str, object]]:
+    """Record every SQL statement sent to the database during a test."""
+    captured: List[Tuple[str, object]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+def create_user(db: Session, email: str, roles: List[str]) -> User:
+    user = User(email=email, hashed_password="not-a-real-hash", full_name=email.split("@")[0], is_active=True)
+    for role_name in roles:
+        role = db.query(Role).filter(Role.name == role_name).first()
+        if not role:
+            role = Role(name=role_name, description=f"{role_name} role")
+            db.add(role)
+            db.flush()
+        user.roles.append(role)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+def auth_headers(user: User) -> Dict[str, str]:
+    role_names = [role.name for role in user.roles]
+    role_name = role_names[0] if role_names else "user"
+    return {"Authorization": f"Bearer {create_access_token(user.id, role_name, roles=role_names)}"}
@@ -0,0 +1,153 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.core.revocation import RevocationList
+from app.core.security import create_access_token, get_password_hash
+from app.models.user import User, Role, RevokedToken
+from tests.conftest import auth_headers, create_user
+
+def _create_login_user(db, email, role_name):
+    user = User(email=email, hashed_password=get_password_hash("secret123"), full_name=email.split("@")[0], is_active=True)
+    role = db.query(Role).filter(Role.name == role_name).first() or Role(name=role_name, description=f"{role_name} role")
+    user.roles.append(role)
+    db.add(user)
+    db.commit()
+    return user
+
+def _login(client, email):
+    response = client.post("/api/auth/login", data={"username": email, "password": "secret123"})
+    assert response.status_code == 200
+    return response.json()
+
+def test_role_claims_authenticate_without_the_database(client, db, statements):
+    admin = create_user(db, "claims.admin@university.edu", ["admin"])
+    headers = auth_headers(admin)
+    statements.clear()
+    
+    assert client.get("/api/finance/receipts/render-stats", headers=headers).status_code == 200
+    assert statements == []
+
+def test_refresh_rotates_tokens(client, db):
+    _create_login_user(db, "refresh.student@university.edu", "student")
+    tokens = _login(client, "refresh.student@university.edu")
+    assert tokens["refresh_token"]
+    
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    refreshed = response.json()
+    response = client.get("/api/auth/me", headers={"Authorization": f"Bearer {refreshed['access_token']}"})
+    assert response.status_code == 200
+    assert response.json()["email"] == "refresh.student@university.edu"
+    
+    # Refresh tokens are single use
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+    
+    # Refresh tokens are not access tokens and vice versa
+    response = client.get("/api/auth/me", headers={"Authorization": f"Bearer {refreshed['refresh_token']}"})
+    assert response.status_code == 403
+    response = client.post("/api/auth/refresh", json={"refresh_token": refreshed["access_token"]})
+    assert response.status_code == 401
+
+def test_logout_revokes_tokens(client, db):
+    _create_login_user(db, "logout.student@university.edu", "student")
+    tokens = _login(client, "logout.student@university.edu")
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    
+    response = client.post("/api/auth/logout", headers=headers, json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+def test_expired_access_token_is_unauthorized(client, db):
+    student = create_user(db, "expired.student@university.edu", ["student"])
+    token = create_access_token(student.id, "student", expires_delta=timedelta(seconds=-1), roles=["student"])
+    response = client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+
+def test_deactivation_cuts_off_role_claim_tokens(client, db):
+    admin = create_user(db, "deactivate.admin@university.edu", ["admin"])
+    student = create_user(db, "deactivate.student@university.edu", ["student"])
+    student_headers = auth_headers(student)
+    assert client.get("/api/auth/me", headers=student_headers).status_code == 200
+    
+    response = client.put(
+        f"/api/users/{student.id}",
+        headers=auth_headers(admin),
+        json={"email": student.email, "is_active": False},
+    )
+    assert response.status_code == 200
+    assert client.get("/api/auth/me", headers=student_headers).status_code == 400
+
+def test_revocation_list_rebuilds_from_the_database(db):
+    user = create_user(db, "rebuild.student@university.edu", ["student"])
+    inactive = create_user(db, "rebuild.inactive@university.edu", ["student"])
+    inactive.is_active = False
+    now = datetime.now(timezone.utc)
+    db.add_all([
+        RevokedToken(jti="live", user_id=user.id, token_type="access", expires_at=now + timedelta(hours=1)),
+        RevokedToken(jti="expired", user_id=user.id, token_type="access", expires_at=now - timedelta(hours=1)),
+        RevokedToken(jti="rotated", user_id=user.id, token_type="refresh", expires_at=now + timedelta(days=8)),
+    ])
+    db.commit()
+    
+    revocation = RevocationList(refresh_interval=60)
+    revocation.rebuild(db)
+    assert revocation.is_token_revoked("live")
+    # Expired tokens are rejected by their exp claim, so they are not kept in memory
+    assert not revocation.is_token_revoked("expired")
+    # Refresh tokens are checked against the database by /refresh
+    assert not revocation.is_token_revoked("rotated")
+    assert revocation.is_user_inactive(inactive.id)
+    assert not revocation.is_user_inactive(user.id)
+    
+    assert RevocationList.purge_expired(db) == 1
+    remaining = {row.jti for row in db.query(RevokedToken).filter(RevokedToken.user_id == user.id)}
+    assert remaining == {"live", "rotated"}
+
+def test_role_and_password_changes_cut_off_issued_tokens(client, db):
+    admin = create_user(db, "cutoff.admin@university.edu", ["admin"])
+    _create_login_user(db, "cutoff.faculty@university.edu", "faculty")
+    faculty = db.query(User).filter(User.email == "cutoff.faculty@university.edu").one()
+    tokens = _login(client, faculty.email)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+    
+    # Unchanged roles leave tokens alone
+    response = client.put(
+        f"/api/users/{faculty.id}",
+        headers=auth_headers(admin),
+        json={"email": faculty.email, "full_name": "Renamed", "roles": ["faculty"]},
+    )
+    assert response.status_code == 200
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+    
+    response = client.put(
+        f"/api/users/{faculty.id}",
+        headers=auth_headers(admin),
+        json={"email": faculty.email, "roles": ["student"]},
+    )
+    assert response.status_code == 200
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+    response = client.post("/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+    
+    # Tokens issued after the change work, until the password changes
+    tokens = _login(client, faculty.email)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+    response = client.put(
+        f"/api/users/{faculty.id}",
+        headers=auth_headers(admin),
+        json={"email": faculty.email, "password": "secret456"},
+    )
+    assert response.status_code == 200
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+    
+    # Other processes pick the cut-off up from the database
+    revocation = RevocationList(refresh_interval=60)
+    revocation.rebuild(db)
+    assert revocation.is_token_stale(faculty.id, time.time() - 60)
+    assert not revocation.is_token_stale(faculty.id, time.time() + 1)
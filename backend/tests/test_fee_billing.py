@@ -0,0 +1,87 @@
+from datetime import datetime
+
+import pytest
+
+from app.models.academic import Institute, Course
+from app.models.finance import Semester, StandardFee, StudentFee
+from tests.conftest import auth_headers, create_user
+
+@pytest.fixture(scope="module")
+def billing(session_factory):
+    """Return admin headers, the course and semester ids, and the enrolled student ids."""
+    db = session_factory()
+    try:
+        admin = create_user(db, "billing.admin@university.edu", ["admin"])
+        institute = Institute(name="Billing Institute", code="BILL")
+        course = Course(institute=institute, name="Billing Course", code="BC", duration_years=3, is_active=True)
+        other_course = Course(institute=institute, name="Other Course", code="OC", duration_years=3, is_active=True)
+        semester = Semester(
+            course=course, name="Spring 2025", type="semester", order_in_course=2,
+            start_date=datetime(2025, 1, 10), end_date=datetime(2025, 5, 30),
+        )
+        unpriced = Semester(
+            course=course, name="Summer 2025", type="semester", order_in_course=3,
+            start_date=datetime(2025, 6, 1), end_date=datetime(2025, 8, 30),
+        )
+        db.add_all([institute, course, other_course, semester, unpriced])
+        db.flush()
+        db.add(StandardFee(
+            course_id=course.id, semester_id=semester.id, amount=4500.0, name="Tuition Fee", description="Spring tuition",
+        ))
+        students = [create_user(db, f"billing.student{i}@university.edu", ["student"]) for i in range(5)]
+        for student in students:
+            student.courses.append(course)
+        outsider = create_user(db, "billing.outsider@university.edu", ["student"])
+        outsider.courses.append(other_course)
+        # Billed by hand before the bulk run
+        db.add(StudentFee(
+            student_id=students[0].id, course_id=course.id, semester_id=semester.id, amount=4000.0,
+        ))
+        db.commit()
+        return auth_headers(admin), course.id, semester.id, unpriced.id, [student.id for student in students]
+    finally:
+        db.close()
+
+def test_bulk_billing_is_one_insert_and_skips_billed_students(client, db, statements, billing):
+    headers, course_id, semester_id, _, student_ids = billing
+    statements.clear()
+
+    response = client.post(
+        "/api/finance/student-fees/bulk",
+        headers=headers,
+        json={"course_id": course_id, "semester_id": semester_id},
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"enrolled": 5, "created": 4, "skipped": 1}
+    inserts = [statement for statement, _ in statements if statement.startswith("INSERT INTO student_fees")]
+    assert len(inserts) == 1, inserts
+
+    fees = db.query(StudentFee).filter(StudentFee.semester_id == semester_id).order_by(StudentFee.student_id).all()
+    assert [fee.student_id for fee in fees] == student_ids
+    assert fees[0].amount == 4000.0
+    for fee in fees[1:]:
+        assert (fee.amount, fee.paid_amount, fee.balance) == (4500.0, 0, 4500.0)
+        assert fee.description == "Spring tuition"
+        assert fee.created_at is not None
+
+    # Repeating the run bills nobody twice
+    response = client.post(
+        "/api/finance/student-fees/bulk",
+        headers=headers,
+        json={"course_id": course_id, "semester_id": semester_id},
+    )
+    assert response.json() == {"enrolled": 5, "created": 0, "skipped": 5}
+
+@pytest.mark.parametrize("field,status_code", [("unpriced", 400), ("missing", 404), ("other_course", 400)])
+def test_bulk_billing_rejects_invalid_semesters(client, billing, field, status_code):
+    headers, course_id, semester_id, unpriced_id, _ = billing
+    body = {
+        "unpriced": {"course_id": course_id, "semester_id": unpriced_id},
+        "missing": {"course_id": course_id, "semester_id": 999_999},
+        "other_course": {"course_id": course_id + 1, "semester_id": semester_id},
+    }[field]
+
+    response = client.post("/api/finance/student-fees/bulk", headers=headers, json=body)
+
+    assert response.status_code == status_code, response.text
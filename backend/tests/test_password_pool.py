@@ -0,0 +1,62 @@
+import pytest
+
+from app.core.password_pool import PasswordHashPool, PasswordPoolSaturated
+from app.core.security import build_pwd_context, get_password_hash, verify_password
+from app.models.user import User
+
+def test_password_pool_hashes_and_sheds_load():
+    pool = PasswordHashPool(max_workers=1, max_queue=0)
+    try:
+        first = pool.submit(get_password_hash, "first-password")
+        # The only slot is taken until the first hash finishes
+        with pytest.raises(PasswordPoolSaturated):
+            pool.submit(get_password_hash, "second-password")
+        assert verify_password("first-password", first.result(timeout=60))
+        
+        assert verify_password("third-password", pool.hash_blocking("third-password"))
+        stats = pool.stats()
+        assert stats["completed"] == 2
+        assert stats["rejected"] == 1
+        assert stats["in_flight"] == 0
+    finally:
+        pool.shutdown()
+
+def test_login_verifies_on_the_password_pool(client, db):
+    db.add(User(
+        email="login.student@university.edu",
+        hashed_password=get_password_hash("student123"),
+        full_name="Login Student",
+        is_active=True,
+    ))
+    db.commit()
+    
+    response = client.post(
+        "/api/auth/login",
+        data={"username": "login.student@university.edu", "password": "student123"},
+    )
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+    
+    response = client.post(
+        "/api/auth/login",
+        data={"username": "login.student@university.edu", "password": "wrong"},
+    )
+    assert response.status_code == 401
+
+def test_login_rehashes_stale_password_hash(client, db):
+    # A hash made at a different bcrypt cost than PASSWORD_BCRYPT_ROUNDS
+    stale_hash = build_pwd_context(["bcrypt"], 5).hash("faculty123")
+    user = User(email="rehash.faculty@university.edu", hashed_password=stale_hash, full_name="Rehash", is_active=True)
+    db.add(user)
+    db.commit()
+    
+    response = client.post(
+        "/api/auth/login",
+        data={"username": "rehash.faculty@university.edu", "password": "faculty123"},
+    )
+    assert response.status_code == 200
+    
+    db.refresh(user)
+    assert user.hashed_password != stale_hash
+    assert user.hashed_password.startswith("$2b$04$")
+    assert verify_password("faculty123", user.hashed_password)
@@ -0,0 +1,101 @@
+from datetime import datetime
+
+import pytest
+
+from app.models.academic import Institute, Course
+from app.models.finance import Semester, StudentFee, Payment, Receipt
+from app.services import fee_ledger
+from app.services.receipt_worker import receipt_prerenderer
+from tests.conftest import auth_headers, create_user
+
+@pytest.fixture(scope="module")
+def ledger(session_factory):
+    """Return admin headers and two (student id, student fee id) pairs."""
+    db = session_factory()
+    try:
+        admin = create_user(db, "batch.admin@university.edu", ["admin"])
+        institute = Institute(name="Batch Institute", code="BAT")
+        course = Course(institute=institute, name="Batch Course", code="bt", duration_years=2, is_active=True)
+        semester = Semester(
+            course=course, name="Fall 2025", type="semester", order_in_course=1,
+            start_date=datetime(2025, 8, 1), end_date=datetime(2025, 12, 20),
+        )
+        pairs = []
+        for i in range(2):
+            student = create_user(db, f"batch.student{i}@university.edu", ["student"])
+            fee = StudentFee(student=student, course=course, semester=semester, amount=1000.0)
+            db.add(fee)
+            db.flush()
+            pairs.append((student.id, fee.id))
+        db.add(Payment(
+            student_id=pairs[0][0], student_fee_id=pairs[0][1], amount=50.0,
+            payment_method="Cash", transaction_id="BANK-EXISTING",
+        ))
+        fee_ledger.apply_payment(db, pairs[0][1], 50.0)
+        db.commit()
+        return auth_headers(admin), pairs
+    finally:
+        db.close()
+
+@pytest.fixture(autouse=True)
+def no_prerendering(monkeypatch):
+    monkeypatch.setattr(receipt_prerenderer, "max_workers", 0)
+
+def payment(student_id, fee_id, amount, transaction_id=None):
+    return {
+        "student_id": student_id,
+        "student_fee_id": fee_id,
+        "amount": amount,
+        "payment_method": "Bank Transfer",
+        "transaction_id": transaction_id,
+    }
+
+def test_batch_posts_valid_items_in_bulk(client, db, statements, ledger):
+    headers, [(first, first_fee), (second, second_fee)] = ledger
+    batch = [
+        payment(first, first_fee, 100.0, "BANK-1"),
+        payment(second, second_fee, 200.0, "BANK-2"),
+        payment(first, first_fee, 25.5),
+        payment(999_999, first_fee, 10.0),
+        payment(first, 999_999, 10.0),
+        payment(second, first_fee, 10.0),
+        payment(first, first_fee, 10.0, "BANK-EXISTING"),
+        payment(second, second_fee, 10.0, "BANK-2"),
+    ]
+    statements.clear()
+
+    response = client.post("/api/finance/payments/batch", headers=headers, json=batch)
+
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["created"], result["failed"]) == (3, 5)
+    items = result["items"]
+    assert [item["index"] for item in items] == list(range(len(batch)))
+    assert [item["status"] for item in items] == ["created"] * 3 + ["failed"] * 5
+    assert [item["detail"] for item in items[3:]] == [
+        "The student with this id does not exist",
+        "The student fee with this id does not exist",
+        "The student fee does not belong to this student",
+        "A payment with this transaction id already exists",
+        "A payment with this transaction id already exists",
+    ]
+    for item in items[:3]:
+        assert item["receipt_number"].startswith(f"RCPT-{item['payment_id']}-BT-FALL2025-")
+        receipt = db.get(Receipt, item["receipt_id"])
+        assert receipt.payment_id == item["payment_id"]
+
+    # One insert for the payments, one for the receipts, one ledger update
+    for prefix in ("INSERT INTO payments", "INSERT INTO receipts", "UPDATE student_fees"):
+        matching = [statement for statement, _ in statements if statement.startswith(prefix)]
+        assert len(matching) == 1, matching
+
+    fees = {fee.id: fee for fee in db.query(StudentFee).filter(StudentFee.id.in_([first_fee, second_fee]))}
+    assert (fees[first_fee].paid_amount, fees[first_fee].balance) == (175.5, 824.5)
+    assert (fees[second_fee].paid_amount, fees[second_fee].balance) == (200.0, 800.0)
+
+def test_batch_size_is_checked(client, ledger):
+    headers, _ = ledger
+
+    response = client.post("/api/finance/payments/batch", headers=headers, json=[])
+
+    assert response.status_code == 400
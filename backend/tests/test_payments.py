@@ -0,0 +1,45 @@
+from datetime import datetime
+
+import pytest
+
+from app.models.academic import Institute, Course
+from app.models.finance import Semester, StudentFee, Payment
+from tests.conftest import auth_headers, create_user
+
+@pytest.fixture(scope="module")
+def students(session_factory):
+    """Return (auth headers, user id) for two students with one payment each."""
+    db = session_factory()
+    try:
+        institute = Institute(name="Payments Institute", code="PAY")
+        course = Course(institute=institute, name="Payments Course", code="PY", duration_years=2, is_active=True)
+        semester = Semester(
+            course=course, name="Fall 2025", type="semester", order_in_course=1,
+            start_date=datetime(2025, 8, 1), end_date=datetime(2025, 12, 20),
+        )
+        result = []
+        for i in range(2):
+            student = create_user(db, f"payments.student{i}@university.edu", ["student"])
+            fee = StudentFee(student=student, course=course, semester=semester, amount=1000.0)
+            db.add_all([fee, Payment(student=student, student_fee=fee, amount=100.0, payment_method="Cash")])
+            db.commit()
+            result.append((auth_headers(student), student.id))
+        return result
+    finally:
+        db.close()
+
+@pytest.mark.parametrize("path", ["/api/finance/payments", "/api/finance/payments/export"])
+def test_students_cannot_ask_for_other_students_payments(client, students, path):
+    (headers, student_id), (_, other_id) = students
+
+    response = client.get(path, headers=headers, params={"student_id": other_id})
+
+    assert response.status_code == 403
+
+def test_students_see_only_their_own_payments(client, students):
+    (headers, student_id), _ = students
+
+    for params in ({}, {"student_id": student_id}):
+        response = client.get("/api/finance/payments", headers=headers, params=params)
+        assert response.status_code == 200
+        assert [payment["student_id"] for payment in response.json()] == [student_id]
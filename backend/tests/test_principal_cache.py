@@ -0,0 +1,64 @@
+import time
+
+from app.core.principals import Principal
+from app.core.ttl_cache import TTLCache
+from app.core.security import create_access_token
+from tests.conftest import auth_headers, create_user
+
+def legacy_auth_headers(user):
+    """Headers with a token that has no role set, resolved through the principal cache."""
+    return {"Authorization": f"Bearer {create_access_token(user.id, user.roles[0].name)}"}
+
+def test_principal_cache_expires_and_evicts():
+    cache = TTLCache(max_entries=2, ttl=0.05)
+    for user_id in (1, 2, 3):
+        cache.put(user_id, Principal(id=user_id, is_active=True, roles=frozenset({"student"})))
+    # The least recently used entry is evicted
+    assert cache.get(1) is None
+    assert cache.get(3).roles == frozenset({"student"})
+    
+    time.sleep(0.06)
+    assert cache.get(3) is None
+
+def test_principal_role_flags():
+    principal = Principal(id=1, is_active=True, roles=["faculty", "student"])
+    assert principal.roles == frozenset({"faculty", "student"})
+    assert (principal.is_admin, principal.is_faculty, principal.is_student) == (False, True, True)
+    assert principal.is_staff
+    assert not hasattr(principal, "__dict__")
+
+def test_authenticated_requests_hit_the_cache(client, db, statements):
+    admin = create_user(db, "cache.admin@university.edu", ["admin"])
+    headers = legacy_auth_headers(admin)
+    
+    statements.clear()
+    assert client.get("/api/finance/receipts/render-stats", headers=headers).status_code == 200
+    # The user and their roles are resolved by one query plus one selectin load
+    assert len(statements) == 2, [statement for statement, _ in statements]
+    
+    statements.clear()
+    assert client.get("/api/finance/receipts/render-stats", headers=headers).status_code == 200
+    assert statements == []
+
+def test_update_user_invalidates_cached_principal(client, db):
+    admin = create_user(db, "roles.admin@university.edu", ["admin"])
+    student = create_user(db, "roles.student@university.edu", ["student"])
+    student_headers = legacy_auth_headers(student)
+    
+    assert client.get("/api/finance/receipts/render-stats", headers=student_headers).status_code == 403
+    
+    response = client.put(
+        f"/api/users/{student.id}",
+        headers=auth_headers(admin),
+        json={"email": student.email, "roles": ["student", "admin"]},
+    )
+    assert response.status_code == 200
+    assert client.get("/api/finance/receipts/render-stats", headers=student_headers).status_code == 200
+    
+    response = client.put(
+        f"/api/users/{student.id}",
+        headers=auth_headers(admin),
+        json={"email": student.email, "is_active": False},
+    )
+    assert response.status_code == 200
+    assert client.get("/api/finance/receipts/render-stats", headers=student_headers).status_code == 400
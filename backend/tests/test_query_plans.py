@@ -0,0 +1,92 @@
+"""Guard the finance listing and summary queries against sequential scans.
+
+Each case calls a route against a seeded database, captures the SQL it
+issues and runs EXPLAIN on it. A full table scan of ``payments`` or
+``student_fees`` means a filter lost its index.
+"""
+
+import json
+import re
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+from sqlalchemy import text
+
+from benchmarks.common import seed_finance
+from tests.conftest import auth_headers, create_user
+
+LARGE_TABLES = {"payments", "student_fees"}
+SEEDED_PAYMENTS = 50_000
+
+@pytest.fixture(scope="module")
+def seeded(engine, session_factory):
+    counts = seed_finance(engine, payments=SEEDED_PAYMENTS)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    db = session_factory()
+    try:
+        staff = create_user(db, "staff@university.edu", ["admin", "faculty"])
+        headers = auth_headers(staff)
+    finally:
+        db.close()
+    return counts, headers
+
+def sequential_scans(conn, statement: str, parameters) -> List[str]:
+    """Return the large tables a statement reads with a full table scan."""
+    if conn.dialect.name == "postgresql":
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        found = []
+        nodes = [plan[0]["Plan"]]
+        while nodes:
+            node = nodes.pop()
+            if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in LARGE_TABLES:
+                found.append(node["Relation Name"])
+            nodes.extend(node.get("Plans", []))
+        return found
+
+    # SQLite reports "SCAN <table>" for a full scan and "SEARCH <table> ..." or
+    # "SCAN <table> USING INDEX ..." when an index drives the lookup
+    found = []
+    for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+        match = re.match(r"SCAN (\w+)(?: AS \w+)?$", row[-1])
+        if match and match.group(1) in LARGE_TABLES:
+            found.append(match.group(1))
+    return found
+
+DAY = datetime(2024, 6, 1)
+
+PLAN_CASES = [
+    ("/api/finance/payments", {}),
+    ("/api/finance/payments", {"student_id": 7}),
+    ("/api/finance/payments", {"student_fee_id": 11}),
+    ("/api/finance/payments", {"start_date": DAY.isoformat(), "end_date": (DAY + timedelta(days=1)).isoformat()}),
+    ("/api/finance/student-fees", {"student_id": 7}),
+    ("/api/finance/student-fees", {"student_id": 7, "semester_id": 1}),
+    ("/api/finance/student-fees", {"semester_id": 3}),
+    ("/api/finance/finance/summary", {"student_id": 7}),
+    ("/api/finance/finance/summary", {"student_id": 7, "semester_id": 1}),
+    ("/api/finance/finance/summary", {"student_id": 7, "start_date": DAY.isoformat()}),
+]
+
+@pytest.mark.parametrize("path,params", PLAN_CASES)
+def test_route_queries_use_indexes(engine, client, statements, seeded, path, params):
+    _, headers = seeded
+    statements.clear()
+    response = client.get(path, params=params, headers=headers)
+    assert response.status_code == 200, response.text
+
+    queries = [
+        (statement, parameters)
+        for statement, parameters in statements
+        if statement.lstrip().upper().startswith("SELECT")
+        and any(table in statement for table in LARGE_TABLES)
+    ]
+    assert queries, "the route issued no queries against the finance tables"
+
+    with engine.connect() as conn:
+        for statement, parameters in queries:
+            scanned = sequential_scans(conn, statement, parameters)
+            assert not scanned, f"sequential scan on {scanned} for {path} {params}:\n{statement}"
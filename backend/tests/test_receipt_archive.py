@@ -0,0 +1,58 @@
+import io
+import zipfile
+from concurrent.futures import Future
+
+import pytest
+
+from app.services.receipt_archive import stream_receipt_archive, FAILED_RECEIPTS_NAME
+from app.services.receipt_cache import receipt_cache
+from app.services.render_pool import render_pool
+
+@pytest.fixture(autouse=True)
+def temporary_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(receipt_cache, "directory", str(tmp_path))
+    monkeypatch.setattr(render_pool, "max_workers", 0)
+    receipt_cache.clear()
+    yield
+    receipt_cache.clear()
+
+def done(result=None, error=None):
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+def test_failed_renders_are_listed_instead_of_aborting(monkeypatch):
+    outcomes = {
+        "RCPT-1": done(b"%PDF-1"),
+        "RCPT-2": Future(),  # never finishes
+        "RCPT-3": done(error=RuntimeError("boom")),
+        "RCPT-4": done(b"%PDF-4"),
+    }
+    monkeypatch.setattr(render_pool, "submit", lambda context: outcomes[context["receipt_number"]])
+    receipts = [(i, {"receipt_number": f"RCPT-{i}"}) for i in range(1, 5)]
+
+    data = b"".join(stream_receipt_archive(receipts, render_timeout=0.05))
+
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.namelist() == ["RCPT-1.pdf", "RCPT-4.pdf", FAILED_RECEIPTS_NAME]
+    assert archive.read("RCPT-4.pdf") == b"%PDF-4"
+    assert archive.read(FAILED_RECEIPTS_NAME).decode().splitlines() == [
+        "RCPT-2.pdf: rendering timed out",
+        "RCPT-3.pdf: rendering failed",
+    ]
+
+def test_archive_deadline_stops_rendering(monkeypatch):
+    monkeypatch.setattr(render_pool, "submit", lambda context: done(b"%PDF"))
+    receipts = [(i, {"receipt_number": f"RCPT-{i}"}) for i in range(1, 3)]
+
+    data = b"".join(stream_receipt_archive(receipts, timeout=0))
+
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.namelist() == [FAILED_RECEIPTS_NAME]
+    assert archive.read(FAILED_RECEIPTS_NAME).decode().splitlines() == [
+        "RCPT-1.pdf: archive timed out",
+        "RCPT-2.pdf: archive timed out",
+    ]
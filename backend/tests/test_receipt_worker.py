@@ -0,0 +1,98 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.models.academic import Institute, Course
+from app.models.finance import Semester, StudentFee, Payment, Receipt
+from app.services.receipt_cache import receipt_cache
+from app.services.receipt_worker import ReceiptPrerenderer
+from app.services.render_pool import render_pool, RenderPoolSaturated
+from tests.conftest import create_user
+
+# Keys name receipts, values are their starting status. "stale" is rendering
+# with no claim time (abandoned); "retry" is rendered by the tests.
+STATUSES = {
+    "pending": "pending",
+    "second_pending": "pending",
+    "stale": "rendering",
+    "rendering": "rendering",
+    "ready": "ready",
+    "failed": "failed",
+    "not_prerendered": "not_prerendered",
+    "retry": "failed",
+}
+
+@pytest.fixture(scope="module")
+def receipts(session_factory):
+    """Return receipt ids keyed like STATUSES."""
+    db = session_factory()
+    try:
+        student = create_user(db, "worker.student@university.edu", ["student"])
+        institute = Institute(name="Worker Institute", code="WRK")
+        course = Course(institute=institute, name="Worker Course", code="WK", duration_years=2, is_active=True)
+        semester = Semester(
+            course=course, name="Fall 2024", type="semester", order_in_course=1,
+            start_date=datetime(2024, 8, 1), end_date=datetime(2024, 12, 20),
+        )
+        fee = StudentFee(student=student, course=course, semester=semester, amount=5000.0)
+        db.add_all([institute, course, semester, fee])
+        ids = {}
+        for key, status in STATUSES.items():
+            payment = Payment(student=student, student_fee=fee, amount=100.0, payment_method="Cash")
+            db.add(payment)
+            db.flush()
+            receipt = Receipt(payment_id=payment.id, receipt_number=f"RCPT-{payment.id}-WK", status=status)
+            if key == "rendering":
+                # Claimed just now by a live worker
+                receipt.claimed_at = datetime.now(timezone.utc)
+            db.add(receipt)
+            db.flush()
+            ids[key] = receipt.id
+        db.commit()
+        return ids
+    finally:
+        db.close()
+
+@pytest.fixture(autouse=True)
+def temporary_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(receipt_cache, "directory", str(tmp_path))
+    receipt_cache.clear()
+
+def test_saturated_pool_does_not_use_up_attempts(monkeypatch, db, session_factory, receipts):
+    outcomes = [RenderPoolSaturated(), RenderPoolSaturated(), RenderPoolSaturated(), b"%PDF-1.4"]
+
+    def render(context):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(render_pool, "render", render)
+    worker = ReceiptPrerenderer(1, max_attempts=1, retry_delay=0, session_factory=session_factory)
+
+    worker._run(receipts["retry"])
+
+    receipt = db.get(Receipt, receipts["retry"])
+    assert (receipt.status, receipt.render_attempts) == ("ready", 1)
+    assert not outcomes
+
+def test_resume_claims_unfinished_receipts_once(monkeypatch, db, session_factory, receipts):
+    worker = ReceiptPrerenderer(1, max_attempts=1, retry_delay=0, session_factory=session_factory)
+    enqueued = []
+    monkeypatch.setattr(worker, "enqueue", enqueued.extend)
+    monkeypatch.setattr(settings, "RECEIPT_PRERENDER_RESUME_LIMIT", 2)
+
+    first = worker.resume(db)
+    second = worker.resume(db)
+    third = worker.resume(db)
+
+    # Capped per call, and a claimed receipt is never handed out again
+    assert first == [receipts["pending"], receipts["second_pending"]]
+    assert second == [receipts["stale"]]
+    assert third == []
+    assert enqueued == first + second
+    db.expire_all()
+    for key in ("pending", "second_pending", "stale"):
+        receipt = db.get(Receipt, receipts[key])
+        assert receipt.status == "rendering" and receipt.claimed_at is not None
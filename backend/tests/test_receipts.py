@@ -0,0 +1,157 @@
+import asyncio
+from concurrent.futures import Future
+from datetime import datetime
+
+import pytest
+
+from app.core.config import settings
+from app.models.academic import Institute, Course
+from app.models.finance import Semester, StudentFee, Payment, Receipt
+from app.services.receipt_cache import receipt_cache
+from app.services.render_pool import render_pool
+from tests.conftest import auth_headers, create_user
+
+@pytest.fixture(scope="module")
+def receipt(session_factory):
+    """Return the owning student's auth headers and the id of their receipt."""
+    db = session_factory()
+    student = create_user(db, "receipt.student@university.edu", ["student"])
+    institute = Institute(name="Receipt Institute", code="RCPT")
+    course = Course(institute=institute, name="Receipt Course", code="RC", duration_years=2, is_active=True)
+    semester = Semester(
+        course=course, name="Fall 2024", type="semester", order_in_course=1,
+        start_date=datetime(2024, 8, 1), end_date=datetime(2024, 12, 20),
+    )
+    fee = StudentFee(student=student, course=course, semester=semester, amount=5000.0, description="Tuition Fee")
+    payment = Payment(student=student, student_fee=fee, amount=100.0, payment_method="Cash")
+    db.add_all([institute, course, semester, fee, payment])
+    db.flush()
+    receipt = Receipt(payment_id=payment.id, receipt_number=f"RCPT-{payment.id}-RC-FALL2024")
+    db.add(receipt)
+    db.commit()
+    try:
+        yield auth_headers(student), receipt.id
+    finally:
+        db.close()
+
+@pytest.fixture(autouse=True)
+def inline_rendering(monkeypatch, tmp_path):
+    # Render in-process and cache into a temporary directory
+    monkeypatch.setattr(render_pool, "max_workers", 0)
+    monkeypatch.setattr(receipt_cache, "directory", str(tmp_path))
+
+@pytest.mark.parametrize("role", ["student", "admin"])
+def test_receipt_download_is_a_single_query(client, db, statements, receipt, role):
+    headers, receipt_id = receipt
+    if role != "student":
+        headers = auth_headers(create_user(db, f"receipt.{role}@university.edu", [role]))
+    url = f"/api/finance/receipts/{receipt_id}/download"
+    
+    # Warm up the caches
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.content.startswith(b"%PDF")
+    
+    statements.clear()
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    # With the caller cached, the receipt and everything on it is a single statement
+    assert len(statements) == 1, [statement for statement, _ in statements]
+
+def test_receipt_download_forbidden_for_other_students(client, db, receipt):
+    _, receipt_id = receipt
+    other = create_user(db, "other.student@university.edu", ["student"])
+    
+    response = client.get(f"/api/finance/receipts/{receipt_id}/download", headers=auth_headers(other))
+    assert response.status_code == 403
+    
+    response = client.get("/api/finance/receipts/999999/download", headers=auth_headers(other))
+    assert response.status_code == 404
+
+def test_receipt_listing_is_a_single_query(client, statements, receipt):
+    headers, receipt_id = receipt
+    client.get("/api/auth/me", headers=headers)
+    statements.clear()
+    
+    response = client.get("/api/finance/receipts", headers=headers, params={"limit": 10})
+    
+    assert response.status_code == 200
+    page = response.json()
+    assert page["total"] == 1
+    item = page["items"][0]
+    assert item["id"] == receipt_id
+    assert item["amount"] == 100.0
+    assert item["semester_name"] == "Fall 2024"
+    assert item["course_name"] == "Receipt Course"
+    # With the caller cached, one statement returns the page and its total
+    assert len(statements) == 1, [statement for statement, _ in statements]
+
+def test_receipt_listing_past_the_last_page(client, receipt):
+    headers, _ = receipt
+    response = client.get("/api/finance/receipts", headers=headers, params={"skip": 10})
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+    assert response.json()["items"] == []
+
+def test_rerendered_receipt_matches_its_etag(client, receipt, tmp_path):
+    headers, receipt_id = receipt
+    url = f"/api/finance/receipts/{receipt_id}/download"
+    first = client.get(url, headers=headers)
+    assert first.status_code == 200
+    
+    # Drop the cached PDF so the second download renders again
+    receipt_cache.clear()
+    for path in tmp_path.rglob("*"):
+        if path.is_file():
+            path.unlink()
+    second = client.get(url, headers=headers)
+    
+    assert second.status_code == 200
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.content == first.content
+
+def test_slow_render_answers_503(client, receipt, monkeypatch):
+    headers, receipt_id = receipt
+    receipt_cache.clear()
+    monkeypatch.setattr(render_pool, "submit", lambda context: Future())
+    monkeypatch.setattr(settings, "RECEIPT_RENDER_TIMEOUT_SECONDS", 0.05)
+    
+    response = client.get(f"/api/finance/receipts/{receipt_id}/download", headers=headers)
+    
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(settings.RECEIPT_RENDER_RETRY_AFTER_SECONDS)
+
+def test_render_errors_are_not_echoed(client, receipt, monkeypatch):
+    headers, receipt_id = receipt
+    receipt_cache.clear()
+    
+    def submit(context):
+        raise RuntimeError("/srv/secret/path is not writable")
+    
+    monkeypatch.setattr(render_pool, "submit", submit)
+    
+    response = client.get(f"/api/finance/receipts/{receipt_id}/download", headers=headers)
+    
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Error generating receipt"
+
+def test_inline_render_runs_off_the_event_loop(client, receipt, monkeypatch):
+    headers, receipt_id = receipt
+    receipt_cache.clear()
+    submit = render_pool.submit
+    on_event_loop = []
+    
+    def record_submit(context):
+        try:
+            asyncio.get_running_loop()
+            on_event_loop.append(True)
+        except RuntimeError:
+            on_event_loop.append(False)
+        return submit(context)
+    
+    monkeypatch.setattr(render_pool, "submit", record_submit)
+    
+    response = client.get(f"/api/finance/receipts/{receipt_id}/download", headers=headers)
+    
+    assert response.status_code == 200
+    assert on_event_loop == [False]
@@ -0,0 +1,60 @@
+import os
+import signal
+
+import pytest
+
+from app.services.render_pool import ReceiptRenderPool, RenderPoolSaturated
+
+CONTEXT = {
+    "receipt_number": "RCPT-1-BCS-FALL2024-20250101000000",
+    "payment_date": "01-01-2025 00:00:00",
+    "student_name": "John Doe",
+    "student_email": "student1@university.edu",
+    "student_id": "3",
+    "payment_id": "1",
+    "payment_method": "Cash",
+    "transaction_id": "N/A",
+    "semester_name": "Fall 2024",
+    "fee_description": "Tuition Fee",
+    "amount_paid": "$100.00",
+}
+
+def test_render_pool_renders_and_sheds_load():
+    pool = ReceiptRenderPool(max_workers=1, max_queue=0)
+    try:
+        first = pool.submit(CONTEXT)
+        # The only slot is taken until the first render finishes
+        with pytest.raises(RenderPoolSaturated):
+            pool.submit(CONTEXT)
+        assert first.result(timeout=60).startswith(b"%PDF")
+        
+        assert pool.render(CONTEXT).startswith(b"%PDF")
+        stats = pool.stats()
+        assert stats["rendered"] == 2
+        assert stats["rejected"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["max_render_ms"] > 0
+    finally:
+        pool.shutdown()
+
+def test_render_pool_inline_mode():
+    pool = ReceiptRenderPool(max_workers=0, max_queue=0)
+    assert pool.render(CONTEXT).startswith(b"%PDF")
+    assert pool.stats()["rendered"] == 1
+
+def test_render_pool_replaces_a_broken_executor():
+    pool = ReceiptRenderPool(max_workers=1, max_queue=1)
+    try:
+        assert pool.render(CONTEXT).startswith(b"%PDF")
+        # Simulate the OOM killer taking out the worker process
+        for pid in list(pool._get_executor()._processes):
+            os.kill(pid, signal.SIGKILL)
+        
+        assert pool.render(CONTEXT).startswith(b"%PDF")
+        assert pool.render(CONTEXT).startswith(b"%PDF")
+        stats = pool.stats()
+        assert stats["restarts"] == 1
+        assert stats["rendered"] == 3
+        assert stats["in_flight"] == 0
+    finally:
+        pool.shutdown()
@@ -0,0 +1,95 @@
+from app.core.role_registry import role_registry
+from app.models.user import Role, User
+from tests.conftest import auth_headers, create_user
+
+def role_lookups(statements):
+    # Queries against roles alone; loading User.roles joins through user_roles
+    return [statement for statement, _ in statements if "FROM roles" in statement and "user_roles" not in statement]
+
+def test_create_user_resolves_roles_in_memory(client, db, statements):
+    admin = create_user(db, "registry.admin@university.edu", ["admin"])
+    create_user(db, "registry.student@university.edu", ["student"])
+    role_registry.load(db)
+    statements.clear()
+
+    response = client.post(
+        "/api/users/",
+        headers=auth_headers(admin),
+        json={"email": "registry.new@university.edu", "password": "secret123", "roles": ["student", "admin"]},
+    )
+
+    assert response.status_code == 200
+    assert sorted(role["name"] for role in response.json()["roles"]) == ["admin", "student"]
+    # Known roles need no lookup
+    assert role_lookups(statements) == []
+    links = [statement for statement, _ in statements if statement.startswith("INSERT INTO user_roles")]
+    assert len(links) == 1, links
+
+def test_missing_roles_are_created_once(client, db, statements):
+    admin = create_user(db, "registry.admin2@university.edu", ["admin"])
+    statements.clear()
+
+    response = client.post(
+        "/api/users/",
+        headers=auth_headers(admin),
+        json={"email": "registry.auditor@university.edu", "password": "secret123", "roles": ["auditor", "reviewer"]},
+    )
+
+    assert response.status_code == 200
+    inserts = [statement for statement, _ in statements if statement.startswith("INSERT INTO roles")]
+    assert len(inserts) == 1, inserts
+    assert role_registry.get_id("auditor") == db.query(Role.id).filter(Role.name == "auditor").scalar()
+
+    user_id = response.json()["id"]
+    response = client.put(
+        f"/api/users/{user_id}",
+        headers=auth_headers(admin),
+        json={"email": "registry.auditor@university.edu", "roles": ["reviewer"]},
+    )
+
+    assert response.status_code == 200
+    assert [role["name"] for role in response.json()["roles"]] == ["reviewer"]
+    user = db.query(User).filter(User.id == user_id).one()
+    assert [role.name for role in user.roles] == ["reviewer"]
+
+def test_registry_picks_up_roles_created_elsewhere(db):
+    role_registry.load(db)
+    db.add(Role(name="librarian", description="librarian role"))
+    db.commit()
+
+    assert role_registry.get_id("librarian") is None
+    role_ids = role_registry.resolve(db, ["librarian"])
+    assert role_ids["librarian"] == db.query(Role.id).filter(Role.name == "librarian").scalar()
+    assert db.query(Role).filter(Role.name == "librarian").count() == 1
+
+def test_update_compares_role_ids_without_loading_roles(client, db, statements):
+    admin = create_user(db, "registry.admin3@university.edu", ["admin"])
+    student = create_user(db, "registry.unchanged@university.edu", ["student"])
+    headers, student_id = auth_headers(admin), student.id
+    role_registry.load(db)
+    statements.clear()
+
+    response = client.put(
+        f"/api/users/{student_id}",
+        headers=headers,
+        json={"email": "registry.unchanged@university.edu", "full_name": "Renamed", "roles": ["student"]},
+    )
+
+    assert response.status_code == 200
+    # Only serializing the response loads the roles
+    role_loads = [statement for statement, _ in statements if "FROM roles" in statement]
+    assert len(role_loads) == 1, role_loads
+    assert not [statement for statement, _ in statements if "DELETE FROM user_roles" in statement]
+    db.expire_all()
+    assert db.get(User, student_id).tokens_valid_after is None
+
+    response = client.put(
+        f"/api/users/{student_id}",
+        headers=headers,
+        json={"email": "registry.unchanged@university.edu", "roles": ["student", "admin"]},
+    )
+
+    assert response.status_code == 200
+    assert sorted(role["name"] for role in response.json()["roles"]) == ["admin", "student"]
+    db.expire_all()
+    assert db.get(User, student_id).tokens_valid_after is not None
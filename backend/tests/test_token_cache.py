@@ -0,0 +1,29 @@
+import time
+from datetime import timedelta
+
+import pytest
+from jose import JWTError
+
+from app.core.security import create_access_token, decode_access_token, verified_token_cache
+
+def test_verified_tokens_are_cached():
+    token = create_access_token(42, "student")
+    assert decode_access_token(token).sub == 42
+    assert len(verified_token_cache) == 1
+    assert decode_access_token(token) is decode_access_token(token)
+
+def test_cached_token_expires_with_the_token():
+    token = create_access_token(7, "student", expires_delta=timedelta(seconds=1))
+    assert decode_access_token(token).sub == 7
+    
+    # exp has one-second resolution, so wait until it is certainly in the past
+    time.sleep(2.1)
+    # The entry never outlives the token, so the signature check runs again and rejects it
+    with pytest.raises(JWTError):
+        decode_access_token(token)
+
+def test_invalid_tokens_are_not_cached():
+    token = create_access_token(9, "student")
+    with pytest.raises(JWTError):
+        decode_access_token(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+    assert len(verified_token_cache) == 0
@@ -0,0 +1,99 @@
+import io
+import json
+import time
+
+import pytest
+
+from app.core.password_pool import password_pool
+from app.models.user import User
+from app.services.user_import_jobs import user_import_jobs
+from tests.conftest import auth_headers, create_user
+
+CSV_UPLOAD = """email,password,full_name,roles
+new.student1@university.edu,secret123,New Student One,student;newrole
+new.student2@university.edu,secret123,New Student Two,student;faculty
+not-an-email,secret123,Broken Row,student
+new.student1@university.edu,secret123,Duplicate Row,student
+existing.student@university.edu,secret123,Existing,student
+new.student3@university.edu,,No Password,newrole
+"""
+
+@pytest.fixture(autouse=True)
+def import_sessions(monkeypatch, session_factory):
+    monkeypatch.setattr(user_import_jobs, "session_factory", session_factory)
+
+def wait_for_import(client, headers, response):
+    """Poll an accepted import until it finishes and return the final job."""
+    assert response.status_code == 202, response.text
+    job = response.json()
+    deadline = time.monotonic() + 60
+    while job["status"] in ("pending", "running"):
+        assert time.monotonic() < deadline, job
+        time.sleep(0.05)
+        job = client.get(f"/api/users/import/{job['id']}", headers=headers).json()
+    assert job["status"] == "done", job
+    return job
+
+def test_bulk_import_csv(client, db, statements):
+    admin = create_user(db, "import.admin@university.edu", ["admin"])
+    create_user(db, "existing.student@university.edu", ["student"])
+    headers = auth_headers(admin)
+    hashed_before = password_pool.stats()["completed"]
+    statements.clear()
+    
+    response = client.post(
+        "/api/users/import",
+        headers=headers,
+        files={"file": ("intake.csv", io.BytesIO(CSV_UPLOAD.encode()), "text/csv")},
+    )
+    
+    result = wait_for_import(client, headers, response)
+    assert result["processed"] == 6
+    assert result["created"] == 2
+    assert result["failed"] == 4
+    assert {error["row"] for error in result["errors"]} == {4, 5, 6, 7}
+    # An empty password cell is a missing password
+    assert "password" in next(error for error in result["errors"] if error["row"] == 7)["detail"]
+    
+    user = db.query(User).filter(User.email == "new.student2@university.edu").one()
+    assert sorted(role.name for role in user.roles) == ["faculty", "student"]
+    # Unknown roles are created on the fly
+    user = db.query(User).filter(User.email == "new.student1@university.edu").one()
+    assert sorted(role.name for role in user.roles) == ["newrole", "student"]
+    assert db.query(User).filter(User.email == "new.student3@university.edu").count() == 0
+    # Passwords are hashed on the shared, bounded password pool
+    assert password_pool.stats()["completed"] - hashed_before == 2
+    
+    # One multi-row insert for the users and one for their role links
+    inserts = [statement for statement, _ in statements if statement.startswith("INSERT INTO users")]
+    assert len(inserts) == 1, inserts
+    links = [statement for statement, _ in statements if statement.startswith("INSERT INTO user_roles")]
+    assert len(links) == 1, links
+
+def test_bulk_import_ndjson(client, db):
+    admin = create_user(db, "ndjson.admin@university.edu", ["admin"])
+    lines = [
+        json.dumps({"email": "ndjson.student@university.edu", "password": "secret123", "roles": ["student"]}),
+        "{not json",
+        json.dumps({"email": "ndjson.nopassword@university.edu", "roles": ["student"]}),
+    ]
+    
+    headers = auth_headers(admin)
+    
+    response = client.post(
+        "/api/users/import",
+        headers=headers,
+        files={"file": ("intake.ndjson", io.BytesIO("\n".join(lines).encode()), "application/x-ndjson")},
+    )
+    
+    result = wait_for_import(client, headers, response)
+    assert result["created"] == 1
+    assert [error["row"] for error in result["errors"]] == [2, 3]
+    assert "password" in result["errors"][1]["detail"]
+
+def test_unknown_import_job(client, db):
+    admin = create_user(db, "jobs.admin@university.edu", ["admin"])
+    
+    response = client.get("/api/users/import/not-a-job", headers=auth_headers(admin))
+    
+    assert response.status_code == 404
@@ -0,0 +1,38 @@
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.models.academic import Institute, Course
+from tests.conftest import auth_headers, create_user
+
+def test_user_listing_query_count_and_cursor(client, db, statements):
+    admin = create_user(db, "listing.admin@university.edu", ["admin"])
+    institute = Institute(name="Listing Institute", code="LIST")
+    courses = [
+        Course(institute=institute, name=f"Listing Course {i}", code=f"LC{i}", duration_years=3, is_active=True)
+        for i in range(2)
+    ]
+    for i in range(12):
+        student = create_user(db, f"listing.student{i}@university.edu", ["student", "faculty"] if i % 3 else ["student"])
+        student.courses.extend(courses)
+    db.commit()
+    headers = auth_headers(admin)
+
+    statements.clear()
+    response = client.get("/api/users/", headers=headers, params={"limit": 10})
+
+    assert response.status_code == 200
+    page = response.json()
+    assert len(page) == 10
+    assert page[1]["courses"][0]["institute"]["code"] == "LIST"
+    assert sorted(role["name"] for role in page[2]["roles"]) == ["faculty", "student"]
+    # The page, its roles and its courses with their institutes: independent of page size
+    assert len(statements) == 3, [statement for statement, _ in statements]
+
+    response = client.get(
+        "/api/users/", headers=headers, params={"limit": 10, "cursor": response.headers[NEXT_CURSOR_HEADER]}
+    )
+
+    assert response.status_code == 200
+    rest = response.json()
+    assert [user["id"] for user in rest] == sorted(user["id"] for user in rest)
+    assert rest[0]["id"] > page[-1]["id"]
+    assert len(page) + len(rest) == 13
+    assert NEXT_CURSOR_HEADER not in response.headers
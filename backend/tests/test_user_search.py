@@ -0,0 +1,71 @@
+import pytest
+
+from app.models.user import User
+from tests.conftest import auth_headers, create_user
+
+@pytest.fixture(scope="module")
+def admin_headers(session_factory):
+    db = session_factory()
+    try:
+        admin = create_user(db, "search.admin@university.edu", ["admin"])
+        create_user(db, "maria.lopez@university.edu", ["student"])
+        create_user(db, "mario.rossi@university.edu", ["faculty"])
+        create_user(db, "ana.maria@university.edu", ["student"])
+        create_user(db, "mar@university.edu", ["student"])
+        create_user(db, "percent_100%@university.edu", ["student"])
+        # Full names default to the local part; give one a name to match on
+        user = db.query(User).filter(User.email == "ana.maria@university.edu").one()
+        user.full_name = "Ana Maria Silva"
+        db.commit()
+        return auth_headers(admin)
+    finally:
+        db.close()
+
+def search(client, headers, **params):
+    response = client.get("/api/users/search", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return [user["email"] for user in response.json()]
+
+def test_search_ranks_exact_then_prefix_then_substring(client, admin_headers):
+    assert search(client, admin_headers, q="mar") == [
+        "mar@university.edu",
+        "maria.lopez@university.edu",
+        "mario.rossi@university.edu",
+        # Name word prefix ("Ana Maria Silva") before a bare substring
+        "ana.maria@university.edu",
+    ]
+
+def test_short_terms_match_prefixes_only(client, admin_headers):
+    assert search(client, admin_headers, q="MA") == [
+        "mar@university.edu",
+        "maria.lopez@university.edu",
+        "mario.rossi@university.edu",
+    ]
+
+def test_search_filters_by_role(client, admin_headers):
+    assert search(client, admin_headers, q="mar", role="faculty") == ["mario.rossi@university.edu"]
+    assert search(client, admin_headers, q="mar", role="no-such-role") == []
+
+def test_search_escapes_like_wildcards(client, admin_headers):
+    assert search(client, admin_headers, q="_100%") == ["percent_100%@university.edu"]
+    # A lone % is a one-character prefix, not a wildcard
+    assert search(client, admin_headers, q="%") == []
+
+def test_blank_search_is_rejected(client, admin_headers):
+    response = client.get("/api/users/search", headers=admin_headers, params={"q": "  "})
+    assert response.status_code == 400
+
+def test_prefix_search_uses_expression_indexes(engine, client, admin_headers, statements):
+    statements.clear()
+    search(client, admin_headers, q="ma")
+    # The email prefix tier, then the name prefix tier as the page is not full
+    (email_tier, email_parameters), (name_tier, name_parameters) = statements[:2]
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            pytest.skip("the planner prefers a scan on a table this small")
+        plans = [
+            " ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+            for statement, parameters in [(email_tier, email_parameters), (name_tier, name_parameters)]
+        ]
+    assert "USING INDEX ix_users_lower_email " in plans[0], plans[0]
+    assert "USING INDEX ix_users_lower_full_name " in plans[1], plans[1]
@@ -55,3 +55,40 @@ def test_reset_password(api_base_url):
     # Only check for message if status code is 200 or 202
     if response.status_code in [200, 202]:
         assert "msg" in response.json()
+
+def test_refresh_and_logout(api_base_url):
+    """Test refreshing an access token and logging out."""
+    response = requests.post(
+        f"{api_base_url}/auth/login",
+        data={
+            "username": "student1@university.edu",
+            "password": "student123",
+        },
+    )
+    assert response.status_code == 200
+    tokens = response.json()
+    assert tokens["refresh_token"]
+    
+    response = requests.post(
+        f"{api_base_url}/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert response.status_code == 200
+    refreshed = response.json()
+    headers = {"Authorization": f"Bearer {refreshed['access_token']}"}
+    assert requests.get(f"{api_base_url}/auth/me", headers=headers).status_code == 200
+    
+    # The old refresh token was rotated out
+    response = requests.post(
+        f"{api_base_url}/auth/refresh",
+        json={"refresh_token": tokens["refresh_token"]},
+    )
+    assert response.status_code == 401
+    
+    response = requests.post(
+        f"{api_base_url}/auth/logout",
+        headers=headers,
+        json={"refresh_token": refreshed["refresh_token"]},
+    )
+    assert response.status_code == 200
+    assert requests.get(f"{api_base_url}/auth/me", headers=headers).status_code == 401
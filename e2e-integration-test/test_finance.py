@@ -355,3 +355,189 @@ def test_student_access_restrictions(api_base_url, student_headers):
         # Check that it doesn't contain sensitive information
         if "student_count" in data:
             assert data["student_count"] <= 1  # Should only show the student's own data
+
+def test_finance_summary_totals(api_base_url, faculty_headers):
+    """Test that the finance summary totals are consistent."""
+    response = requests.get(
+        f"{api_base_url}/finance/finance/summary",
+        headers=faculty_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    for field in ["total_fees", "total_paid", "total_pending", "student_count", "payment_count"]:
+        assert field in data
+    assert abs(data["total_pending"] - (data["total_fees"] - data["total_paid"])) < 0.01
+    
+    # Filtering by a student must never report more than that one student
+    response = requests.get(
+        f"{api_base_url}/finance/finance/summary",
+        headers=faculty_headers,
+        params={"student_id": 3},
+    )
+    assert response.status_code == 200
+    assert response.json()["student_count"] <= 1
+
+def test_grouped_finance_summary(api_base_url, faculty_headers):
+    """Test that grouped totals add up to the overall finance summary."""
+    response = requests.get(
+        f"{api_base_url}/finance/finance/summary",
+        headers=faculty_headers,
+    )
+    assert response.status_code == 200
+    summary = response.json()
+    
+    for group_by in ["institute", "course", "semester"]:
+        response = requests.get(
+            f"{api_base_url}/finance/finance/summary/grouped",
+            headers=faculty_headers,
+            params={"group_by": group_by},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["group_by"] == group_by
+        assert abs(sum(g["total_fees"] for g in data["groups"]) - summary["total_fees"]) < 0.01
+        for group in data["groups"]:
+            assert abs(group["total_pending"] - (group["total_fees"] - group["total_paid"])) < 0.01
+    
+    response = requests.get(
+        f"{api_base_url}/finance/finance/summary/grouped",
+        headers=faculty_headers,
+        params={"group_by": "payment_method"},
+    )
+    assert response.status_code == 200
+    assert abs(sum(g["total_paid"] for g in response.json()["groups"]) - summary["total_paid"]) < 0.01
+    
+    # Unknown groupings are rejected
+    response = requests.get(
+        f"{api_base_url}/finance/finance/summary/grouped",
+        headers=faculty_headers,
+        params={"group_by": "student"},
+    )
+    assert response.status_code == 422
+
+def test_payment_updates_fee_balance(api_base_url, admin_headers):
+    """Test that posting a payment updates the fee's paid amount and balance."""
+    response = requests.get(
+        f"{api_base_url}/finance/student-fees",
+        headers=admin_headers,
+        params={"outstanding_only": True},
+    )
+    assert response.status_code == 200
+    fees = response.json()
+    if not fees:
+        pytest.skip("No outstanding student fees found to pay")
+    fee = fees[0]
+    assert fee["balance"] > 0
+    
+    response = requests.post(
+        f"{api_base_url}/finance/payments",
+        headers=admin_headers,
+        json={
+            "student_id": fee["student_id"],
+            "student_fee_id": fee["id"],
+            "amount": 100.00,
+            "payment_method": "Cash",
+            "transaction_id": f"TEST-LEDGER-{datetime.now().strftime('%Y%m%d%H%M%S%f')}",
+        },
+    )
+    assert response.status_code == 200
+    
+    response = requests.get(
+        f"{api_base_url}/finance/student-fees",
+        headers=admin_headers,
+        params={"student_id": fee["student_id"], "semester_id": fee["semester_id"]},
+    )
+    assert response.status_code == 200
+    updated = next(f for f in response.json() if f["id"] == fee["id"])
+    assert abs(updated["paid_amount"] - (fee["paid_amount"] + 100.00)) < 0.01
+    assert abs(updated["balance"] - (fee["balance"] - 100.00)) < 0.01
+
+def test_export_payments_csv(api_base_url, admin_headers, student_headers):
+    """Test exporting payments as a streamed CSV file."""
+    response = requests.get(
+        f"{api_base_url}/finance/payments/export",
+        headers=admin_headers,
+        stream=True,
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/csv")
+    lines = [line for line in response.iter_lines(decode_unicode=True) if line]
+    header = lines[0].split(",")
+    for column in ["payment_id", "amount", "course_code", "semester_name", "institute_name"]:
+        assert column in header
+    
+    response = requests.get(
+        f"{api_base_url}/finance/payments",
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    if len(response.json()) < 100:
+        assert len(lines) - 1 == len(response.json())
+    
+    # Students cannot export another student's payments
+    response = requests.get(
+        f"{api_base_url}/finance/payments/export",
+        headers=student_headers,
+        params={"student_id": 4},
+    )
+    assert response.status_code == 403
+
+def test_payments_cursor_pagination(api_base_url, admin_headers):
+    """Test that cursor pagination walks the same payments as offset pagination."""
+    response = requests.get(
+        f"{api_base_url}/finance/payments",
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    expected_ids = [payment["id"] for payment in response.json()]
+    if len(expected_ids) < 2:
+        pytest.skip("Not enough payments to paginate")
+    
+    seen_ids = []
+    cursor = None
+    for _ in range(len(expected_ids) + 1):
+        params = {"limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        response = requests.get(
+            f"{api_base_url}/finance/payments",
+            headers=admin_headers,
+            params=params,
+        )
+        assert response.status_code == 200
+        seen_ids.extend(payment["id"] for payment in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen_ids[:len(expected_ids)] == expected_ids
+    assert len(seen_ids) == len(expected_ids)
+    
+    response = requests.get(
+        f"{api_base_url}/finance/payments",
+        headers=admin_headers,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+
+def test_student_fees_cursor_pagination(api_base_url, admin_headers):
+    """Test cursor pagination of student fees."""
+    response = requests.get(
+        f"{api_base_url}/finance/student-fees",
+        headers=admin_headers,
+        params={"limit": 1},
+    )
+    assert response.status_code == 200
+    first_page = response.json()
+    cursor = response.headers.get("X-Next-Cursor")
+    if not cursor:
+        pytest.skip("Not enough student fees to paginate")
+    
+    response = requests.get(
+        f"{api_base_url}/finance/student-fees",
+        headers=admin_headers,
+        params={"limit": 1, "cursor": cursor},
+    )
+    assert response.status_code == 200
+    second_page = response.json()
+    assert len(second_page) == 1
+    assert second_page[0]["id"] > first_page[0]["id"]
@@ -1,6 +1,7 @@
 import pytest
 import requests
 import json
+import time
 from datetime import datetime
 
 def test_receipt_generation_flow(api_base_url, admin_headers):
@@ -180,3 +181,171 @@ def test_receipt_access_permissions(api_base_url, admin_headers, faculty_headers
         headers=student_headers,
     )
     assert response.status_code in [401, 403, 404]  # Either unauthorized, forbidden, or not found
+
+def _create_payment_with_receipt(api_base_url, admin_headers, amount=10.00):
+    """Pay a little against an existing student fee and return the payment."""
+    response = requests.get(
+        f"{api_base_url}/finance/student-fees",
+        headers=admin_headers,
+        params={"outstanding_only": True},
+    )
+    assert response.status_code == 200
+    fees = response.json()
+    if not fees:
+        pytest.skip("No outstanding student fees found to pay")
+    response = requests.post(
+        f"{api_base_url}/finance/payments",
+        headers=admin_headers,
+        json={
+            "student_id": fees[0]["student_id"],
+            "student_fee_id": fees[0]["id"],
+            "amount": amount,
+            "payment_method": "Cash",
+            "transaction_id": f"TEST-RCPT-{datetime.now().strftime('%Y%m%d%H%M%S%f')}",
+        },
+    )
+    assert response.status_code == 200
+    return response.json()
+
+def test_receipt_download_etag(api_base_url, admin_headers):
+    """Test that receipt downloads carry an ETag and honour If-None-Match."""
+    payment = _create_payment_with_receipt(api_base_url, admin_headers)
+    receipt_id = payment["receipt"]["id"]
+    
+    response = requests.get(
+        f"{api_base_url}/finance/receipts/{receipt_id}/download",
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+    etag = response.headers["ETag"]
+    
+    # A repeated download is served from the cache with identical bytes
+    response = requests.get(
+        f"{api_base_url}/finance/receipts/{receipt_id}/download",
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] == etag
+    
+    # A conditional request for the same version gets 304 Not Modified
+    response = requests.get(
+        f"{api_base_url}/finance/receipts/{receipt_id}/download",
+        headers={**admin_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    
+    response = requests.get(
+        f"{api_base_url}/finance/receipts/{receipt_id}/download",
+        headers={**admin_headers, "If-None-Match": '"stale"'},
+    )
+    assert response.status_code == 200
+
+def test_receipt_render_stats(api_base_url, admin_headers, student_headers):
+    """Test the receipt render pool metrics endpoint."""
+    response = requests.get(
+        f"{api_base_url}/finance/receipts/render-stats",
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    data = response.json()
+    for field in ["workers", "queue_depth", "in_flight", "rendered", "rejected", "avg_render_ms"]:
+        assert field in data
+    
+    response = requests.get(
+        f"{api_base_url}/finance/receipts/render-stats",
+        headers=student_headers,
+    )
+    assert response.status_code == 403
+
+def test_receipt_archive_download(api_base_url, admin_headers, student_headers):
+    """Test downloading all of a student's receipts as one ZIP."""
+    import io
+    import zipfile
+    
+    payment = _create_payment_with_receipt(api_base_url, admin_headers)
+    student_id = payment["student_id"]
+    
+    response = requests.get(
+        f"{api_base_url}/finance/receipts/archive",
+        headers=admin_headers,
+        params={"student_id": student_id},
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    names = archive.namelist()
+    assert f"{payment['receipt']['receipt_number']}.pdf" in names
+    for name in names:
+        assert archive.read(name).startswith(b"%PDF")
+    
+    # Staff must narrow the archive down
+    response = requests.get(
+        f"{api_base_url}/finance/receipts/archive",
+        headers=admin_headers,
+    )
+    assert response.status_code == 400
+    
+    # Students cannot download another student's receipts
+    response = requests.get(
+        f"{api_base_url}/finance/receipts/archive",
+        headers=student_headers,
+        params={"student_id": 4},
+    )
+    assert response.status_code == 403
+
+def test_receipt_prerendered_after_payment(api_base_url, admin_headers):
+    """Test that a new payment's receipt is rendered in the background."""
+    payment = _create_payment_with_receipt(api_base_url, admin_headers)
+    assert payment["receipt"]["status"] in ("pending", "rendering", "ready")
+    
+    # Poll the payment listing until the background render finishes
+    status = None
+    for _ in range(40):
+        response = requests.get(
+            f"{api_base_url}/finance/payments",
+            headers=admin_headers,
+            params={"student_fee_id": payment["student_fee_id"]},
+        )
+        assert response.status_code == 200
+        receipt = next(p["receipt"] for p in response.json() if p["id"] == payment["id"])
+        status = receipt["status"]
+        if status in ("ready", "failed"):
+            break
+        time.sleep(0.25)
+    assert status == "ready"
+    assert receipt["rendered_at"] is not None
+    
+    response = requests.get(
+        f"{api_base_url}/finance/receipts/{receipt['id']}/download",
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    assert response.content.startswith(b"%PDF")
+
+def test_list_receipts(api_base_url, admin_headers, student_headers):
+    """Test the paginated receipt listing."""
+    payment = _create_payment_with_receipt(api_base_url, admin_headers)
+    
+    response = requests.get(
+        f"{api_base_url}/finance/receipts",
+        headers=admin_headers,
+        params={"student_id": payment["student_id"], "limit": 5},
+    )
+    assert response.status_code == 200
+    page = response.json()
+    assert page["total"] >= 1
+    assert len(page["items"]) <= 5
+    item = next(i for i in page["items"] if i["id"] == payment["receipt"]["id"])
+    assert item["receipt_number"] == payment["receipt"]["receipt_number"]
+    assert item["amount"] == payment["amount"]
+    assert item["semester_name"]
+    assert item["course_name"]
+    
+    # Students only ever see their own receipts
+    response = requests.get(f"{api_base_url}/finance/receipts", headers=student_headers)
+    assert response.status_code == 200
+    student_ids = {i["student_id"] for i in response.json()["items"]}
+    assert len(student_ids) <= 1
@@ -30,6 +30,7 @@ export const login = createAsyncThunk<any, { email: string; password: string }>(
     try {
       const response = await authService.login(email, password);
       localStorage.setItem('token', response.access_token);
+      localStorage.setItem('refreshToken', response.refresh_token);
       
       // Immediately fetch user data after successful login
       try {
@@ -48,7 +49,13 @@ export const login = createAsyncThunk<any, { email: string; password: string }>(
 export const logout = createAsyncThunk<null>(
   'auth/logout', 
   async () => {
+  try {
+    await authService.logout(localStorage.getItem('refreshToken'));
+  } catch (error) {
+    // The tokens are discarded locally either way
+  }
   localStorage.removeItem('token');
+  localStorage.removeItem('refreshToken');
   return null;
 });
 
@@ -61,9 +68,10 @@ export const checkAuth = createAsyncThunk<any, void>(
       return rejectWithValue('No token found');
     }
     const user = await authService.getCurrentUser();
-    return { user, token };
+    // The API client may have refreshed the access token on the way
+    return { user, token: localStorage.getItem('token') };
   } catch (error) {
-    localStorage.removeItem('token');
+    // The API client signs out when the session cannot be refreshed
     return rejectWithValue('Session expired');
   }
 });
@@ -35,6 +35,8 @@ interface User {
 const UsersPage: React.FC = () => {
   const [users, setUsers] = useState<User[]>([]);
   const [loading, setLoading] = useState(true);
+  const [search, setSearch] = useState('');
+  const [roleFilter, setRoleFilter] = useState('');
   const [dialogOpen, setDialogOpen] = useState(false);
   const [userData, setUserData] = useState({
     email: '',
@@ -44,20 +46,42 @@ const UsersPage: React.FC = () => {
   });
 
   useEffect(() => {
+    // Aborted when the search changes, so a slow earlier response never
+    // replaces the results of a later one
+    const controller = new AbortController();
+
     const fetchUsers = async () => {
       try {
         setLoading(true);
-        const response = await apiClient.get('/users');
-        setUsers(response.data);
+        const term = search.trim();
+        // The search endpoint ranks matches; without a term show the first page
+        const response = term
+          ? await apiClient.get('/users/search', {
+              params: { q: term, role: roleFilter || undefined },
+              signal: controller.signal,
+            })
+          : await apiClient.get('/users', { signal: controller.signal });
+        if (!controller.signal.aborted) {
+          setUsers(response.data);
+        }
       } catch (error) {
-        console.error('Failed to fetch users:', error);
+        if (!controller.signal.aborted) {
+          console.error('Failed to fetch users:', error);
+        }
       } finally {
-        setLoading(false);
+        if (!controller.signal.aborted) {
+          setLoading(false);
+        }
       }
     };
 
-    fetchUsers();
-  }, []);
+    // Wait for typing to pause before searching
+    const timer = setTimeout(fetchUsers, search ? 250 : 0);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [search, roleFilter]);
 
   const handleDialogOpen = () => {
     setDialogOpen(true);
@@ -117,6 +141,29 @@ const UsersPage: React.FC = () => {
         </Button>
       </Box>
 
+      <Box sx={{ display: 'flex', gap: 2, mb: 2 }}>
+        <TextField
+          label="Search by email or name"
+          value={search}
+          onChange={(e) => setSearch(e.target.value)}
+          size="small"
+          sx={{ flexGrow: 1 }}
+        />
+        <FormControl size="small" sx={{ minWidth: 160 }} disabled={!search.trim()}>
+          <InputLabel>Role</InputLabel>
+          <Select
+            value={roleFilter}
+            label="Role"
+            onChange={(e) => setRoleFilter(e.target.value as string)}
+          >
+            <MenuItem value="">All roles</MenuItem>
+            <MenuItem value="admin">Admin</MenuItem>
+            <MenuItem value="faculty">Faculty</MenuItem>
+            <MenuItem value="student">Student</MenuItem>
+          </Select>
+        </FormControl>
+      </Box>
+
       <TableContainer component={Paper}>
         <Table>
           <TableHead>
@@ -21,15 +21,52 @@ apiClient.interceptors.request.use(
   (error) => Promise.reject(error)
 );
 
+// Access tokens are short-lived: on a 401, redeem the refresh token once and retry
+let refreshRequest: Promise<string> | null = null;
+
+const refreshAccessToken = async (): Promise<string> => {
+  const refreshToken = localStorage.getItem('refreshToken');
+  if (!refreshToken) {
+    throw new Error('No refresh token');
+  }
+  const response = await axios.post(`${apiClient.defaults.baseURL}/auth/refresh`, {
+    refresh_token: refreshToken,
+  });
+  localStorage.setItem('token', response.data.access_token);
+  localStorage.setItem('refreshToken', response.data.refresh_token);
+  return response.data.access_token;
+};
+
+// A 401 from these means bad credentials or a spent refresh token, so refreshing cannot help
+const NO_REFRESH_URLS = ['/auth/login', '/auth/refresh', '/auth/logout'];
+
 // Response interceptor for handling errors
 apiClient.interceptors.response.use(
   (response: AxiosResponse) => response,
-  (error: AxiosError) => {
+  async (error: AxiosError) => {
     console.error('API Error:', error.response ? error.response.data : error.message);
     
     // Handle 401 Unauthorized errors
     if (error.response && error.response.status === 401) {
+      const original = error.config as (InternalAxiosRequestConfig & { _retried?: boolean }) | undefined;
+      const url = original?.url || '';
+      if (original && !original._retried && !NO_REFRESH_URLS.some((path) => url.includes(path))) {
+        original._retried = true;
+        try {
+          // Concurrent 401s share one refresh, refresh tokens are single use
+          refreshRequest = refreshRequest || refreshAccessToken();
+          const token = await refreshRequest;
+          original.headers.Authorization = `Bearer ${token}`;
+          return apiClient(original);
+        } catch (refreshError) {
+          // Fall through to signing out
+        } finally {
+          refreshRequest = null;
+        }
+      }
+      
       localStorage.removeItem('token');
+      localStorage.removeItem('refreshToken');
       // Only redirect if not already on login page to avoid redirect loops
       if (!window.location.pathname.includes('/login')) {
         window.location.href = '/login';
@@ -15,6 +15,11 @@ export const authService = {
     return response.data;
   },
   
+  async logout(refreshToken: string | null) {
+    const response = await apiClient.post('/auth/logout', refreshToken ? { refresh_token: refreshToken } : undefined);
+    return response.data;
+  },
+  
   async getCurrentUser() {
     const response = await apiClient.get('/auth/me');
     return response.data;